@@ -0,0 +1,46 @@
+import pathlib
+from dataclasses import dataclass, field
+from typing import Sequence, Tuple
+
+from img import Img
+from FrameStore import FRAME_STORE, FrameKey
+
+
+@dataclass(frozen=True)
+class AnimationClip:
+    """
+    An immutable, precompiled animation: where the frames of one state live
+    plus its playback settings. Clips are built once per piece type when the
+    factory scans pieces/, and Graphics switches between them without touching
+    disk. The frames themselves come from FRAME_STORE on first use, so a clip
+    of a state nobody enters costs nothing.
+    """
+    name: str
+    sprites_folder: pathlib.Path
+    fps: float = 6.0
+    loop: bool = True
+    size: Tuple[int, int] = (80, 80)
+    frame_key: FrameKey = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "frame_key", FRAME_STORE.key(self.sprites_folder, self.size))
+
+    @property
+    def frame_time_ms(self) -> int:
+        return int(1000 / self.fps)
+
+    @property
+    def frames(self) -> Sequence[Img]:
+        return FRAME_STORE.lookup(self.frame_key)
+
+    @classmethod
+    def compile(cls, name: str, sprites_folder: pathlib.Path, graphics_cfg: dict,
+                size=(80, 80)) -> "AnimationClip":
+        """Build a clip from a sprites folder and the "graphics" part of config.json."""
+        return cls(
+            name=name,
+            sprites_folder=sprites_folder,
+            fps=graphics_cfg.get("frames_per_sec", 6),
+            loop=graphics_cfg.get("is_loop", True),
+            size=tuple(size),
+        )
@@ -0,0 +1,183 @@
+"""
+Compiled asset bundle for pieces/: moves, state configs and pre-resized BGRA
+sprite frames packed into one file, so startup is an mmap instead of walking
+folders and decoding ~300 PNGs.
+
+Layout::
+
+    magic (8s) | version (I) | index length (I) | index JSON | padding | frames
+
+Every frame is stored raw (h*w*c uint8) at a 64-byte aligned offset that the
+index records relative to the start of the frame area. The index also records
+the size and mtime of every source file, so a bundle that no longer matches
+pieces/ is detected (PieceFactory then warns and loads from the folders).
+
+Build it with::
+
+    python AssetBundle.py [pieces_root] [--out PATH] [--size 80 80]
+"""
+import argparse
+import json
+import logging
+import pathlib
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from img import Img
+from FrameStore import FrameStore
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CTD25BND"
+VERSION = 2  # 2: מקורות (גודל + mtime) באינדקס
+BUNDLE_NAME = "pieces.bundle"  # ברירת מחדל: בתוך תיקיית pieces
+_HEADER = struct.Struct("<8sII")
+_ALIGN = 64
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _read_text(path: pathlib.Path) -> Optional[str]:
+    return path.read_text(encoding="utf-8-sig") if path.exists() else None
+
+
+def _read_config(path: pathlib.Path) -> dict:
+    content = (_read_text(path) or "").strip()
+    if not content:
+        return {}
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        logger.warning("Error reading config %s: %s", path, e)
+        return {}
+
+
+def source_stamp(pieces_root: pathlib.Path) -> Dict[str, List[int]]:
+    """[size, mtime_ns] of every file inside the piece folders, by relative path."""
+    pieces_root = pathlib.Path(pieces_root)
+    stamp = {}
+    for piece_dir in sorted(p for p in pieces_root.iterdir() if p.is_dir()):
+        for path in sorted(piece_dir.rglob("*")):
+            if path.is_file():
+                st = path.stat()
+                stamp[path.relative_to(pieces_root).as_posix()] = [st.st_size, st.st_mtime_ns]
+    return stamp
+
+
+def compile_bundle(pieces_root: pathlib.Path, out_path: Optional[pathlib.Path] = None,
+                   size: Tuple[int, int] = (80, 80)) -> pathlib.Path:
+    """Pack every piece under `pieces_root` into one bundle file and return its path."""
+    pieces_root = pathlib.Path(pieces_root)
+    out_path = pathlib.Path(out_path) if out_path else pieces_root / BUNDLE_NAME
+
+    index = {"size": list(size), "pieces": {}, "sources": source_stamp(pieces_root)}
+    blobs: List[Tuple[int, np.ndarray]] = []
+    offset = 0
+    for piece_dir in sorted(p for p in pieces_root.iterdir() if p.is_dir()):
+        states = []
+        states_dir = piece_dir / "states"
+        state_dirs = sorted(p for p in states_dir.iterdir() if p.is_dir()) if states_dir.exists() else []
+        for state_dir in state_dirs:
+            frames = []
+            for img in FrameStore.decode(state_dir / "sprites", size):
+                if img.img is None:
+                    continue
+                data = np.ascontiguousarray(img.img)
+                frames.append([offset] + list(data.shape))
+                blobs.append((offset, data))
+                offset = _align(offset + data.nbytes)
+            states.append({
+                "name": state_dir.name,
+                "config": _read_config(state_dir / "config.json"),
+                "moves": _read_text(state_dir / "moves.txt"),
+                "frames": frames,
+            })
+        index["pieces"][piece_dir.name] = {"moves": _read_text(piece_dir / "moves.txt"), "states": states}
+
+    index_bytes = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    data_start = _align(_HEADER.size + len(index_bytes))
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        for frame_offset, data in blobs:
+            f.seek(data_start + frame_offset)
+            f.write(data.tobytes())
+        f.truncate(data_start + offset)
+    tmp_path.replace(out_path)  # אטומי – טוען במקביל לא יראה קובץ חצי כתוב
+    logger.info("Wrote %s: %d pieces, %d frames, %.1f MB", out_path, len(index["pieces"]),
+                len(blobs), (data_start + offset) / 1e6)
+    return out_path
+
+
+class AssetBundle:
+    """
+    Read-only view of a compiled bundle. The file is memory-mapped once and
+    every frame is a numpy view into the mapping – nothing is copied or
+    decoded; the OS pages sprites in when they are first drawn.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        self._map = np.asarray(np.memmap(self.path, dtype=np.uint8, mode="r"))
+        magic, version, index_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} asset bundle")
+        index_end = _HEADER.size + index_len
+        index = json.loads(self._map[_HEADER.size:index_end].tobytes().decode("utf-8"))
+        self.size: Tuple[int, int] = tuple(index["size"])
+        self.pieces: Dict[str, dict] = index["pieces"]
+        self.sources: Dict[str, List[int]] = index["sources"]
+        self._data = self._map[_align(index_end):]
+
+    @classmethod
+    def open(cls, path: pathlib.Path) -> Optional["AssetBundle"]:
+        """The bundle at `path`, or None if it is missing or unreadable."""
+        path = pathlib.Path(path)
+        if not path.exists():
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning("Ignoring asset bundle %s: %s", path, e)
+            return None
+
+    def matches(self, pieces_root: pathlib.Path) -> bool:
+        """האם החבילה עדיין תואמת את pieces_root (אותם קבצים, גדלים ו-mtime); מזהיר אם לא."""
+        current = source_stamp(pieces_root)
+        if current == self.sources:
+            return True
+        changed = sorted(k for k in current.keys() | self.sources.keys() if current.get(k) != self.sources.get(k))
+        logger.warning("Asset bundle %s is stale (%d changed files, e.g. %s) – loading from folders; "
+                       "rerun AssetBundle.py to rebuild it", self.path, len(changed), changed[0])
+        return False
+
+    def frames(self, state: dict) -> Tuple[Img, ...]:
+        """Img objects whose pixels are views into the mapped file."""
+        frames = []
+        for offset, *shape in state["frames"]:
+            img = Img()
+            img.img = self._data[offset:offset + int(np.prod(shape))].reshape(shape)
+            frames.append(img)
+        return tuple(frames)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile pieces/ into a memory-mappable asset bundle")
+    parser.add_argument("pieces_root", nargs="?", type=pathlib.Path,
+                        default=pathlib.Path(__file__).parent.parent / "pieces")
+    parser.add_argument("--out", type=pathlib.Path, default=None,
+                        help=f"output file (default: <pieces_root>/{BUNDLE_NAME})")
+    parser.add_argument("--size", type=int, nargs=2, default=(80, 80), metavar=("W", "H"),
+                        help="sprite size in pixels")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    compile_bundle(args.pieces_root, args.out, tuple(args.size))
+
+
+if __name__ == "__main__":
+    main()
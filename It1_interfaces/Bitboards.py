@@ -0,0 +1,215 @@
+"""
+Bitboard layer of the game state.
+
+A square (x, y) is bit ``y * width + x`` of a Python int, so the same code
+works for any board size. Bitboards holds the occupancy masks (all pieces,
+per color, per piece type) and is kept in sync by BoardIndex; AttackTables
+holds the precomputed geometry: ray masks for every square and direction,
+and per-piece-type target masks compiled from the pieces' Moves (moves.txt).
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# כל הכיוונים שכלי "מחליק" יכול לנוע בהם
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1))
+
+
+def color_of(piece_id: str) -> str:
+    return 'W' if 'W' in piece_id else 'B'
+
+
+def _sign(n: int) -> int:
+    return (n > 0) - (n < 0)
+
+
+def _masks(deltas, width: int, height: int) -> Dict[str, List[int]]:
+    """
+    For every move type, the mask of each square's targets under `deltas`
+    ((dx, dy, move_type) rows), kept on the board. Built as a numpy
+    square×square bit matrix packed into one int per square, so a 64×64 board
+    costs a few packbits calls instead of millions of Python `|=` on
+    512-byte ints.
+    """
+    squares = width * height
+    pairs: Dict[str, Tuple[list, list]] = {}
+    for dx, dy, move_type in deltas:
+        xs = np.arange(max(0, -dx), min(width, width - dx))
+        ys = np.arange(max(0, -dy), min(height, height - dy))
+        src, dst = pairs.setdefault(move_type, ([], []))
+        if len(xs) and len(ys):
+            sources = (ys[:, None] * width + xs[None, :]).ravel()
+            src.append(sources)
+            dst.append(sources + (dy * width + dx))
+
+    chunk = max(1, (1 << 24) // squares)  # שורות בכל מטריצה – עד 16MB זמניים
+    masks = {}
+    for move_type, (src, dst) in pairs.items():
+        src = np.concatenate(src) if src else np.zeros(0, dtype=np.intp)
+        dst = np.concatenate(dst) if dst else np.zeros(0, dtype=np.intp)
+        result = []
+        for start in range(0, squares, chunk):
+            stop = min(squares, start + chunk)
+            grid = np.zeros((stop - start, squares), dtype=bool)
+            inside = (src >= start) & (src < stop)
+            grid[src[inside] - start, dst[inside]] = True
+            packed = np.packbits(grid, axis=1, bitorder="little")
+            data, size = packed.tobytes(), packed.shape[1]
+            result += [int.from_bytes(data[i:i + size], "little") for i in range(0, len(data), size)]
+        masks[move_type] = result
+    return masks
+
+
+class Bitboards:
+    """Occupancy masks: `occupied`, `colors['W'/'B']` and `kinds['P'/'R'/...]`."""
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        self.occupied = 0
+        self.colors: Dict[str, int] = {'W': 0, 'B': 0}
+        self.kinds: Dict[str, int] = {}
+
+    def square(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def bit(self, x: int, y: int) -> int:
+        return 1 << (y * self.width + x)
+
+    def cell(self, square: int) -> Tuple[int, int]:
+        return square % self.width, square // self.width
+
+    def set_square(self, x: int, y: int, pieces):
+        """הגדרת המשבצת מחדש לפי רשימת הכלים שנמצאים בה כעת."""
+        bit = 1 << (y * self.width + x)
+        clear = ~bit
+        self.occupied &= clear
+        for key in self.colors:
+            self.colors[key] &= clear
+        for key in self.kinds:
+            self.kinds[key] &= clear
+        for piece in pieces:
+            piece_id = piece.piece_id
+            self.occupied |= bit
+            self.colors[color_of(piece_id)] |= bit
+            self.kinds[piece_id[0]] = self.kinds.get(piece_id[0], 0) | bit
+
+    def pieces_mask(self, color: str, kind: str) -> int:
+        return self.colors[color] & self.kinds.get(kind, 0)
+
+    def clear(self):
+        self.occupied = 0
+        self.colors = {'W': 0, 'B': 0}
+        self.kinds.clear()
+
+
+class MoveTable:
+    """
+    The moves of one piece type compiled against a board size: for every
+    square and move type ("normal", "capture", "non_capture", "1st") the mask
+    of target squares. Open-ended rays of Moves run to the board edge, so the
+    same moves.txt serves any W×H. A table without rays (knight, king) is a
+    leaper.
+    """
+
+    def __init__(self, moves, width: int, height: int):
+        self.width, self.height = width, height
+        self.types: List[str] = list(dict.fromkeys(move_type for _, _, move_type in moves.valid_moves))
+        if hasattr(moves, "deltas"):
+            deltas = list(moves.deltas(max(width, height) - 1))
+            directions = {(ray.dx, ray.dy) for ray in moves.rays}
+        else:
+            deltas = moves.valid_moves
+            directions = {(_sign(dx), _sign(dy)) for dx, dy, _ in deltas
+                          if max(abs(dx), abs(dy)) > 1 and (dx == 0 or dy == 0 or abs(dx) == abs(dy))}
+        self.reach: Dict[str, List[int]] = _masks(deltas, width, height)
+        for move_type in self.types:
+            self.reach.setdefault(move_type, [0] * (width * height))
+        self.directions: Tuple[Tuple[int, int], ...] = tuple(d for d in DIRECTIONS if d in directions)
+        self.leaper = not self.directions
+        if len(self.types) == 1:
+            self.all = self.reach[self.types[0]]  # סוג אחד – אותה רשימה, בלי עותק (לוח 64x64: מגה-בייטים)
+        else:
+            self.all = [0] * (width * height)
+            for masks in self.reach.values():
+                for square, mask in enumerate(masks):
+                    self.all[square] |= mask
+
+    def move_type(self, src: int, dst: int) -> Optional[str]:
+        """סוג המהלך מ-src ל-dst (לפי סדר ההופעה ב-moves.txt), או None אם אין כזה."""
+        bit = 1 << dst
+        if not self.all[src] & bit:
+            return None
+        if len(self.types) == 1:
+            return self.types[0]
+        return next(t for t in self.types if self.reach[t][src] & bit)
+
+
+class AttackTables:
+    """
+    Geometry of a W×H board: `rays[d][sq]` is every square from `sq` in
+    direction `d` (not including `sq`), plus a MoveTable per Moves object.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        steps = range(1, max(width, height))
+        rays = _masks([(dx * n, dy * n, (dx, dy)) for dx, dy in DIRECTIONS for n in steps], width, height)
+        self.rays: Dict[Tuple[int, int], List[int]] = {d: rays.get(d, [0] * (width * height)) for d in DIRECTIONS}
+        self._tables: Dict[int, Tuple[object, MoveTable]] = {}  # id(moves) → (moves, table)
+        self._compiled: Dict[tuple, MoveTable] = {}  # תוכן ה-Moves → table (לבן ושחור עם אותן תנועות)
+
+    def move_table(self, moves) -> MoveTable:
+        """
+        ה-MoveTable של אובייקט Moves – מקומפל פעם אחת ומשותף לכל הכלים מאותו
+        סוג, ולכל Moves עם אותן תנועות (RW/RB, QW/QB, ...).
+        """
+        entry = self._tables.get(id(moves))
+        if entry is None or entry[0] is not moves:
+            key = tuple(moves.valid_moves) + tuple(getattr(moves, "rays", ()))
+            table = self._compiled.get(key)
+            if table is None:
+                table = self._compiled[key] = MoveTable(moves, self.width, self.height)
+            entry = (moves, table)
+            self._tables[id(moves)] = entry
+        return entry[1]
+
+    def between(self, src: Tuple[int, int], dst: Tuple[int, int]) -> int:
+        """המשבצות שבין src ל-dst בקו ישר/אלכסוני (0 אם הן לא על אותו קו)."""
+        dx, dy = dst[0] - src[0], dst[1] - src[1]
+        if not (dx == 0 or dy == 0 or abs(dx) == abs(dy)) or dx == dy == 0:
+            return 0
+        ray = self.rays[(dx > 0) - (dx < 0), (dy > 0) - (dy < 0)]
+        dst_sq = dst[1] * self.width + dst[0]
+        return ray[src[1] * self.width + src[0]] & ~(ray[dst_sq] | (1 << dst_sq))
+
+    def first_blocker(self, src: Tuple[int, int], dst: Tuple[int, int], occupied: int) -> Optional[Tuple[int, int]]:
+        """המשבצת התפוסה הראשונה בדרך מ-src ל-dst, או None אם הדרך פנויה."""
+        blockers = self.between(src, dst) & occupied
+        if not blockers:
+            return None
+        dx, dy = dst[0] - src[0], dst[1] - src[1]
+        if dy > 0 or (dy == 0 and dx > 0):
+            square = (blockers & -blockers).bit_length() - 1  # הביט הנמוך ביותר – הקרוב ל-src
+        else:
+            square = blockers.bit_length() - 1
+        return square % self.width, square // self.width
+
+    def shadow(self, square: int, occupied: int, directions=DIRECTIONS) -> int:
+        """המשבצות שמוסתרות מ-square ע"י החוסם הראשון בכל כיוון (החוסם עצמו לא מוסתר)."""
+        shadow = 0
+        for direction in directions:
+            hits = self.rays[direction][square] & occupied
+            if hits:
+                if direction[1] > 0 or (direction[1] == 0 and direction[0] > 0):
+                    nearest = (hits & -hits).bit_length() - 1
+                else:
+                    nearest = hits.bit_length() - 1
+                shadow |= self.rays[direction][nearest]
+        return shadow
+
+    def attacks(self, table: MoveTable, square: int, occupied: int) -> int:
+        """כל המשבצות שכלי עם `table` מגיע אליהן מ-square, כשהכלים ב-occupied חוסמים."""
+        reach = table.all[square]
+        if table.leaper:
+            return reach
+        return reach & ~self.shadow(square, occupied, table.directions)
@@ -2,6 +2,22 @@ from dataclasses import dataclass
 
 from img import Img  # ייבוא מוחלט במקום יחסי
 
+
+def file_name(x: int) -> str:
+    """שם העמודה: a..z ואחריהן aa, ab, ... (לוחות רחבים מ-26 עמודות)."""
+    name = ""
+    x += 1
+    while x:
+        x, rest = divmod(x - 1, 26)
+        name = chr(ord('a') + rest) + name
+    return name
+
+
+def square_name(cell: tuple[int, int], height: int = 8) -> str:
+    """כתיב אלגברי של משבצת (x, y) בלוח בגובה height – השורה העליונה היא height."""
+    x, y = cell
+    return f"{file_name(x)}{height - y}"
+
 @dataclass
 class Board:
     cell_H_pix: int
@@ -25,6 +41,9 @@ class Board:
             img=new_img
         )
 
+    def square_name(self, cell: tuple[int, int]) -> str:
+        return square_name(cell, self.H_cells)
+
     def cell_to_pixel(self, cell: tuple[int, int]) -> tuple[int, int]:
         """
         ממיר מיקום תא (עמודה, שורה) למיקום בפיקסלים על המסך.
@@ -0,0 +1,237 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from Bitboards import Bitboards
+from Material import MaterialTracker
+from Zobrist import ZobristHash
+
+
+def physics_of(piece):
+    """Physics של כלי – תמיכה בשני הסוגים: State (physics) ו-State הישן (_physics)."""
+    state = getattr(piece, "_state", None)
+    return getattr(state, "physics", None) or getattr(state, "_physics", None)
+
+
+def position_of(piece) -> Optional[Tuple[int, int]]:
+    """מיקום הכלי בתאים: physics.cell, ואם אין – board_position או (x, y)."""
+    physics = physics_of(piece)
+    if physics is not None and hasattr(physics, "cell"):
+        return physics.cell
+    return getattr(piece, "board_position", None) or (getattr(piece, "x", None), getattr(piece, "y", None))
+
+
+class BoardIndex:
+    """
+    Occupancy grid of W_cells × H_cells plus a piece_id → piece dict.
+
+    Pieces whose physics exposes `on_cell_change` (Physics) report every
+    change of `Physics.cell` – arrival, jump, a client syncing positions –
+    so the grid always matches `Physics.cell` without rescanning the pieces.
+    A cell normally holds one piece; during an arrival the attacker and its
+    victim share the cell until the capture is resolved.
+
+    `bitboards` mirrors the grid as occupancy masks (see Bitboards) and
+    `material` the membership as material and kings per side (see Material);
+    `zobrist` hashes pieces, cells and piece status (see Zobrist).
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        self._grid: List[List[List]] = [[[] for _ in range(width)] for _ in range(height)]
+        self._by_id: Dict[str, object] = {}
+        self._cells: Dict[int, Tuple[object, Optional[Tuple[int, int]]]] = {}  # id(piece) → (piece, cell)
+        self.bitboards = Bitboards(width, height)
+        self.material = MaterialTracker()
+        self.zobrist = ZobristHash(width, height)
+
+    def on_board(self, cell) -> bool:
+        return (cell is not None and isinstance(cell[0], int) and isinstance(cell[1], int)
+                and 0 <= cell[0] < self.width and 0 <= cell[1] < self.height)
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def _place(self, piece, cell):
+        pieces = self._grid[cell[1]][cell[0]]
+        pieces.append(piece)
+        self.bitboards.set_square(cell[0], cell[1], pieces)
+
+    def _lift(self, piece, cell):
+        pieces = self._grid[cell[1]][cell[0]]
+        pieces.remove(piece)
+        self.bitboards.set_square(cell[0], cell[1], pieces)
+
+    # membership -------------------------------------------------------------
+    def rebuild(self, pieces: Iterable):
+        for piece, _cell in list(self._cells.values()):
+            self.discard(piece)
+        for piece in pieces:
+            self.add(piece)
+
+    def add(self, piece):
+        if id(piece) in self._cells:
+            return
+        cell = position_of(piece)
+        cell = tuple(cell) if cell is not None else None
+        self._cells[id(piece)] = (piece, cell)
+        if self.on_board(cell):
+            self._place(piece, cell)
+        self._by_id.setdefault(piece.piece_id, piece)
+        self.material.add(piece)
+        physics = physics_of(piece)
+        self.zobrist.refresh(piece, cell, physics)
+        if hasattr(physics, "on_cell_change"):
+            physics.on_cell_change = lambda old, new, piece=piece: self.moved(piece, new)
+
+    def discard(self, piece):
+        entry = self._cells.pop(id(piece), None)
+        if entry is None:
+            return
+        cell = entry[1]
+        if self.on_board(cell):
+            self._lift(piece, cell)
+        self.material.discard(piece)
+        self.zobrist.discard(piece)
+        if self._by_id.get(piece.piece_id) is piece:
+            del self._by_id[piece.piece_id]
+            # כלי אחר עם אותו id (נדיר) – הוא נהיה הכלי של ה-id
+            other = next((p for p, _ in self._cells.values() if p.piece_id == piece.piece_id), None)
+            if other is not None:
+                self._by_id[piece.piece_id] = other
+        physics = physics_of(piece)
+        if hasattr(physics, "on_cell_change"):
+            physics.on_cell_change = None
+
+    def moved(self, piece, new_cell):
+        """Physics.cell של `piece` השתנה."""
+        entry = self._cells.get(id(piece))
+        if entry is None:
+            return
+        old_cell = entry[1]
+        new_cell = tuple(new_cell) if new_cell is not None else None
+        if old_cell == new_cell:
+            return
+        if self.on_board(old_cell):
+            self._lift(piece, old_cell)
+        if self.on_board(new_cell):
+            self._place(piece, new_cell)
+        self._cells[id(piece)] = (piece, new_cell)
+        self.zobrist.refresh(piece, new_cell, physics_of(piece))
+
+    def refresh(self, piece):
+        """הסטטוס של הכלי (תנועה/מנוחה) אולי השתנה – מעדכן את ה-hash."""
+        entry = self._cells.get(id(piece))
+        if entry is not None:
+            self.zobrist.refresh(piece, entry[1], physics_of(piece))
+
+    # lookups ----------------------------------------------------------------
+    def piece_at(self, x: int, y: int):
+        """הכלי שנמצא בתא (הראשון שהגיע אליו), או None."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        cell = self._grid[y][x]
+        return cell[0] if cell else None
+
+    def pieces_at(self, x: int, y: int) -> Tuple:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return ()
+        return tuple(self._grid[y][x])
+
+    def get(self, piece_id: str):
+        return self._by_id.get(piece_id)
+
+    def cell_of(self, piece) -> Optional[Tuple[int, int]]:
+        entry = self._cells.get(id(piece))
+        return entry[1] if entry else None
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, piece) -> bool:
+        return id(piece) in self._cells
+
+
+class PieceList(list):
+    """
+    רשימת הכלים של המשחק: list רגילה שמעדכנת את ה-BoardIndex בכל הוספה או
+    הסרה, כך שגם קוד חיצוני (Client) שעושה game.pieces.remove(...) נשאר מסונכרן.
+    on_add(piece) נקרא לכל כלי שנכנס לרשימה (למשל כדי לתזמן לו עדכון).
+    """
+
+    def __init__(self, pieces: Iterable, index: BoardIndex, on_add: Optional[Callable] = None):
+        super().__init__(pieces)
+        self.index = index
+        self.on_add = on_add
+        index.rebuild(self)
+        self._added(self)
+
+    def _added(self, pieces):
+        if self.on_add is not None:
+            for piece in pieces:
+                self.on_add(piece)
+
+    def append(self, piece):
+        super().append(piece)
+        self.index.add(piece)
+        self._added((piece,))
+
+    def insert(self, i, piece):
+        super().insert(i, piece)
+        self.index.add(piece)
+        self._added((piece,))
+
+    def extend(self, pieces):
+        pieces = list(pieces)
+        super().extend(pieces)
+        for piece in pieces:
+            self.index.add(piece)
+        self._added(pieces)
+
+    def __iadd__(self, pieces):
+        self.extend(pieces)
+        return self
+
+    def remove(self, piece):
+        super().remove(piece)
+        if piece not in self:
+            self.index.discard(piece)
+
+    def pop(self, i=-1):
+        piece = super().pop(i)
+        if piece not in self:
+            self.index.discard(piece)
+        return piece
+
+    def clear(self):
+        super().clear()
+        self.index.rebuild(())
+
+    def replace(self, pieces: Iterable):
+        """
+        התוכן הופך ל-pieces (באותו סדר); האינדקס מתעדכן רק בהפרש – יוצאים
+        נמחקים, נכנסים נוספים (ו-on_add), ומי שנשאר זז ל-cell הנוכחי שלו.
+        """
+        pieces = list(pieces)
+        keep = {id(piece) for piece in pieces}
+        for piece in self:
+            if id(piece) not in keep:
+                self.index.discard(piece)
+        added = [piece for piece in pieces if piece not in self.index]
+        list.__setitem__(self, slice(None), pieces)
+        for piece in pieces:
+            if piece in self.index:
+                self.index.moved(piece, position_of(piece))
+            else:
+                self.index.add(piece)
+        self._added(added)
+
+    # החלפות לפי אינדקס/slice נדירות – פשוט בונים את האינדקס מחדש
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            value = list(value)
+        super().__setitem__(i, value)
+        self.index.rebuild(self)
+        self._added(value if isinstance(i, slice) else (value,))
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self.index.rebuild(self)
@@ -302,7 +302,7 @@ class ChessClient:
                 winner_enum = self.game.winner_tracker.get_winner()
                 self.game._draw_winner_image_on_board(display_board, winner_text, winner_enum)
             
-            display_board.img.display_with_background("Chess Game", **info)
+            display_board.img.display_with_background("Chess Game", board_cells=(display_board.W_cells, display_board.H_cells), **info)
     
     def _add_demo_moves(self):
         """הוסף מהלכים דמו לבדיקה"""
@@ -4,13 +4,13 @@ import threading
 import logging
 import pathlib
 import cv2
-import time
 from typing import Dict, List, Optional
 
 from img import Img
 from Board import Board
 from Game import Game
 from PieceFactory import PieceFactory
+from Layout import create_pieces, standard_layout
 import pathlib
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
@@ -24,6 +24,7 @@ class ChessClient:
         self.connected = False
         self.game = None  # משתמש במחלקת Game המקורית
         self.game_over = False
+        self._last_state_hash = None  # ה-hash של מצב השרת שכבר סונכרן
         
         self._init_game()
     
@@ -51,38 +52,12 @@ class ChessClient:
         pieces_root = pathlib.Path(__file__).parent.parent / "pieces"
         factory = PieceFactory(board, pieces_root)
         
-        start_positions = [
-            ("RB", (0, 0)), ("NB", (1, 0)), ("BB", (2, 0)), ("QB", (3, 0)), 
-            ("KB", (4, 0)), ("BB", (5, 0)), ("NB", (6, 0)), ("RB", (7, 0)),
-            ("PB", (0, 1)), ("PB", (1, 1)), ("PB", (2, 1)), ("PB", (3, 1)), 
-            ("PB", (4, 1)), ("PB", (5, 1)), ("PB", (6, 1)), ("PB", (7, 1)),
-            ("PW", (0, 6)), ("PW", (1, 6)), ("PW", (2, 6)), ("PW", (3, 6)), 
-            ("PW", (4, 6)), ("PW", (5, 6)), ("PW", (6, 6)), ("PW", (7, 6)),
-            ("RW", (0, 7)), ("NW", (1, 7)), ("BW", (2, 7)), ("QW", (3, 7)), 
-            ("KW", (4, 7)), ("BW", (5, 7)), ("NW", (6, 7)), ("RW", (7, 7)),
-        ]
+        start_positions = standard_layout(board.W_cells, board.H_cells)
         
-        pieces = []
-        piece_counters = {}
-        
-        for p_type, cell in start_positions:
-            if p_type not in piece_counters:
-                piece_counters[p_type] = 0
-            unique_id = f"{p_type}{piece_counters[p_type]}"
-            piece_counters[p_type] += 1
-            
-            piece = factory.create_piece(p_type, cell, None)
-            piece.piece_id = unique_id
-            
-            if hasattr(piece._state, 'physics'):
-                piece._state.physics.piece_id = unique_id
-            elif hasattr(piece._state, '_physics'):
-                piece._state._physics.piece_id = unique_id
-                
-            pieces.append(piece)
+        pieces = create_pieces(factory, start_positions)
         
         # יצירת משחק מלא
-        self.game = Game(pieces, board)
+        self.game = Game(pieces, board, piece_factory=factory)
         logger.info("לקוח אותחל עם משחק מלא")
     
     def connect_to_server(self):
@@ -139,6 +114,12 @@ class ChessClient:
         from Observer.MoveMadeEvent import MoveMadeEvent
         from datetime import datetime
         
+        # אותו hash כמו בסנכרון הקודם – שום דבר לוגי לא השתנה, אין מה להשוות
+        state_hash = server_state.get('hash')
+        if state_hash is not None and state_hash == self._last_state_hash:
+            return
+        self._last_state_hash = state_hash
+        
         # סנכרון כלים - הוספה/הסרה/שינוי מיקום
         server_pieces = {p['id']: p for p in server_state.get('pieces', [])}
         current_pieces = {p.piece_id: p for p in self.game.pieces}
@@ -172,8 +153,8 @@ class ChessClient:
                     logger.info(f"מזיז כלי {piece.piece_id} מ-{current_pos} ל-{server_pos}")
                     
                     # שלח אירוע מהלך דרך Observer Pattern
-                    start_notation = f"{chr(ord('a') + current_pos[0])}{8 - current_pos[1]}"
-                    end_notation = f"{chr(ord('a') + server_pos[0])}{8 - server_pos[1]}"
+                    start_notation = self.game._notation(current_pos)
+                    end_notation = self.game._notation(server_pos)
                     player_color = "white" if 'W' in piece.piece_id else "black"
                     
                     self.game.publisher.notify(MoveMadeEvent(
@@ -196,7 +177,7 @@ class ChessClient:
         
         # עדכון סמנים ובחירות
         cursors = server_state.get('cursors', {})
-        self.game.cursor_pos_player1 = cursors.get('player1', [0, 7])
+        self.game.cursor_pos_player1 = cursors.get('player1', [0, self.game.board_index.height - 1])
         self.game.cursor_pos_player2 = cursors.get('player2', [0, 0])
         
         selected = server_state.get('selected', {})
@@ -211,21 +192,15 @@ class ChessClient:
         """מצא כלי לפי מיקום"""
         if not position:
             return None
-        for piece in self.game.pieces:
-            if self.game._get_piece_position(piece) == tuple(position):
-                return piece
-        return None
+        return self.game._find_piece_at_position(*position)
     
     def _create_new_piece(self, piece_data):
         """יצירת כלי חדש (למלכות מקידום)"""
-        pieces_root = pathlib.Path(__file__).parent.parent / "pieces"
-        factory = PieceFactory(self.game.board, pieces_root)
-        
         piece_type = piece_data['type']
         position = tuple(piece_data['position'])
         piece_id = piece_data['id']
         
-        new_piece = factory.create_piece(piece_type, position, self.game.user_input_queue)
+        new_piece = self.game._spawn_piece(piece_type, position)
         new_piece.piece_id = piece_id
         
         if hasattr(new_piece._state, 'physics'):
@@ -259,17 +234,13 @@ class ChessClient:
             return
         
         logger.info("הלקוח מתחיל לרוץ")
-        start_ms = self.game.game_time_ms()
-        
-        for p in self.game.pieces:
-            p.reset(start_ms)
+        self.game.start()
         
         while self.connected and not self.game.game_over:
             now = self.game.game_time_ms()
             
-            # עדכון כלים (אנימציות ופיזיקה)
-            for p in self.game.pieces:
-                p.update(now)
+            # עדכון כלים (אנימציות ופיזיקה) – רק אירועים שזמנם הגיע
+            self.game._update_pieces(now)
             
             # עיבוד פקודות
             while not self.game.user_input_queue.empty():
@@ -283,7 +254,7 @@ class ChessClient:
             if not self._handle_input():
                 break
                 
-            time.sleep(1/60.0)
+            self.game.clock.tick()
         
         logger.info("הלקוח נסגר")
         cv2.destroyAllWindows()
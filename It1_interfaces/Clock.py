@@ -0,0 +1,83 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+FRAME_MS = 1000 / 60  # קצב הלולאה של Game.run / השרת / הלקוח
+
+
+class Clock(ABC):
+    """
+    Source of game time for a Game. now_ms() is the only place the game
+    reads the time – pieces, states, physics and timers all get it from
+    there as `now_ms` or a command timestamp – and tick() is called once at
+    the end of every loop iteration to pace the loop (sleep, or just move
+    simulated time forward).
+    """
+
+    @abstractmethod
+    def now_ms(self) -> int:
+        """זמן המשחק הנוכחי במילישניות."""
+
+    def tick(self):
+        """סוף iteration של הלולאה."""
+
+
+class WallClock(Clock):
+    """זמן אמיתי (time.monotonic) וקצב של 60 פריימים בשנייה – ההתנהגות הרגילה של המשחק."""
+
+    def __init__(self, frame_ms: float = FRAME_MS):
+        self.frame_ms = frame_ms
+
+    def now_ms(self) -> int:
+        return int(time.monotonic() * 1000)
+
+    def tick(self):
+        time.sleep(self.frame_ms / 1000)
+
+
+class FixedStepClock(Clock):
+    """
+    Deterministic simulated time: starts at start_ms and moves exactly
+    step_ms per tick(), never sleeping. The same commands at the same ticks
+    give the same game, bit for bit, as fast as the CPU allows.
+    """
+
+    def __init__(self, step_ms: int = 16, start_ms: int = 0):
+        if step_ms <= 0:
+            raise ValueError("step_ms must be positive")
+        self.step_ms = step_ms
+        self.time_ms = start_ms
+        self.ticks = 0
+
+    def now_ms(self) -> int:
+        return self.time_ms
+
+    def tick(self):
+        self.time_ms += self.step_ms
+        self.ticks += 1
+
+    def advance(self, ms: int):
+        self.time_ms += ms
+
+
+class ScaledClock(Clock):
+    """
+    Wall time sped up (or slowed down) by `scale`: 10 → ten game seconds per
+    real second. The loop sleeps frame_ms / scale, so the game still sees
+    about frame_ms between ticks. Runs are not reproducible – for "as fast as
+    possible" and replays use FixedStepClock.
+    """
+
+    def __init__(self, scale: float, frame_ms: float = FRAME_MS, start_ms: Optional[int] = None):
+        if scale <= 0:
+            raise ValueError("scale must be positive")
+        self.scale = scale
+        self.frame_ms = frame_ms
+        self._origin = time.monotonic()
+        self._start_ms = int(self._origin * 1000) if start_ms is None else start_ms
+
+    def now_ms(self) -> int:
+        return self._start_ms + int((time.monotonic() - self._origin) * 1000 * self.scale)
+
+    def tick(self):
+        time.sleep(self.frame_ms / self.scale / 1000)
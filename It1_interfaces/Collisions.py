@@ -0,0 +1,149 @@
+"""
+Mid-flight collisions between moving pieces.
+
+Every piece whose Physics is in a "move" is a point travelling in a straight
+line from start_cell to target_cell between start_time and end_time (cell
+units, clamped at both ends). Between two checks it sweeps a segment; two
+opposing pieces collide when their centres come within COLLISION_DISTANCE
+cells of each other at the same moment. Candidate pairs come from a uniform
+grid (one bucket per board cell) over the swept boxes, so the cost grows with
+the number of moving pieces, not with its square.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from Bitboards import color_of
+from BoardIndex import physics_of
+
+COLLISION_DISTANCE = 0.5  # בתאים: שני כלים במרחק קטן מחצי משבצת – התנגשות
+
+
+@dataclass(frozen=True)
+class Collision:
+    time_ms: float
+    winner: object  # הכלי שהתחיל לנוע קודם – ממשיך בדרכו
+    loser: object   # הכלי שנכנס לדרכו – נתפס
+
+    @property
+    def key(self):
+        return self.time_ms, self.winner.piece_id, self.loser.piece_id
+
+
+class _Flight:
+    """תנועה אחת: נקודה שנעה ישר מ-start ל-end בין t0 ל-t1."""
+    __slots__ = ("piece", "color", "start", "end", "t0", "t1")
+
+    def __init__(self, piece, physics):
+        self.piece = piece
+        self.color = color_of(piece.piece_id)
+        self.start = physics.start_cell
+        self.end = physics.target_cell
+        self.t0, self.t1 = physics.start_time, physics.end_time
+
+    def at(self, t: float) -> Tuple[float, float]:
+        if t >= self.t1:
+            f = 1.0
+        elif t <= self.t0:
+            f = 0.0
+        else:
+            f = (t - self.t0) / (self.t1 - self.t0)
+        return (self.start[0] + (self.end[0] - self.start[0]) * f,
+                self.start[1] + (self.end[1] - self.start[1]) * f)
+
+    def box(self, a: float, b: float, pad: float) -> Tuple[float, float, float, float]:
+        (x0, y0), (x1, y1) = self.at(a), self.at(b)
+        return min(x0, x1) - pad, min(y0, y1) - pad, max(x0, x1) + pad, max(y0, y1) + pad
+
+
+def _first_contact(f: _Flight, g: _Flight, a: float, b: float, distance: float) -> Optional[float]:
+    """הזמן הראשון ב-[a, b] שבו f ו-g קרובים מ-distance, או None."""
+    # בין נקודות השבירה (התחלה/סוף של כל תנועה) ההפרש בין המיקומים ליניארי
+    cuts = sorted({a, b} | {t for t in (f.t0, f.t1, g.t0, g.t1) if a < t < b})
+    r2 = distance * distance
+    for ta, tb in zip(cuts, cuts[1:]):
+        (fx, fy), (gx, gy) = f.at(ta), g.at(ta)
+        (fx2, fy2), (gx2, gy2) = f.at(tb), g.at(tb)
+        dx, dy = fx - gx, fy - gy
+        vx, vy = (fx2 - gx2) - dx, (fy2 - gy2) - dy  # שינוי ההפרש לאורך הקטע
+        c = dx * dx + dy * dy - r2
+        if c < 0:
+            return ta
+        qa = vx * vx + vy * vy
+        qb = 2 * (dx * vx + dy * vy)
+        disc = qb * qb - 4 * qa * c
+        if qa == 0 or qb >= 0 or disc < 0:
+            continue
+        s = (-qb - math.sqrt(disc)) / (2 * qa)
+        if s <= 1:
+            return ta + (tb - ta) * s
+    return None
+
+
+class CollisionEngine:
+    """
+    Finds interceptions between opposing pieces in flight. step() checks the
+    time since the previous step and returns the collisions ordered by the
+    moment of contact; the piece whose move started first wins (ties go to
+    the smaller piece_id), and a piece that already lost in this step takes
+    no part in later collisions.
+
+    `pieces` only has to hold the candidates: Game passes the pieces that
+    entered a move since they last landed, not the whole board.
+    """
+
+    def __init__(self, distance: float = COLLISION_DISTANCE):
+        self.distance = distance
+        self._last_ms: Optional[float] = None
+
+    def step(self, pieces, now_ms: float) -> List[Collision]:
+        start_ms, self._last_ms = (now_ms if self._last_ms is None else self._last_ms), now_ms
+        return self.detect(pieces, start_ms, now_ms)
+
+    def detect(self, pieces, start_ms: float, end_ms: float) -> List[Collision]:
+        flights = []
+        for piece in pieces:
+            physics = physics_of(piece)
+            # כלי בתנועה בחלון הזמן (גם אם הגיע ליעד במהלכו); כלי בקפיצה באוויר – חסין
+            if (physics is not None and getattr(physics, "mode", None) == "move"
+                    and physics.end_time > start_ms and physics.start_time < end_ms):
+                flights.append(_Flight(piece, physics))
+        if len(flights) < 2:
+            return []
+
+        # רשת אחידה: כל תנועה נרשמת בתאים שהקופסה שלה (מורחבת בחצי מרחק) נוגעת בהם
+        pad = self.distance / 2
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for i, flight in enumerate(flights):
+            a, b = max(start_ms, flight.t0), min(end_ms, flight.t1)
+            x0, y0, x1, y1 = flight.box(a, b, pad)
+            for gx in range(math.floor(x0), math.floor(x1) + 1):
+                for gy in range(math.floor(y0), math.floor(y1) + 1):
+                    grid.setdefault((gx, gy), []).append(i)
+
+        pairs: Set[Tuple[int, int]] = set()
+        for bucket in grid.values():
+            for n, i in enumerate(bucket):
+                for j in bucket[n + 1:]:
+                    if flights[i].color != flights[j].color:
+                        pairs.add((i, j) if i < j else (j, i))
+
+        hits = []
+        for i, j in pairs:
+            f, g = flights[i], flights[j]
+            a, b = max(start_ms, f.t0, g.t0), min(end_ms, f.t1, g.t1)
+            if a > b:
+                continue
+            t = _first_contact(f, g, a, b, self.distance)
+            if t is None:
+                continue
+            first, second = sorted((f, g), key=lambda fl: (fl.t0, fl.piece.piece_id))
+            hits.append(Collision(t, first.piece, second.piece))
+
+        collisions, lost = [], set()
+        for hit in sorted(hits, key=lambda h: h.key):
+            if id(hit.winner) in lost or id(hit.loser) in lost:
+                continue
+            lost.add(id(hit.loser))
+            collisions.append(hit)
+        return collisions
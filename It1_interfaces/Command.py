@@ -1,10 +1,44 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Command:
     timestamp: int          # ms since game start
     piece_id: str
     type: str               # "move" | "jump" | "reset" | ...
     params: Optional[List] = None  # payload (e.g. ["e2", "e4"]) 
     target: Optional[Tuple[int, int]] = None  # target position for moves 
+
+
+class CommandPool:
+    """
+    Free list of Command objects for high-rate internal events ("arrived"):
+    acquire() reuses a released Command instead of allocating a new one,
+    release() hands it back once the game has processed it.
+    """
+
+    def __init__(self, limit: int = 1024):
+        self._free: List[Command] = []
+        self._limit = limit
+
+    def acquire(self, timestamp: int, piece_id: str, type: str,
+                target: Optional[Tuple[int, int]] = None, params: Optional[List] = None) -> Command:
+        try:
+            cmd = self._free.pop()
+        except IndexError:  # הבריכה ריקה
+            return Command(timestamp, piece_id, type, params, target)
+        cmd.timestamp, cmd.piece_id, cmd.type = timestamp, piece_id, type
+        cmd.params, cmd.target = params, target
+        return cmd
+
+    def release(self, cmd: Command):
+        """מחזיר פקודה שאף אחד כבר לא מחזיק לשימוש חוזר."""
+        if len(self._free) < self._limit:
+            self._free.append(cmd)
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+
+# פקודות ה-"arrived" שיוצרות Physics.update – Game משחרר אותן אחרי _handle_arrival
+ARRIVALS = CommandPool()
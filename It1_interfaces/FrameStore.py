@@ -0,0 +1,173 @@
+import os
+import pathlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from img import Img
+
+logger = logging.getLogger(__name__)
+
+FrameKey = Tuple[str, Tuple[int, int]]
+
+
+class FrameStore:
+    """
+    Process-wide, read-only store of decoded sprite frames.
+
+    Frames are decoded and resized once per (sprite folder, size) and then
+    shared by every Graphics that plays them – 32 pieces cloned from the same
+    template hold references to one tuple of Img objects instead of 32 copies.
+    The pixel arrays are marked read-only: sprites are only ever drawn *from*.
+
+    With a `budget_bytes`, the store is an LRU: when decoded frames exceed the
+    budget the least recently used folders are dropped and decoded again on
+    their next use. Frames registered with put() (views into a mapped asset
+    bundle) are pinned – they cost page cache, not heap, and cannot be
+    re-decoded.
+
+    The budget belongs to the process, not to a game or a factory: set it
+    once at startup with FRAME_STORE.set_budget(bytes), before the first
+    PieceFactory is built.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None):
+        self._frames: "OrderedDict[FrameKey, Tuple[Img, ...]]" = OrderedDict()
+        self._sizes: Dict[FrameKey, int] = {}
+        self._pinned: Set[FrameKey] = set()
+        self._nbytes = 0
+        self.budget_bytes = budget_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(sprites_folder: pathlib.Path, size: Tuple[int, int]) -> FrameKey:
+        # abspath ולא resolve – בלי קריאות מערכת, המפתח מחושב בכל יצירת Graphics
+        return os.path.abspath(sprites_folder), tuple(size)
+
+    def get(self, sprites_folder: pathlib.Path, size: Tuple[int, int] = (80, 80)) -> Tuple[Img, ...]:
+        """Frames of `sprites_folder` (sorted by file name), loading them on first use."""
+        return self.lookup(self.key(sprites_folder, size))
+
+    def lookup(self, key: FrameKey) -> Tuple[Img, ...]:
+        """get() by a precomputed key – the per-frame path used by Graphics."""
+        # מסלול מהיר בלי נעילה: get/move_to_end הן פעולות C אטומיות תחת ה-GIL
+        frames = self._frames.get(key)
+        if frames is not None:
+            if self.budget_bytes is None:
+                return frames  # בלי תקציב אין פינוי – לא צריך לעדכן סדר LRU
+            try:
+                self._frames.move_to_end(key)
+                return frames
+            except KeyError:
+                pass  # פונה ברגע זה ע"י thread אחר
+        frames = self.decode(pathlib.Path(key[0]), key[1])
+        return self._insert(key, frames)
+
+    def put(self, sprites_folder: pathlib.Path, size: Tuple[int, int], frames: Tuple[Img, ...]):
+        """Register frames decoded elsewhere (e.g. views into an asset bundle). They are never evicted."""
+        key = self.key(sprites_folder, size)
+        with self._lock:
+            self._discard(key)
+            self._pinned.add(key)
+        self._insert(key, tuple(frames) if frames else (Img(),))
+
+    def _insert(self, key: FrameKey, frames: Tuple[Img, ...]) -> Tuple[Img, ...]:
+        with self._lock:
+            # אם thread אחר טען במקביל – משתמשים בעותק שכבר נשמר
+            existing = self._frames.get(key)
+            if existing is not None:
+                self._frames.move_to_end(key)
+                return existing
+            self._frames[key] = frames
+            if key not in self._pinned:
+                self._sizes[key] = sum(img.img.nbytes for img in frames if img.img is not None)
+                self._nbytes += self._sizes[key]
+                self._evict(keep=key)
+        return frames
+
+    def _discard(self, key: FrameKey):
+        if self._frames.pop(key, None) is not None:
+            self._nbytes -= self._sizes.pop(key, 0)
+            self._pinned.discard(key)
+
+    def _evict(self, keep: Optional[FrameKey] = None):
+        """Drop least recently used folders until the budget holds (never `keep`, never pinned)."""
+        if self.budget_bytes is None:
+            return
+        for key in list(self._frames):
+            if self._nbytes <= self.budget_bytes:
+                break
+            if key == keep or key in self._pinned:
+                continue
+            self._discard(key)
+            self.evictions += 1
+            logger.debug("Evicted sprite frames of %s", key[0])
+
+    def set_budget(self, budget_bytes: Optional[int]):
+        """Change the memory budget (None = unbounded) and evict down to it."""
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def __contains__(self, key: FrameKey) -> bool:
+        return key in self._frames
+
+    def preload(self, sprites_folders: Iterable[pathlib.Path], size: Tuple[int, int] = (80, 80),
+                workers: Optional[int] = None):
+        """
+        Decode many sprite folders at once on a thread pool – cv2.imread and
+        cv2.resize release the GIL, so this scales with cores. Every file
+        keeps its place in the sorted listing, so the stored frames are exactly
+        what serial loading produces. workers=None uses all CPUs, 1 is serial.
+        """
+        pending = [pathlib.Path(f) for f in dict.fromkeys(sprites_folders)
+                   if self.key(f, size) not in self]
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or not pending:
+            for folder in pending:
+                self.get(folder, size)
+            return
+
+        listings = [sorted(folder.glob("*.png")) for folder in pending]
+        paths = [path for listing in listings for path in listing]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sprite-decode") as pool:
+            decoded = iter(list(pool.map(lambda path: self.decode_file(path, size), paths)))
+        for folder, listing in zip(pending, listings):
+            frames = tuple(next(decoded) for _ in listing)
+            self._insert(self.key(folder, size), frames or (Img(),))
+        logger.debug("Decoded %d frames from %d folders with %d workers", len(paths), len(pending), workers)
+
+    @staticmethod
+    def decode_file(img_path: pathlib.Path, size: Tuple[int, int]) -> Img:
+        img = Img().read(str(img_path), size=size)
+        if img.img is not None:
+            img.img.flags.writeable = False
+        return img
+
+    @classmethod
+    def decode(cls, sprites_folder: pathlib.Path, size: Tuple[int, int]) -> Tuple[Img, ...]:
+        """Read and resize every PNG of `sprites_folder`, sorted by file name."""
+        frames = [cls.decode_file(img_path, size) for img_path in sorted(sprites_folder.glob("*.png"))]
+        logger.debug("Loaded %d frames from %s", len(frames), sprites_folder)
+        return tuple(frames) if frames else (Img(),)  # לפחות פריים ריק
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def nbytes(self) -> int:
+        """Decoded pixel bytes held by the store (pinned bundle views excluded)."""
+        return self._nbytes
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._sizes.clear()
+            self._pinned.clear()
+            self._nbytes = 0
+
+
+# מופע משותף לכל התהליך
+FRAME_STORE = FrameStore()
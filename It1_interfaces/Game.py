@@ -1,8 +1,9 @@
-import pathlib, queue, time, cv2, logging
-from typing import List
+import pathlib, queue, cv2, logging
+from collections import deque
+from typing import Iterable, List, Optional
 from img import Img
-from Board import Board
-from Command import Command
+from Board import Board, square_name
+from Command import ARRIVALS, Command
 from Piece import Piece
 from Observer.Publisher import Publisher
 from Observer.ScoreTracker import ScoreTracker
@@ -12,6 +13,17 @@ from Observer.MoveMadeEvent import MoveMadeEvent
 from Observer.WinnerTracker import WinnerTracker
 from Observer.GameOverEvent import GameOverEvent
 from Observer.EventType import EventType
+from Renderer import LayeredRenderer
+from BoardIndex import BoardIndex, PieceList, physics_of, position_of
+from Bitboards import AttackTables, color_of
+from MoveGenerator import MoveGenerator
+from Collisions import CollisionEngine
+from Scheduler import Scheduler
+from PhysicsWorld import PhysicsWorld
+from PieceFactory import PieceFactory
+from PiecePool import PiecePool
+from Snapshot import GameSnapshot
+from Clock import Clock, WallClock
 
 # הגדרת לוגגר פשוטה
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
@@ -20,22 +32,46 @@ logger = logging.getLogger(__name__)
 class InvalidBoard(Exception): ...
 
 class Game:
-    def __init__(self, pieces: List[Piece], board: Board):
-        self.pieces = pieces
+    def __init__(self, pieces: List[Piece], board: Board, piece_factory: PieceFactory = None, clock: Clock = None,
+                 sound: bool = True):
         self.board = board
+        # False – play_sound לא עושה כלום (שרת, ריצה headless): טעינת mp3 והמתנה לצליל חוסמות את הלולאה
+        self.sound = sound
+        # מפעל הכלים של התהליך + כלים מוכנים מראש לקידום – קידום לא בונה מפעל באמצע המשחק
+        self.piece_factory = piece_factory
+        # מערכים של ה-Physics של המשחק – אינטרפולציה וקטורית אחת לכל ה-tick. לכל משחק
+        # עולם משלו (של המפעל שלו), כך ש-step של משחק אחד לא מזיז כלים של משחק אחר
+        self.physics_world = piece_factory.world if piece_factory is not None else PhysicsWorld()
+        self.piece_pool = PiecePool(piece_factory, world=self.physics_world) if piece_factory is not None else None
+        # אירועים מתוזמנים: הגעות, סוף מנוחה, פריימים של אנימציה, סיום משחק
+        self.timers = Scheduler()
+        # מקור הזמן היחיד של המשחק: שעון קיר, צעד קבוע (סימולציה דטרמיניסטית) או מואץ
+        self.clock = clock if clock is not None else WallClock()
+        self._piece_timers = {}  # id(piece) → Timer – העדכון הבא של הכלי
+        self._end_game_timer = None  # סיום המשחק אחרי הודעת הניצחון
+        self._started = False  # הכלים אופסו לזמן ההתחלה (start)
+        # רשת תפוסה + piece_id → כלי, מתעדכנים עם כל שינוי ב-pieces וב-Physics.cell
+        self.board_index = BoardIndex(getattr(board, "W_cells", 8), getattr(board, "H_cells", 8))
+        self.attack_tables = AttackTables(self.board_index.width, self.board_index.height)
+        self.move_generator = MoveGenerator(self)  # כל המהלכים החוקיים – להדגשה, בוטים ושרת
+        self.collisions = CollisionEngine()  # תפיסות באמצע תנועה
+        self._in_flight = {}  # id(piece) → כלי ב-move – רק הם נבדקים להתנגשויות
+        self.pieces = pieces
         self.user_input_queue = queue.Queue()
         self.selected_piece_player1 = None
         self.selected_piece_player2 = None
-        self.cursor_pos_player1 = [0, 7]
+        self.cursor_pos_player1 = [0, self.board_index.height - 1]
         self.cursor_pos_player2 = [0, 0]
         self.game_over = False
         self.winner_announced = False
         self.jumping_pieces = set()  # כלים שנמצאים בקפיצה
+        self.renderer = None  # LayeredRenderer, נוצר בציור הראשון
+        self._hud_cache = None  # (versions, score_info, moves_info) – נבנה מחדש רק כשהמשקיפים משתנים
         
         # טעינת שמות המשתמשים
         self.player_names = self._load_player_names()
         
-        observers = [ScoreTracker(), MoveLogger(), WinnerTracker()]
+        observers = [ScoreTracker(self.board_index.material), MoveLogger(), WinnerTracker()]
         self.score_tracker, self.move_logger, self.winner_tracker = observers
         self.publisher = Publisher()
         for observer in observers:
@@ -64,10 +100,41 @@ class Game:
         logger.info(f"שימוש בשמות ברירת מחדל: {default_names}")
         return default_names
 
+    @property
+    def pieces(self) -> PieceList:
+        return self._pieces
+
+    @pieces.setter
+    def pieces(self, pieces):
+        self._pieces = PieceList(pieces, self.board_index, on_add=self._arm_piece)
+
+    def state_hash(self) -> int:
+        """
+        Zobrist hash (64 ביט) של המצב הלוגי: כלים, משבצות וסטטוס מה-BoardIndex,
+        ועוד הסמן והכלי הנבחר של כל שחקן, הכרזת הניצחון וסיום המשחק – O(1).
+        """
+        zobrist = self.board_index.zobrist
+        value = zobrist.value
+        for player, (cursor, selected) in enumerate(((self.cursor_pos_player1, self.selected_piece_player1),
+                                                     (self.cursor_pos_player2, self.selected_piece_player2))):
+            value ^= zobrist.side(player, cursor, self.board_index.cell_of(selected) if selected is not None else None)
+        if self.winner_announced:
+            value ^= zobrist.winner_key
+        return value ^ zobrist.game_over_key if self.game_over else value
+
+    def snapshot(self) -> GameSnapshot:
+        """מצב לוגי של המשחק (בלי גרפיקה) – ל-rollback, חיפוש של בוט ושחזור אחרי קריסה."""
+        return GameSnapshot(self)
+
+    def restore(self, snapshot: GameSnapshot):
+        snapshot.restore(self)
+
     def game_time_ms(self) -> int:
-        return int(time.monotonic() * 1000)
+        return self.clock.now_ms()
 
     def play_sound(self, sound_name):
+        if not self.sound:
+            return
         try:
             import pygame
             if not pygame.mixer.get_init():
@@ -93,18 +160,24 @@ class Game:
     def clone_board(self) -> Board:
         return self.board.clone()
 
-    def run(self):
-        logger.info("התחלת משחק שחמט")
+    def start(self):
+        """מאפס את כל הכלים לזמן הנוכחי של השעון – רק בפעם הראשונה, לא באמצע משחק שכבר רץ."""
+        if self._started:
+            return
+        self._started = True
         start_ms = self.game_time_ms()
         for p in self.pieces:
             p.reset(start_ms)
+
+    def run(self):
+        logger.info("התחלת משחק שחמט")
+        self.start()
         
         logger.info(f"משחק מתחיל עם {len(self.pieces)} כלים")
 
         while not self.game_over:
             now = self.game_time_ms()
-            for p in self.pieces:
-                p.update(now)
+            self._update_pieces(now)
 
             while not self.user_input_queue.empty():
                 cmd: Command = self.user_input_queue.get()
@@ -117,7 +190,7 @@ class Game:
                 break
 
             self._resolve_collisions()
-            time.sleep(1/60.0)
+            self.clock.tick()
 
         if self.game_over:
             while not self.user_input_queue.empty():
@@ -125,28 +198,111 @@ class Game:
         logger.info("המשחק הסתיים")
         cv2.destroyAllWindows()
 
+    def step(self, now_ms: Optional[int] = None):
+        """iteration אחד של הלוגיקה בלי ציור וקלט: עדכון כלים, פקודות ותפיסות באוויר."""
+        now_ms = self.game_time_ms() if now_ms is None else now_ms
+        self._update_pieces(now_ms)
+        while not self.user_input_queue.empty():
+            self._process_input(self.user_input_queue.get())
+            if self.game_over:
+                break
+        self._resolve_collisions(now_ms)
+
+    def run_headless(self, commands: Iterable[Command] = (), until_ms: Optional[int] = None,
+                     max_ticks: Optional[int] = None) -> int:
+        """
+        The game loop without a window: step() and clock.tick() until the game
+        is over, the clock reaches until_ms or max_ticks ticks ran. `commands`
+        are fed in when the clock reaches their timestamp, so with a
+        FixedStepClock the same commands replay the same game bit for bit, as
+        fast as the CPU allows. Returns the number of ticks.
+
+        Calling it again continues the same game (pieces are reset only on
+        the first start), so a long run can be split into chunks; each call
+        feeds only the commands passed to it. Sounds are muted while it runs.
+        """
+        pending = deque(sorted(commands, key=lambda cmd: cmd.timestamp))
+        self.start()
+
+        ticks = 0
+        sound, self.sound = self.sound, False
+        try:
+            while not self.game_over and (max_ticks is None or ticks < max_ticks):
+                now = self.game_time_ms()
+                if until_ms is not None and now >= until_ms:
+                    break
+                while pending and pending[0].timestamp <= now:
+                    self.user_input_queue.put(pending.popleft())
+                self.step(now)
+                ticks += 1
+                self.clock.tick()
+        finally:
+            self.sound = sound
+        return ticks
+
+    def _update_pieces(self, now_ms: int) -> int:
+        """
+        מריץ רק את מה שזמנו הגיע – כלים שמגיעים ליעד, מסיימים מנוחה או מחליפים
+        פריים, וסיום משחק מושהה. כלי שעומד בלי אנימציה לא עולה כלום. מיקומי
+        הכלים שבתנועה מתקדמים כולם יחד ב-PhysicsWorld.step.
+        """
+        self.physics_world.step(now_ms)
+        return self.timers.run_due(now_ms)
+
+    def _arm_piece(self, piece, at_ms=0):
+        """תזמון העדכון הבא של כלי (0 – ב-tick הבא, None – רק אחרי פקודה)."""
+        if getattr(physics_of(piece), "mode", None) == "move":
+            self._in_flight[id(piece)] = piece
+        timer = self._piece_timers.pop(id(piece), None)
+        if timer is not None:
+            self.timers.cancel(timer)
+        if at_ms is not None:
+            self._piece_timers[id(piece)] = self.timers.schedule(at_ms, self._wake_piece, piece)
+
+    def _wake_piece(self, now_ms, piece):
+        self._piece_timers.pop(id(piece), None)
+        if piece not in self.board_index:
+            return  # נתפס או הוסר בינתיים
+        piece.update(now_ms)
+        self.board_index.refresh(piece)  # הגעה / סוף מנוחה משנים את הסטטוס ב-hash
+        self._arm_piece(piece, self._next_update_ms(piece, now_ms))
+
+    def _next_update_ms(self, piece, now_ms):
+        state = piece._state
+        physics = physics_of(piece)
+        graphics = getattr(state, 'graphics', None) or getattr(state, '_graphics', None)
+        if not (hasattr(physics, 'next_event_ms') and hasattr(graphics, 'next_frame_ms')):
+            return now_ms + 1  # כלי בלי לוח זמנים ידוע – מתעדכן בכל tick
+        interpolated = getattr(physics, 'world', None) is self.physics_world
+        deadlines = [t for t in (physics.next_event_ms(now_ms, interpolated), graphics.next_frame_ms(now_ms))
+                     if t is not None]
+        return max(min(deadlines), now_ms + 1) if deadlines else None
+
     def _process_input(self, cmd : Command):
         logger.debug(f"מעבד פקודה: {cmd.type} עבור כלי {cmd.piece_id}")
         
         if cmd.type == "arrived":
             self._handle_arrival(cmd)
+            ARRIVALS.release(cmd)  # אף אחד לא מחזיק את פקודת ההגעה אחרי הטיפול
             return
         elif cmd.type == "jump":
             # כשכלי מתחיל קפיצה, מוסיפים אותו לרשימת הקופצים
             self.jumping_pieces.add(cmd.piece_id)
             logger.debug(f"כלי {cmd.piece_id} מתחיל קפיצה")
         
-        for piece in self.pieces:
-            if piece.piece_id == cmd.piece_id:
-                piece.on_command(cmd, self.game_time_ms())
-                if self._is_win() and not self.winner_announced:
-                    logger.info("זוהה ניצחון במשחק")
-                    self._announce_win()
-                    self.winner_announced = True
-                break
+        piece = self.board_index.get(cmd.piece_id)
+        if piece is not None:
+            now_ms = self.game_time_ms()
+            piece.on_command(cmd, now_ms)
+            self.board_index.refresh(piece)
+            self._arm_piece(piece, self._next_update_ms(piece, now_ms))
+            if self._is_win() and not self.winner_announced:
+                logger.info("זוהה ניצחון במשחק")
+                self._announce_win()
+                self.winner_announced = True
 
     def _handle_arrival(self, cmd: Command):
-        arriving_piece = next((p for p in self.pieces if p.piece_id == cmd.piece_id), None)
+        arriving_piece = self.board_index.get(cmd.piece_id)
         if not arriving_piece:
             logger.warning(f"כלי לא נמצא עבור פקודת הגעה: {cmd.piece_id}")
             return
@@ -167,53 +323,67 @@ class Game:
             
         self._check_pawn_promotion(arriving_piece, target_pos)
         
+        # בדיקת מסכה: רק אם יש כלי יריב במשבצת היעד בודקים את הכלים שבה
+        # (כלי בקפיצה לא נחשב "נמצא" במשבצת)
+        bitboards = self.board_index.bitboards
+        enemy = 'B' if color_of(arriving_piece.piece_id) == 'W' else 'W'
         pieces_to_remove = []
-        for p in self.pieces:
-            if p != arriving_piece:
-                # אם הכלי נמצא בקפיצה, הוא לא נחשב "נמצא" במשבצת
-                if p.piece_id in self.jumping_pieces:
-                    continue
-                    
-                p_physics = getattr(p._state, 'physics', None) or getattr(p._state, '_physics', None)
-                if (p_physics and p_physics.cell == target_pos and 
-                    ('W' in arriving_piece.piece_id) != ('W' in p.piece_id)):
-                    pieces_to_remove.append(p)
+        if self.board_index.contains(*target_pos) and bitboards.colors[enemy] & bitboards.bit(*target_pos):
+            pieces_to_remove = [
+                p for p in self.board_index.pieces_at(*target_pos)
+                if color_of(p.piece_id) == enemy and p.piece_id not in self.jumping_pieces
+            ]
         
         for piece in pieces_to_remove:
-            self.pieces.remove(piece)
-            piece_type = piece.piece_id[0]
-            captured_by = "white" if 'W' in arriving_piece.piece_id else "black"
-            logger.info(f"כלי {piece.piece_id} נתפס על ידי {arriving_piece.piece_id}")
-            self.publisher.notify(PieceCaptureEvent(piece_type, captured_by))
-            self.play_sound("keel")
+            self._capture(piece, arriving_piece)
         
         if pieces_to_remove and self._is_win() and not self.winner_announced:
             logger.info("ניצחון לאחר תפיסת כלי")
             self._announce_win()
             self.winner_announced = True
 
+    def _capture(self, piece, captured_by_piece):
+        self.pieces.remove(piece)
+        piece_type = piece.piece_id[0]
+        captured_by = "white" if 'W' in captured_by_piece.piece_id else "black"
+        logger.info(f"כלי {piece.piece_id} נתפס על ידי {captured_by_piece.piece_id}")
+        self.publisher.notify(PieceCaptureEvent(piece_type, captured_by))
+        self.play_sound("keel")
+
     def _check_pawn_promotion(self, piece, target_pos):
         if not piece.piece_id.startswith('P'):
             return
             
         col, row = target_pos
-        promotion_rules = {('W', 0): "QW", ('B', 7): "QB"}
+        promotion_rules = {('W', 0): "QW", ('B', self.board_index.height - 1): "QB"}
         color = 'W' if 'W' in piece.piece_id else 'B'
         
         if (color, row) in promotion_rules:
             logger.info(f"חיל {piece.piece_id} מתקדם למלכה במיקום {target_pos}")
             self._promote_pawn_to_queen(piece, promotion_rules[(color, row)], target_pos)
 
+    def _piece_pool(self) -> PiecePool:
+        if self.piece_pool is None:
+            # בלי מפעל מבחוץ: המפעל המשותף של התהליך, נבנה פעם אחת
+            if self.piece_factory is None:
+                self.piece_factory = PieceFactory.shared(self.board, pathlib.Path(__file__).parent.parent / "pieces")
+            self.piece_pool = PiecePool(self.piece_factory, world=self.physics_world)
+        return self.piece_pool
+
+    def _spawn_piece(self, p_type, cell):
+        """כלי שנכנס באמצע המשחק (קידום) – מהמאגר; המאגר מתמלא מחדש ב-tick הבא."""
+        pool = self._piece_pool()
+        piece = pool.take(p_type, tuple(cell), self.user_input_queue)
+        self.timers.schedule(self.game_time_ms() + 1, pool.refill)
+        return piece
+
     def _promote_pawn_to_queen(self, pawn, queen_type, position):
-        from PieceFactory import PieceFactory
-        factory = PieceFactory(self.board, pathlib.Path(__file__).parent.parent / "pieces")
-        
         existing_queens = [p for p in self.pieces if p.piece_id.startswith(queen_type)]
         queen_id = f"{queen_type}{len(existing_queens)}"
         
         logger.info(f"יוצר מלכה חדשה: {queen_id} במיקום {position}")
         
-        new_queen = factory.create_piece(queen_type, position, self.user_input_queue)
+        new_queen = self._spawn_piece(queen_type, position)
         new_queen.piece_id = queen_id
         
         # תמיכה בשני הסוגים: State (physics) ו-State הישן (_physics)
@@ -226,37 +396,50 @@ class Game:
         logger.info(f"חיל {pawn.piece_id} הוחלף במלכה {queen_id}")
 
     def _draw(self):
-        display_board = self.clone_board()
-        now = self.game_time_ms()
-        for p in self.pieces:
-            p.draw_on_board(display_board, now)
-        
-        if hasattr(display_board, "img"):
-            info = {
-                'cursors_info': {
-                    'player1_cursor': self.cursor_pos_player1,
-                    'player2_cursor': self.cursor_pos_player2,
-                    'player1_selected': self._get_piece_position(self.selected_piece_player1),
-                    'player2_selected': self._get_piece_position(self.selected_piece_player2)
-                },
-                'score_info': {
-                    'white_score': self.score_tracker.get_score("white"),
-                    'black_score': self.score_tracker.get_score("black")
-                },
-                'moves_info': {
-                    'white_moves': self.move_logger.get_moves("white"),
-                    'black_moves': self.move_logger.get_moves("black")
-                },
-                'player_names': self.player_names
+        img = getattr(self.board, "img", None)
+        if getattr(img, "img", None) is None:
+            return
+        if self.renderer is None:
+            self.renderer = LayeredRenderer(self.board, "Chess Game")
+
+        overlay = None
+        winner_text = self.winner_tracker.get_winner_text()
+        if winner_text:
+            winner_enum = self.winner_tracker.get_winner()
+            logger.info(f"Winner enum for image: {winner_enum}")
+            overlay = lambda scene: self._draw_winner_image_on_board(scene, winner_text, winner_enum)
+
+        hud_version, score_info, moves_info = self._hud_info()
+        self.renderer.render(
+            self.pieces, self.game_time_ms(),
+            cursors_info={
+                'player1_cursor': self.cursor_pos_player1,
+                'player2_cursor': self.cursor_pos_player2,
+                'player1_selected': self._get_piece_position(self.selected_piece_player1),
+                'player2_selected': self._get_piece_position(self.selected_piece_player2)
+            },
+            score_info=score_info,
+            moves_info=moves_info,
+            player_names=self.player_names,
+            overlay=overlay,
+            hud_version=hud_version,
+        )
+        self.renderer.show()
+
+    def _hud_info(self):
+        """score_info/moves_info לציור, נבנים מחדש רק כש-ScoreTracker או MoveLogger פרסמו שינוי."""
+        version = (self.score_tracker.version, self.move_logger.version)
+        if self._hud_cache is None or self._hud_cache[0] != version:
+            score_info = {
+                'white_score': self.score_tracker.get_score("white"),
+                'black_score': self.score_tracker.get_score("black")
             }
-            
-            winner_text = self.winner_tracker.get_winner_text()
-            if winner_text:
-                winner_enum = self.winner_tracker.get_winner()
-                logger.info(f"Winner enum for image: {winner_enum}")
-                self._draw_winner_image_on_board(display_board, winner_text, winner_enum)
-            
-            display_board.img.display_with_background("Chess Game", **info)
+            moves_info = {
+                'white_moves': self.move_logger.get_moves("white"),
+                'black_moves': self.move_logger.get_moves("black")
+            }
+            self._hud_cache = (version, score_info, moves_info)
+        return self._hud_cache
 
     def _draw_winner_image_on_board(self, board, winner_text, winner_enum):
         if not (hasattr(board, 'img') and hasattr(board.img, 'img')):
@@ -343,12 +526,18 @@ class Game:
         return False
 
     def _move_cursor_player1(self, dx, dy):
-        self.cursor_pos_player1 = [max(0, min(7, self.cursor_pos_player1[0] + dx)), 
-                                  max(0, min(7, self.cursor_pos_player1[1] + dy))]
+        self.cursor_pos_player1 = self._clamp_cursor(self.cursor_pos_player1, dx, dy)
 
     def _move_cursor_player2(self, dx, dy):
-        self.cursor_pos_player2 = [max(0, min(7, self.cursor_pos_player2[0] + dx)), 
-                                  max(0, min(7, self.cursor_pos_player2[1] + dy))]
+        self.cursor_pos_player2 = self._clamp_cursor(self.cursor_pos_player2, dx, dy)
+
+    def _clamp_cursor(self, cursor, dx, dy):
+        """הסמן זז בתוך גבולות הלוח (W_cells x H_cells)."""
+        return [max(0, min(self.board_index.width - 1, cursor[0] + dx)),
+                max(0, min(self.board_index.height - 1, cursor[1] + dy))]
+
+    def _notation(self, cell):
+        return square_name(cell, self.board_index.height)
 
     def _select_piece_player1(self):
         self._select_piece_for_player(1, self.cursor_pos_player1, 'selected_piece_player1')
@@ -408,15 +597,10 @@ class Game:
     def _get_piece_position(self, piece):
         if not piece:
             return None
-        # תמיכה בשני הסוגים: State (physics) ו-State הישן (_physics)
-        if hasattr(piece, '_state'):
-            physics = getattr(piece._state, 'physics', None) or getattr(piece._state, '_physics', None)
-            if physics and hasattr(physics, 'cell'):
-                return physics.cell
-        return getattr(piece, 'board_position', None) or (getattr(piece, 'x', None), getattr(piece, 'y', None))
+        return position_of(piece)
 
     def _find_piece_at_position(self, x, y):
-        return next((p for p in self.pieces if self._get_piece_position(p) == (x, y)), None)
+        return self.board_index.piece_at(x, y)
 
     def _is_player_piece(self, piece, player_num):
         return ('W' in piece.piece_id) == (player_num == 1)
@@ -443,8 +627,8 @@ class Game:
             self.play_sound("fail")  # מנסים לתקוף כלי שלנו
             return
         
-        start_notation = f"{chr(ord('a') + current_x)}{8 - current_y}"
-        end_notation = f"{chr(ord('a') + final_x)}{8 - final_y}"
+        start_notation = self._notation((current_x, current_y))
+        end_notation = self._notation((final_x, final_y))
         
         if target_piece:
             logger.info(f"מהלך תקיפה: {piece.piece_id} מ-{start_notation} ל-{end_notation} (תוקף את {target_piece.piece_id})")
@@ -474,83 +658,83 @@ class Game:
         if piece_type.startswith('N') or (piece_type.startswith('K') and abs(end_x - start_x) <= 1 and abs(end_y - start_y) <= 1):
             return None
         
-        dx, dy = end_x - start_x, end_y - start_y
-        step_x = 0 if dx == 0 else (1 if dx > 0 else -1)
-        step_y = 0 if dy == 0 else (1 if dy > 0 else -1)
-        
-        x, y = start_x + step_x, start_y + step_y
-        while (x, y) != (end_x, end_y):
-            if self._find_piece_at_position(x, y):
-                return (x, y)
-            x, y = x + step_x, y + step_y
-        return None
+        return self.attack_tables.first_blocker((start_x, start_y), (end_x, end_y),
+                                                self.board_index.bitboards.occupied)
 
     def _is_valid_move(self, piece, new_x, new_y, player_num):
-        if not (0 <= new_x <= 7 and 0 <= new_y <= 7):
+        if not self.board_index.contains(new_x, new_y):
             return False
         
         current_pos = self._get_piece_position(piece)
-        if not current_pos:
+        if not current_pos or not self.board_index.contains(*current_pos):
             return False
         
-        dx, dy = new_x - current_pos[0], new_y - current_pos[1]
-        
         # תמיכה בשני הסוגים: State (moves) ו-State הישן (_moves)
         moves_obj = None
         if hasattr(piece._state, 'moves'):
             moves_obj = piece._state.moves
         elif hasattr(piece._state, '_moves'):
             moves_obj = piece._state._moves
+        if not (moves_obj and hasattr(moves_obj, 'valid_moves')):
+            return False
         
-        if moves_obj and hasattr(moves_obj, 'valid_moves'):
-            for move_dx, move_dy, move_type in moves_obj.valid_moves:
-                if dx == move_dx and dy == move_dy:
-                    # בדיקת חסימה בדרך
-                    blocking_pos = self._check_path(*current_pos, new_x, new_y, piece.piece_id)
-                    if blocking_pos and blocking_pos != (new_x, new_y):
-                        return False
-                    
-                    # לוגיקה פשוטה: בדוק מה יש במקום היעד
-                    target_piece = self._find_piece_at_position(new_x, new_y)
-                    
-                    # אם זה תנועת תפיסה (capture) - חייב להיות יריב
-                    if move_type == "capture":
-                        return target_piece and not self._is_player_piece(target_piece, player_num)
-                    
-                    # אם זה תנועה רגילה (non_capture או 1st) - המקום חייב להיות ריק
-                    if move_type in ["non_capture", "1st"]:
-                        if target_piece is not None:
-                            return False
-                        # בדיקה מיוחדת למהלך ראשון של חיל
-                        if move_type == "1st":
-                            if piece.piece_id.startswith('PW'):
-                                return current_pos[1] == 6  # חיל לבן במיקום ראשוני
-                            elif piece.piece_id.startswith('PB'):
-                                return current_pos[1] == 1  # חיל שחור במיקום ראשוני
-                        return True
-                    
-                    # תנועה רגילה של כלים אחרים
-                    return not (target_piece and self._is_player_piece(target_piece, player_num))
-        return False
-
-    def _resolve_collisions(self):
-        pass
+        bitboards = self.board_index.bitboards
+        table = self.attack_tables.move_table(moves_obj)
+        move_type = table.move_type(bitboards.square(*current_pos), bitboards.square(new_x, new_y))
+        if move_type is None:
+            return False
+        
+        # בדיקת חסימה בדרך
+        blocking_pos = self._check_path(*current_pos, new_x, new_y, piece.piece_id)
+        if blocking_pos and blocking_pos != (new_x, new_y):
+            return False
+        
+        # לוגיקה פשוטה: בדוק מה יש במקום היעד
+        target = bitboards.bit(new_x, new_y)
+        own = bitboards.colors['W' if player_num == 1 else 'B']
+        
+        # אם זה תנועת תפיסה (capture) - חייב להיות יריב
+        if move_type == "capture":
+            return bool(target & bitboards.occupied & ~own)
+        
+        # אם זה תנועה רגילה (non_capture או 1st) - המקום חייב להיות ריק
+        if move_type in ["non_capture", "1st"]:
+            if target & bitboards.occupied:
+                return False
+            # בדיקה מיוחדת למהלך ראשון של חיל
+            if move_type == "1st":
+                return self.move_generator.on_first_row(piece.piece_id, current_pos)
+            return True
+        
+        # תנועה רגילה של כלים אחרים
+        return not (target & own)
+
+    def _resolve_collisions(self, now_ms=None):
+        """תפיסות באמצע הדרך: כלים יריבים שמסלוליהם נפגשים בזמן התנועה."""
+        now_ms = self.game_time_ms() if now_ms is None else now_ms
+        flying = [piece for piece in self._in_flight.values() if piece in self.board_index]
+        collisions = self.collisions.step(flying, now_ms)
+        # מי שנחת עד now_ms לא ייכנס לחלון הבא של step
+        self._in_flight = {id(piece): piece for piece in flying
+                           if physics_of(piece).mode == "move" and physics_of(piece).end_time > now_ms}
+        for hit in collisions:
+            logger.info(f"התנגשות באוויר: {hit.winner.piece_id} פגע ב-{hit.loser.piece_id}")
+            self._capture(hit.loser, hit.winner)
+        
+        if collisions and self._is_win() and not self.winner_announced:
+            logger.info("ניצחון לאחר התנגשות")
+            self._announce_win()
+            self.winner_announced = True
 
     def _is_win(self) -> bool:
-        kings = {p.piece_id for p in self.pieces if p.piece_id.startswith('K')}
-        return not {'KW0', 'KB0'}.issubset(kings)
+        return self.board_index.material.decided
 
     def _announce_win(self):
         logger.info("מכריז על ניצחון")
         self.play_sound("win")
-        kings = {p.piece_id for p in self.pieces if p.piece_id.startswith('K')}
         
         # קבע מי ניצח - המנצח הוא זה שהמלך שלו עדיין קיים
-        winner = None
-        if 'KB0' in kings and 'KW0' not in kings:
-            winner = "black"  # המלך השחור קיים והלבן לא - שחור ניצח
-        elif 'KW0' in kings and 'KB0' not in kings:
-            winner = "white"  # המלך הלבן קיים והשחור לא - לבן ניצח
+        winner = self.board_index.material.winner
         
         # שימוש בשמות האמיתיים של השחקנים
         winner_map = {
@@ -565,14 +749,9 @@ class Game:
         game_over_event.data["winner_text"] = winner_text
         self.publisher.notify(game_over_event)
         
-        # הצג הודעת ניצחון למשך זמן קצוב ואז סיים את המשחק
-        import threading
-        import time
-        
-        def end_game_after_delay():
-            time.sleep(3)  # המתן 3 שניות
-            logger.info("המשחק מסתיים אחרי הודעת הניצחון")
-            self.game_over = True
-        
-        # הפעל timer ברקע
-        threading.Thread(target=end_game_after_delay, daemon=True).start()
\ No newline at end of file
+        # הצג הודעת ניצחון למשך זמן קצוב (3 שניות) ואז סיים את המשחק
+        self._end_game_timer = self.timers.schedule(self.game_time_ms() + 3000, self._end_game)
+
+    def _end_game(self, now_ms):
+        logger.info("המשחק מסתיים אחרי הודעת הניצחון")
+        self.game_over = True
\ No newline at end of file
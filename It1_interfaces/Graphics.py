@@ -1,23 +1,34 @@
 import pathlib
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence
 import copy
+import json
 from img import Img
+from FrameStore import FRAME_STORE
+from AnimationClip import AnimationClip
 from Command import Command
 from Board import Board
 
 logger = logging.getLogger(__name__)
 
+SPRITE_SIZE = (80, 80)  # ודא שזה תואם לגודל התא שלך
+
+# תיקיות המצבים של כלי; מצב לא מוכר מוצג עם אנימציית idle
+STATE_FOLDERS = ("idle", "move", "jump", "short_rest", "long_rest")
+
 
 class Graphics:
     def __init__(self,
                  sprites_folder: pathlib.Path,
                  board: Board,
                  loop: bool = True,
-                 fps: float = 6.0):
+                 fps: float = 6.0,
+                 clips: Optional[Dict[str, AnimationClip]] = None):
         """
         Initialize graphics with sprites folder, cell size, loop setting, and FPS.
         טוען את כל התמונות מהתיקייה (לפי סדר שמות הקבצים).
+        `clips` are the precompiled animations of the piece, by state name –
+        switch_to_state only swaps between them.
         """
         self.sprites_folder = sprites_folder
         self.board = board
@@ -27,85 +38,105 @@ class Graphics:
         
         # שמור את תיקיית המצבים לשינוי sprites
         self.piece_states_dir = sprites_folder.parent.parent  # מ-idle/sprites ל-states
+        self.clips: Dict[str, Optional[AnimationClip]] = clips if clips is not None else {}
         
-        self.frames: List[Img] = self._load_frames()
+        # הפריימים נשלפים מ-FRAME_STORE לפי מפתח ונטענים רק בשימוש הראשון;
+        # Graphics לא מחזיק אותם, כך שה-LRU של FRAME_STORE יכול לשחרר מצבים שלא בשימוש
+        self._frame_key = FRAME_STORE.key(sprites_folder, SPRITE_SIZE)
+        self._frames: Optional[Sequence[Img]] = None  # פריימים שהוגדרו ידנית
         self.current_frame = 0
         self.last_update = 0
         self.running = True
+        self.dirty = True  # הפריים המוצג השתנה מאז הציור האחרון (נקרא ע"י LayeredRenderer)
 
-    def _load_frames(self) -> List[Img]:
-        frames = []
-        for img_path in sorted(self.sprites_folder.glob("*.png")):
-            img = Img()
-            img.read(str(img_path), size=(80, 80))  # ודא שזה תואם לגודל התא שלך
-            frames.append(img)
-        return frames if frames else [Img()]  # לפחות פריים ריק
+    @property
+    def frames(self) -> Sequence[Img]:
+        # הפריימים משותפים לכל הכלים דרך FRAME_STORE – נטענים מהדיסק פעם אחת לתיקייה
+        if self._frames is not None:
+            return self._frames
+        return FRAME_STORE.lookup(self._frame_key)
+
+    @frames.setter
+    def frames(self, frames: Sequence[Img]):
+        self._frames = frames
 
     def copy(self):
-        """Create a shallow copy of the graphics object."""
-        new_gfx = Graphics(self.sprites_folder, self.board, self.loop, self.fps)
-        new_gfx.current_frame = self.current_frame
-        new_gfx.last_update = self.last_update
-        new_gfx.running = self.running
-        return new_gfx
+        """Create a shallow copy: shares the (read-only) frames, own playback cursor."""
+        return copy.copy(self)
 
     def reset(self, cmd: Command = None):
         """Reset the animation with a new command."""
         self.current_frame = 0
         self.last_update = 0
         self.running = True
+        self.dirty = True
 
     def switch_to_state(self, state_name: str):
-        """החלף לאנימציה של מצב ספציפי"""
-        folder_map = {
-            "idle": "idle",
-            "move": "move", 
-            "jump": "jump",
-            "short_rest": "short_rest",
-            "long_rest": "long_rest"
-        }
-        
-        folder_name = folder_map.get(state_name, "idle")
-        new_sprites_dir = self.piece_states_dir / folder_name / "sprites"
-        config_path = self.piece_states_dir / folder_name / "config.json"
-        
+        """החלף לאנימציה של מצב ספציפי – החלפת מצביע ל-clip מוכן, בלי I/O"""
+        folder_name = state_name if state_name in STATE_FOLDERS else "idle"
+        if folder_name not in self.clips:
+            self.clips[folder_name] = self._compile_clip(folder_name)
+        clip = self.clips[folder_name]
+        if clip is None:  # אין תיקייה למצב הזה
+            return
+
         # דיבוג רק לקפיצה
         if state_name == "jump":
             logger.info(f"Starting JUMP animation: {folder_name}")
-        
-        if new_sprites_dir.exists():
-            # קרא את הקונפיגורציה של המצב החדש
-            graphics_cfg = {}
-            if config_path.exists():
-                import json
-                try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        full_cfg = json.load(f)
-                        graphics_cfg = full_cfg.get("graphics", {})
-                except:
-                    pass
-            
-            # עדכן fps ו-loop מהקונפיגורציה החדשה
-            new_fps = graphics_cfg.get("frames_per_sec", self.fps)
-            new_loop = graphics_cfg.get("is_loop", self.loop)
-            
-            self.fps = new_fps
-            self.loop = new_loop
-            self.frame_time_ms = int(1000 / new_fps)
-            
-            self.sprites_folder = new_sprites_dir
-            self.frames = self._load_frames()
-            self.current_frame = 0
-            self.last_update = 0
-            self.running = True
-
-    def update(self, now_ms: int):
-        """Advance animation frame based on game-loop time, not wall time."""
+        self.play(clip)
+
+    def play(self, clip: AnimationClip):
+        """Start `clip` from its first frame."""
+        self.fps = clip.fps
+        self.loop = clip.loop
+        self.frame_time_ms = clip.frame_time_ms
+        self.sprites_folder = clip.sprites_folder
+        self._frame_key = clip.frame_key
+        self._frames = None
+        self.current_frame = 0
+        self.last_update = 0
+        self.running = True
+        self.dirty = True
+
+    def _compile_clip(self, folder_name: str) -> Optional[AnimationClip]:
+        """
+        Graphics שלא נבנה ע"י PieceFactory: קורא את config.json והפריימים פעם אחת;
+        switch_to_state שומר את התוצאה במילון המשותף לכל העותקים.
+        """
+        new_sprites_dir = self.piece_states_dir / folder_name / "sprites"
+        config_path = self.piece_states_dir / folder_name / "config.json"
+        if not new_sprites_dir.exists():
+            return None
+
+        # קרא את הקונפיגורציה של המצב החדש
+        graphics_cfg = {}
+        if config_path.exists():
+            try:
+                with open(config_path, 'r', encoding='utf-8-sig') as f:
+                    graphics_cfg = json.load(f).get("graphics", {})
+            except (OSError, ValueError):
+                pass
+        graphics_cfg = {"frames_per_sec": graphics_cfg.get("frames_per_sec", self.fps),
+                        "is_loop": graphics_cfg.get("is_loop", self.loop)}
+        return AnimationClip.compile(folder_name, new_sprites_dir, graphics_cfg)
+
+    def next_frame_ms(self, now_ms: int) -> Optional[int]:
+        """מתי הפריים הבא מתחלף (None – אנימציה שעומדת)."""
         if not self.running or len(self.frames) <= 1:
-            return
+            return None
+        if self.last_update == 0:
+            return now_ms + 1  # update הבא רק מתחיל את השעון
+        return self.last_update + self.frame_time_ms
+
+    def update(self, now_ms: int) -> bool:
+        """Advance animation frame based on game-loop time, not wall time.
+        Returns True when the displayed frame changed."""
+        if not self.running or len(self.frames) <= 1:
+            return False
         if self.last_update == 0:
             self.last_update = now_ms
-            return
+            return False
+        previous = self.current_frame
         if now_ms - self.last_update >= self.frame_time_ms:
             # דיבוג רק לקפיצה
             state_name = self.sprites_folder.parent.name if self.sprites_folder.parent else "unknown"
@@ -124,6 +155,10 @@ class Graphics:
                     if state_name == "jump":
                         logger.info(f"JUMP finished")
             self.last_update = now_ms
+        if self.current_frame != previous:
+            self.dirty = True
+            return True
+        return False
 
     def get_img(self) -> Img:
         """Get the current frame image."""
@@ -1,5 +1,7 @@
 import pathlib
+from typing import Dict, Optional
 from Graphics import Graphics
+from AnimationClip import AnimationClip
 from Board import Board
 
 
@@ -7,7 +9,8 @@ class GraphicsFactory:
     def load(self,
              sprites_dir: pathlib.Path,
              cfg: dict,
-             board: Board) -> Graphics:
+             board: Board,
+             clips: Optional[Dict[str, AnimationClip]] = None) -> Graphics:
         """Load graphics from sprites directory with configuration."""
         fps = cfg.get("frames_per_sec", 6)
         loop = cfg.get("is_loop", True)
@@ -15,5 +18,13 @@ class GraphicsFactory:
             sprites_folder=sprites_dir,
             board=board,
             loop=loop,
-            fps=fps
+            fps=fps,
+            clips=clips
         )
+
+    def compile_clip(self,
+                     name: str,
+                     sprites_dir: pathlib.Path,
+                     cfg: dict) -> AnimationClip:
+        """Precompile the animation of one state (frames, fps, loop)."""
+        return AnimationClip.compile(name, sprites_dir, cfg)
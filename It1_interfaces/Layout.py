@@ -0,0 +1,34 @@
+from typing import Dict, List, Tuple
+
+BACK_RANK = "RNBQKBNR"
+
+
+def standard_layout(width: int = 8, height: int = 8, pawn_rows: int = 1) -> List[Tuple[str, Tuple[int, int]]]:
+    """
+    פתיחה רגילה על לוח W×H: שחור למעלה, לבן למטה. השורה האחורית חוזרת על
+    RNBQKBNR לכל רוחב הלוח (לוח רחב – כמה מלכים לכל צד), ואחריה pawn_rows
+    שורות של חיילים. על 8x8 עם pawn_rows=1 זו בדיוק הפתיחה של main.
+    """
+    if height < 2 * (pawn_rows + 1):
+        raise ValueError(f"a {width}x{height} board has no room for {pawn_rows} pawn rows per side")
+    layout = []
+    layout += [(f"{BACK_RANK[x % 8]}B", (x, 0)) for x in range(width)]
+    for y in range(1, pawn_rows + 1):
+        layout += [("PB", (x, y)) for x in range(width)]
+    for y in range(height - 1 - pawn_rows, height - 1):
+        layout += [("PW", (x, y)) for x in range(width)]
+    layout += [(f"{BACK_RANK[x % 8]}W", (x, height - 1)) for x in range(width)]
+    return layout
+
+
+def create_pieces(factory, layout, game_queue=None) -> list:
+    """בונה את הכלים של layout עם id ייחודי לכל סוג: PW0, PW1, ..."""
+    pieces = []
+    counters: Dict[str, int] = {}
+    for p_type, cell in layout:
+        unique_id = f"{p_type}{counters.get(p_type, 0)}"
+        counters[p_type] = counters.get(p_type, 0) + 1
+        piece = factory.create_piece(p_type, cell, game_queue)
+        piece.piece_id = piece._state.physics.piece_id = unique_id
+        pieces.append(piece)
+    return pieces
@@ -0,0 +1,75 @@
+from typing import Dict, Optional, Tuple
+
+from Bitboards import color_of
+
+# ערך כל סוג כלי לפי האות הראשונה של ה-piece_id (כמו ב-ScoreTracker)
+PIECE_VALUES = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 0}
+ROYAL = 'K'
+COLORS = {'W': "white", 'B': "black"}
+
+
+class MaterialTracker:
+    """
+    Material and kings per side, kept current by BoardIndex on every add and
+    discard – captures, promotions, a client syncing pieces – so "is the game
+    decided", "who won" and the material balance are O(1) reads instead of a
+    scan of the pieces list. Kings are recognised by kind ('K'), not by id,
+    so a renamed or extra king counts too.
+    """
+
+    def __init__(self, values: Dict[str, int] = PIECE_VALUES):
+        self.values = dict(values)
+        self.material = {"white": 0, "black": 0}
+        self.kings = {"white": 0, "black": 0}
+        self._entries: Dict[int, Tuple[str, int, bool]] = {}  # id(piece) → מה שנספר עבורו
+        self.version = 0  # עולה בכל שינוי
+
+    def add(self, piece):
+        if id(piece) in self._entries:
+            return
+        kind = piece.piece_id[:1]
+        entry = (COLORS[color_of(piece.piece_id)], self.values.get(kind, 0), kind == ROYAL)
+        self._entries[id(piece)] = entry
+        self._count(entry, 1)
+
+    def discard(self, piece):
+        # מחסירים את מה שנספר בהוספה – גם אם ה-piece_id השתנה בינתיים
+        entry = self._entries.pop(id(piece), None)
+        if entry is not None:
+            self._count(entry, -1)
+
+    def _count(self, entry, sign: int):
+        color, value, royal = entry
+        self.material[color] += sign * value
+        if royal:
+            self.kings[color] += sign
+        self.version += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.material = {"white": 0, "black": 0}
+        self.kings = {"white": 0, "black": 0}
+        self.version += 1
+
+    # queries ------------------------------------------------------------------
+    @property
+    def decided(self) -> bool:
+        """לפחות צד אחד בלי מלך."""
+        return not (self.kings["white"] and self.kings["black"])
+
+    @property
+    def winner(self) -> Optional[str]:
+        """"white"/"black" – הצד היחיד שעוד יש לו מלך; None אם אין הכרעה או שאין לאף צד."""
+        white, black = self.kings["white"], self.kings["black"]
+        if white and not black:
+            return "white"
+        if black and not white:
+            return "black"
+        return None
+
+    def balance(self) -> int:
+        """חומר לבן פחות חומר שחור."""
+        return self.material["white"] - self.material["black"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,114 @@
+from typing import Optional
+
+import numpy as np
+
+from Bitboards import color_of
+from BoardIndex import physics_of
+
+
+class MoveGenerator:
+    """
+    Legal moves of a piece, a player or the whole board, computed with mask
+    operations on the game's bitboards – the same rules as Game._is_valid_move
+    (move type precedence from moves.txt, blocking, capture-only, non-capture
+    and first-move rows) in one pass per piece instead of one call per square.
+
+    Pieces that cannot take a command right now – in flight, mid-jump or in a
+    rest cooldown (State.can_transition) – have no legal moves.
+
+    Results are int16 numpy arrays: targets() gives rows of (x, y),
+    legal_moves() rows of (from_x, from_y, to_x, to_y).
+    """
+
+    def __init__(self, game):
+        self.game = game
+
+    def can_move(self, piece, now_ms: int) -> bool:
+        if piece.piece_id in self.game.jumping_pieces:
+            return False
+        physics = physics_of(piece)
+        if physics is not None and (getattr(physics, "moving", False) or getattr(physics, "wait_only", False)):
+            return False
+        can_transition = getattr(piece._state, "can_transition", None)
+        return can_transition is None or can_transition(now_ms)
+
+    def target_mask(self, piece, now_ms: Optional[int] = None) -> int:
+        """מסכת כל משבצות היעד החוקיות של הכלי (0 אם אין)."""
+        index = self.game.board_index
+        cell = index.cell_of(piece)
+        if cell is None or not index.on_board(cell):
+            return 0
+        if not self.can_move(piece, self.game.game_time_ms() if now_ms is None else now_ms):
+            return 0
+        state = piece._state
+        moves = getattr(state, "moves", None) or getattr(state, "_moves", None)
+        if moves is None or not hasattr(moves, "valid_moves"):
+            return 0
+
+        bitboards, tables = index.bitboards, self.game.attack_tables
+        table = tables.move_table(moves)
+        src = bitboards.square(*cell)
+        piece_id = piece.piece_id
+        occupied = bitboards.occupied
+        own = bitboards.colors[color_of(piece_id)]
+        enemy = occupied & ~own
+
+        legal = claimed = 0
+        for move_type in table.types:
+            reach = table.reach[move_type][src]
+            # הזזה ששייכת לסוג מוקדם יותר בקובץ נבדקת רק לפיו (כמו ב-_is_valid_move)
+            candidates = reach & ~claimed
+            claimed |= reach
+            if move_type == "capture":
+                legal |= candidates & enemy
+            elif move_type in ("non_capture", "1st"):
+                if move_type == "1st" and not self.on_first_row(piece_id, cell):
+                    continue
+                legal |= candidates & ~occupied
+            else:
+                legal |= candidates & ~own
+        if not piece_id.startswith('N'):
+            legal &= ~tables.shadow(src, occupied)  # פרש קופץ מעל כלים
+        return legal
+
+    def on_first_row(self, piece_id: str, cell) -> bool:
+        """האם מהלך "1st" מותר מ-cell: חיל רק מהשורה השנייה של הצד שלו (לפי H_cells)."""
+        if piece_id.startswith('PW'):
+            return cell[1] == self.game.board_index.height - 2  # חיל לבן במיקום ראשוני
+        if piece_id.startswith('PB'):
+            return cell[1] == 1  # חיל שחור במיקום ראשוני
+        return True
+
+    def _cells(self, mask: int) -> list:
+        """(x, y) של כל ביט דלוק במסכה, שטוח: [x0, y0, x1, y1, ...]."""
+        width = self.game.board_index.width
+        cells = []
+        while mask:
+            low = mask & -mask
+            y, x = divmod(low.bit_length() - 1, width)
+            cells += (x, y)
+            mask ^= low
+        return cells
+
+    def targets(self, piece, now_ms: Optional[int] = None) -> np.ndarray:
+        """משבצות היעד החוקיות של כלי: מערך (k, 2) של (x, y)."""
+        return np.array(self._cells(self.target_mask(piece, now_ms)), dtype=np.int16).reshape(-1, 2)
+
+    def legal_moves(self, player_num: Optional[int] = None, now_ms: Optional[int] = None) -> np.ndarray:
+        """
+        כל המהלכים החוקיים של שחקן (1 = לבן, 2 = שחור) או של כל הלוח (None):
+        מערך (k, 4) של (from_x, from_y, to_x, to_y).
+        """
+        now_ms = self.game.game_time_ms() if now_ms is None else now_ms
+        index = self.game.board_index
+        rows = []
+        for piece in self.game.pieces:
+            if player_num is not None and ('W' in piece.piece_id) != (player_num == 1):
+                continue
+            mask = self.target_mask(piece, now_ms)
+            if mask:
+                src = index.cell_of(piece)
+                cells = self._cells(mask)
+                for i in range(0, len(cells), 2):
+                    rows += (src[0], src[1], cells[i], cells[i + 1])
+        return np.array(rows, dtype=np.int16).reshape(-1, 4)
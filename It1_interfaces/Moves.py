@@ -1,33 +1,109 @@
 # Moves.py  – drop-in replacement
 import pathlib
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# קבצי moves.txt נכתבו ללוח 8×8: קרן שמגיעה ל-7 צעדים פירושה "עד קצה הלוח"
+FULL_RANGE = 7
+
+
+@dataclass(frozen=True)
+class Ray:
+    """A sliding move: steps of (dx, dy) up to max_range (None = to the board edge)."""
+    dx: int
+    dy: int
+    move_type: str
+    max_range: Optional[int] = None
+
+    def steps(self, limit: int) -> Iterator[Tuple[int, int, str]]:
+        reach = limit if self.max_range is None else min(self.max_range, limit)
+        for n in range(1, reach + 1):
+            yield self.dx * n, self.dy * n, self.move_type
 
 
 class Moves:
     @staticmethod
     def from_file(path, dims=None):
-        moves = []
         with open(path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("//"):
-                    continue
-                parts = line.split(",")
-                if len(parts) < 2:
-                    continue
-                # קובץ התנועות כתוב כ-dy,dx ולא dx,dy
-                dy = int(parts[0])
-                dx_part = parts[1].split(":")
-                dx = int(dx_part[0])
-                move_type = dx_part[1] if len(dx_part) > 1 else "normal"
-                moves.append((dx, dy, move_type))  # שומרים כ-dx,dy
+            return Moves.from_lines(f, dims)
+
+    @staticmethod
+    def from_lines(lines, dims=None):
+        """Parse moves.txt content (an iterable of lines)."""
+        moves = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("//"):
+                continue
+            parts = line.split(",")
+            if len(parts) < 2:
+                continue
+            # קובץ התנועות כתוב כ-dy,dx ולא dx,dy
+            dy = int(parts[0])
+            dx_part = parts[1].split(":")
+            dx = int(dx_part[0])
+            move_type = dx_part[1] if len(dx_part) > 1 else "normal"
+            moves.append((dx, dy, move_type))  # שומרים כ-dx,dy
         return Moves(moves, dims)
 
     def __init__(self, moves: List[Tuple[int, int, str]], dims=None):
         self.moves = moves
         self.dims = dims
-        # שמירת רשימה נוספת עם סוגי התנועות
-        self.valid_moves = moves
+        self.rays, self.leapers = self.compile(moves)
+        # חיפוש O(1) של (dx, dy) → סוג המהלך; הראשון בקובץ קובע
+        self._rules: Dict[Tuple[int, int], str] = {}
+        for dx, dy, move_type in moves:
+            self._rules.setdefault((dx, dy), move_type)
+        self._open_rays: Dict[Tuple[int, int], str] = {}
+        for ray in self.rays:
+            if ray.max_range is None:
+                self._open_rays.setdefault((ray.dx, ray.dy), ray.move_type)
+        # שמירת רשימה נוספת עם סוגי התנועות – הקובץ כמו שהוא, ועל לוח גדול מ-8
+        # גם הצעדים הנוספים של הקרניים הפתוחות
+        self.valid_moves = list(moves)
+        if dims is not None and max(dims) - 1 > FULL_RANGE:
+            self.valid_moves += [step for ray in self.rays if ray.max_range is None
+                                 for step in ray.steps(max(dims) - 1) if step[:2] not in self._rules]
+
+    @staticmethod
+    def compile(moves: List[Tuple[int, int, str]]) -> Tuple[Tuple[Ray, ...], Tuple[Tuple[int, int, str], ...]]:
+        """
+        Split a flat move list into rays and leapers. Deltas 1..k along one
+        direction with one move type (k >= 2) become a Ray – open-ended when
+        k reaches FULL_RANGE – and everything else stays a single leap.
+        """
+        distances: Dict[Tuple[int, int, str], set] = {}
+        for dx, dy, move_type in moves:
+            n = max(abs(dx), abs(dy))
+            if n and (dx == 0 or dy == 0 or abs(dx) == abs(dy)):
+                distances.setdefault((dx // n, dy // n, move_type), set()).add(n)
+
+        rays, covered = [], set()
+        for (ux, uy, move_type), found in distances.items():
+            k = 0
+            while k + 1 in found:
+                k += 1
+            if k < 2:
+                continue
+            rays.append(Ray(ux, uy, move_type, None if k >= FULL_RANGE else k))
+            covered.update((ux * n, uy * n, move_type) for n in range(1, k + 1))
+        leapers = tuple(dict.fromkeys(m for m in moves if tuple(m) not in covered))
+        return tuple(rays), leapers
+
+    def rule(self, dx: int, dy: int) -> Optional[str]:
+        """סוג המהלך עבור הזזה של (dx, dy), או None אם המהלך לא קיים."""
+        move_type = self._rules.get((dx, dy))
+        if move_type is None and self._open_rays:
+            n = max(abs(dx), abs(dy))
+            if n and (dx == 0 or dy == 0 or abs(dx) == abs(dy)):
+                move_type = self._open_rays.get((dx // n, dy // n))
+        return move_type
+
+    def deltas(self, limit: int) -> Iterator[Tuple[int, int, str]]:
+        """כל ההזזות על לוח שבו הקרניים מגיעות עד `limit` צעדים."""
+        yield from self.leapers
+        for ray in self.rays:
+            yield from ray.steps(limit)
 
     def get_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
         """Get all possible moves from a given position (basic moves only)."""
@@ -36,7 +112,7 @@ class Moves:
         # אם יש מגבלות לוח
         rows, cols = self.dims
         valid = []
-        for dr, dc, _ in self.moves:
+        for dr, dc, _ in self.valid_moves:
             nr, nc = r + dr, c + dc
             if 0 <= nr < rows and 0 <= nc < cols:
                 valid.append((nr, nc))
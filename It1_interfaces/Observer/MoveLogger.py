@@ -6,6 +6,7 @@ class MoveLogger(Subscriber):
     def __init__(self):
         self.moves = {"white": [], "black": []}
         self._moves = {"white": [], "black": []}  # תמיכה בשני השמות
+        self.version = 0  # עולה בכל מהלך שנרשם
    
     def update(self, event):
         if event.type == EventType.MOVE_MADE:
@@ -15,6 +16,7 @@ class MoveLogger(Subscriber):
             }
             player_color = event.data.get("player_color", "unknown")
             self.moves[player_color].append(move_data)
+            self.version += 1
     def get_moves(self, player_color):
         return self.moves[player_color]
 
@@ -22,3 +24,4 @@ class MoveLogger(Subscriber):
     def reset(self):
         """Reset the move logger for a new game"""
         self.moves = {"white": [], "black": []}
+        self.version += 1
@@ -4,9 +4,12 @@ from .EventType import EventType
 
 logger = logging.getLogger(__name__)
 class ScoreTracker(Subscriber):
-    def __init__(self):
+    def __init__(self, material=None):
+        # MaterialTracker של המשחק (BoardIndex.material) – החומר שעל הלוח, בלי לסרוק כלים
+        self.material = material
         self.score = {"white": 0, "black": 0}
         self._scores = {"white": 0, "black": 0}  # תמיכה בשני השמות
+        self.version = 0  # עולה בכל שינוי בניקוד – ה-HUD מצויר מחדש רק כשהוא משתנה
         self.piece_values = {
             'P': 1,
             'N': 3,
@@ -22,11 +25,20 @@ class ScoreTracker(Subscriber):
         captured_by = event.data.get('captured_by', '')
         value = self.piece_values.get(piece_type, 0)
         self.score[captured_by] += value
+        self.version += 1
         logger.info(f"Score updated: {captured_by} captured {piece_type} (+{value} points). Total scores: {self.score}")
     
     def get_score(self, player_color):
         return self.score.get(player_color, 0)
+
+    def get_material(self, player_color):
+        """החומר שנשאר ל-player_color על הלוח (0 בלי MaterialTracker)."""
+        return self.material.material.get(player_color, 0) if self.material is not None else 0
+
+    def material_balance(self):
+        """חומר לבן פחות חומר שחור."""
+        return self.material.balance() if self.material is not None else 0
     def reset(self):
         """Reset the score tracker for a new game"""
         self.score = {"white": 0, "black": 0}
-        
\ No newline at end of file
+        self.version += 1
@@ -1,19 +1,60 @@
 from typing import Tuple, Optional
 import logging
-from Command import Command
+from Command import ARRIVALS, Command
 from Board import Board
+from PhysicsWorld import PHYSICS_WORLD, PhysicsWorld
 
 logger = logging.getLogger(__name__)
 
 
+def _pair(name: str):
+    """property של זוג (x, y) שנשמר בשורה של ה-Physics ב-PhysicsWorld."""
+    def get(self):
+        x, y = getattr(self._world, name)[self._row]
+        return int(x), int(y)
+
+    def set(self, value):
+        getattr(self._world, name)[self._row] = value
+    return property(get, set)
+
+
+def _scalar(name: str, kind):
+    def get(self):
+        return kind(getattr(self._world, name)[self._row])
+
+    def set(self, value):
+        getattr(self._world, name)[self._row] = value
+    return property(get, set)
+
+
 class Physics:
     """
     בסיס לפיזיקה של כלי: מיקום, מהירות, האם אפשר לתפוס/להיתפס, עדכון מצב.
+
+    מיקומים, זמנים, מצב התנועה וה-mode נשמרים בשורה של הכלי ב-PhysicsWorld
+    (של המפעל / המשחק; בלי world – PHYSICS_WORLD, שאף Game לא מקדם);
+    האובייקט הוא view על השורה.
     """
 
-    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 1.0, piece_id: str = None):
+    # בלי __dict__ לכל מופע; שאר השדות הם properties על השורה ב-PhysicsWorld
+    __slots__ = ("board", "_world", "_row", "on_cell_change", "speed", "piece_id",
+                 "_can_capture", "_can_be_captured", "wait_only", "start_ms", "duration_ms",
+                 "user_input_queue", "__weakref__")
+
+    pixel_pos = _pair("pixel_pos")
+    start_time = _scalar("start_time", int)
+    end_time = _scalar("end_time", int)
+    moving = _scalar("moving", bool)
+    dirty = _scalar("dirty", bool)
+
+    def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 1.0, piece_id: str = None,
+                 world: Optional[PhysicsWorld] = None):
         self.board = board
-        self.cell = start_cell
+        self._world = world if world is not None else PHYSICS_WORLD
+        self._row = self._world.add(self)
+        # נקרא (old, new) בכל שינוי של cell – כך BoardIndex של המשחק נשאר מסונכרן
+        self.on_cell_change = None
+        self._world.cell[self._row] = start_cell
         self.start_cell = start_cell  # המיקום ההתחלתי לאינטרפולציה
         self.speed = speed_m_s
         self.pixel_pos = self.board.cell_to_pixel(start_cell)
@@ -31,12 +72,61 @@ class Physics:
         self.start_ms = 0
         self.duration_ms = 0
 
+        # pixel_pos השתנה מאז הציור האחרון (נקרא ע"י LayeredRenderer)
+        self.dirty = True
+
+    @property
+    def world(self) -> PhysicsWorld:
+        return self._world
+
+    @property
+    def cell(self) -> Tuple[int, int]:
+        x, y = self._world.cell[self._row]
+        return int(x), int(y)
+
+    @cell.setter
+    def cell(self, value: Tuple[int, int]):
+        old = self.cell
+        self._world.cell[self._row] = value
+        if self.on_cell_change is not None and old != tuple(value):
+            self.on_cell_change(old, value)
+
+    # תאי ההתחלה והיעד שומרים גם את הפיקסלים שלהם – PhysicsWorld.step מאנטרפל ביניהם
+    @property
+    def start_cell(self) -> Tuple[int, int]:
+        x, y = self._world.start_cell[self._row]
+        return int(x), int(y)
+
+    @start_cell.setter
+    def start_cell(self, value: Tuple[int, int]):
+        self._world.start_cell[self._row] = value
+        self._world.start_px[self._row] = self.board.cell_to_pixel(value)
+
+    @property
+    def target_cell(self) -> Tuple[int, int]:
+        x, y = self._world.target_cell[self._row]
+        return int(x), int(y)
+
+    @target_cell.setter
+    def target_cell(self, value: Tuple[int, int]):
+        self._world.target_cell[self._row] = value
+        self._world.target_px[self._row] = self.board.cell_to_pixel(value)
+
+    @property
+    def mode(self) -> str:
+        return self._world.mode_names[self._world.mode[self._row]]
+
+    @mode.setter
+    def mode(self, value: str):
+        self._world.mode[self._row] = self._world.mode_code(value)
+
     def reset(self, cmd: Command):
         """
         אתחול פיזיקה לפי פקודה חדשה (למשל התחלת תנועה, קפיצה, עמידה).
         """
         # print(f"🔧 Physics.reset: קיבל פקודה {cmd.type} מ-{self.cell} ל-{getattr(cmd, 'target', 'N/A')}")
         self.mode = cmd.type
+        self.dirty = True
         if cmd.type == "move":
             self.start_cell = self.cell  # שמירת המיקום ההתחלתי לאינטרפולציה
             self.target_cell = cmd.target
@@ -70,6 +160,15 @@ class Physics:
             self.moving = False
             self.pixel_pos = self.board.cell_to_pixel(self.cell)  # וודא עדכון במצבים אחרים
 
+    def place(self, cell: Tuple[int, int]):
+        """מציב את הכלי עומד במשבצת cell (כלי מוכן מראש שנכנס ללוח)."""
+        self.cell = cell
+        self.start_cell = self.target_cell = cell
+        self.pixel_pos = self.board.cell_to_pixel(cell)
+        self.moving = self.wait_only = False
+        self.mode = "idle"
+        self.dirty = True
+
     def update(self, now_ms: int) -> Optional[Command]:
         """
         עדכון מצב פיזי לפי הזמן הנוכחי. מחזיר פקודה אם הסתיימה תנועה/קפיצה.
@@ -80,7 +179,7 @@ class Physics:
                 # המתנה הסתיימה
                 self.wait_only = False
                 logger.info(f"פיזיקה: המתנה הסתיימה עבור {self.piece_id}")
-                return Command(timestamp=now_ms, piece_id=self.piece_id, type="arrived", target=self.cell, params=None)
+                return ARRIVALS.acquire(now_ms, self.piece_id, "arrived", target=self.cell)
             return None  # עדיין במצב המתנה
             
         if self.moving:
@@ -89,8 +188,9 @@ class Physics:
                 self.cell = self.target_cell
                 self.pixel_pos = self.board.cell_to_pixel(self.cell)
                 self.moving = False
+                self.dirty = True
                 logger.info(f"פיזיקה: החתיכה ב-{self.cell} הגיעה ליעד")
-                return Command(timestamp=now_ms, piece_id=self.piece_id, type="arrived", target=self.cell, params=None)
+                return ARRIVALS.acquire(now_ms, self.piece_id, "arrived", target=self.cell)
             else:
                 # תנועה בתהליך - אינטרפולציה חלקה
                 total_duration = self.end_time - self.start_time
@@ -105,12 +205,30 @@ class Physics:
                 x = start_pixel[0] + (target_pixel[0] - start_pixel[0]) * progress
                 y = start_pixel[1] + (target_pixel[1] - start_pixel[1]) * progress
                 
-                self.pixel_pos = (int(x), int(y))
+                pixel_pos = (int(x), int(y))
+                if pixel_pos != self.pixel_pos:
+                    self.pixel_pos = pixel_pos
+                    self.dirty = True
         elif self.mode == "jump" and now_ms >= self.end_time:
             # קפיצה הסתיימה - צריך ליצור פקודת arrived
             logger.info(f"פיזיקה: החתיכה קפצה ל-{self.cell}")
             self.mode = "idle"  # סיום הקפיצה
-            return Command(timestamp=now_ms, piece_id=self.piece_id, type="arrived", target=self.cell, params=None)
+            return ARRIVALS.acquire(now_ms, self.piece_id, "arrived", target=self.cell)
+        return None
+
+    def next_event_ms(self, now_ms: int, interpolated: bool = False) -> Optional[int]:
+        """
+        מתי update צריך לרוץ שוב: סוף המתנה/קפיצה, כל tick בזמן תנועה
+        (אינטרפולציה), או None – שום דבר לא יקרה עד הפקודה הבאה.
+        interpolated=True: PhysicsWorld.step כבר מזיז את pixel_pos בכל tick,
+        אז בתנועה רק ההגעה ליעד היא אירוע.
+        """
+        if self.wait_only and self.start_ms > 0 and self.duration_ms > 0:
+            return self.start_ms + self.duration_ms
+        if self.moving:
+            return self.end_time if interpolated else now_ms + 1
+        if self.mode == "jump":
+            return self.end_time
         return None
 
     def can_be_captured(self) -> bool:
@@ -129,14 +247,20 @@ class Physics:
 
 
 class IdlePhysics(Physics):
+    __slots__ = ()
+
     def reset(self, cmd: Command):
         self.moving = False
         self.mode = "idle"
+        self.dirty = True
 
     def update(self, now_ms: int) -> Optional[Command]:
         return None
 
+    def next_event_ms(self, now_ms: int, interpolated: bool = False) -> Optional[int]:
+        return None
+
 
 class MovePhysics(Physics):
-    pass  # אפשר להרחיב אם תרצה התנהגות מיוחדת
+    __slots__ = ()  # אפשר להרחיב אם תרצה התנהגות מיוחדת
 
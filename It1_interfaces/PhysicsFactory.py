@@ -1,13 +1,18 @@
+from typing import Optional
+
 from Board import Board
 from Physics import Physics
+from PhysicsWorld import PhysicsWorld
 
 
 class PhysicsFactory:      # very light for now
-    def __init__(self, board: Board): 
-        """Initialize physics factory with board."""
+    def __init__(self, board: Board, world: Optional[PhysicsWorld] = None): 
+        """Initialize physics factory with board and the PhysicsWorld its Physics live in."""
         self.board = board
+        self.world = world if world is not None else PhysicsWorld()
         
-    def create(self, start_cell, cfg, piece_id: str = None) -> Physics:
-        """Create a physics object with the given configuration."""
+    def create(self, start_cell, cfg, piece_id: str = None, world: Optional[PhysicsWorld] = None) -> Physics:
+        """Create a physics object with the given configuration (world=None – the factory's world)."""
         speed = cfg.get("speed_m_per_sec", 1.0)
-        return Physics(start_cell=start_cell, board=self.board, speed_m_s=speed, piece_id=piece_id)
+        return Physics(start_cell=start_cell, board=self.board, speed_m_s=speed, piece_id=piece_id,
+                       world=world if world is not None else self.world)
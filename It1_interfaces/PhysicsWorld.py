@@ -0,0 +1,107 @@
+import threading
+import weakref
+from typing import Dict, List
+
+import numpy as np
+
+
+class PhysicsWorld:
+    """
+    Structure-of-arrays store behind every Physics: one row per Physics with
+    cells, pixel positions, start/end times, the moving flag and the mode in
+    NumPy arrays. Physics objects are thin views over their row, so State and
+    Piece keep using them as before, while step() interpolates every moving
+    row in one vectorized call instead of one Python update per piece.
+
+    Start and target pixels are stored when a move starts (cell_to_pixel is
+    called once per move, not twice per tick), with the same interpolation
+    and truncation as Physics.update, so both paths give identical positions.
+    """
+
+    PAIRS = ("cell", "start_cell", "target_cell", "pixel_pos", "start_px", "target_px")
+
+    def __init__(self, capacity: int = 64):
+        self._size = 0
+        self._free: List[int] = []
+        self._owners: List = []  # weakref ל-Physics של כל שורה
+        self._lock = threading.Lock()
+        self.mode_names: List[str] = []
+        self._mode_codes: Dict[str, int] = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        def grow(old, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if old is not None:
+                new[:len(old)] = old
+            return new
+
+        for name in self.PAIRS:
+            setattr(self, name, grow(getattr(self, name, None), (capacity, 2), np.int64))
+        self.start_time = grow(getattr(self, "start_time", None), capacity, np.int64)
+        self.end_time = grow(getattr(self, "end_time", None), capacity, np.int64)
+        self.moving = grow(getattr(self, "moving", None), capacity, bool)
+        self.dirty = grow(getattr(self, "dirty", None), capacity, bool)
+        self.mode = grow(getattr(self, "mode", None), capacity, np.int16)
+        self._capacity = capacity
+
+    # rows ---------------------------------------------------------------------
+    def add(self, physics) -> int:
+        """שורה חדשה עבור physics; משתחררת אוטומטית כשהאובייקט נאסף."""
+        with self._lock:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == self._capacity:
+                    self._allocate(self._capacity * 2)  # views קוראים דרך self – המערכים החדשים תקפים מיד
+                row = self._size
+                self._size += 1
+                self._owners.append(None)
+            self._owners[row] = weakref.ref(physics)
+            self.moving[row] = False
+        weakref.finalize(physics, self._release, row)
+        return row
+
+    def _release(self, row: int):
+        with self._lock:
+            self._owners[row] = None
+            self.moving[row] = False
+            self._free.append(row)
+
+    def __len__(self) -> int:
+        return self._size - len(self._free)
+
+    def mode_code(self, name: str) -> int:
+        code = self._mode_codes.get(name)
+        if code is None:
+            code = self._mode_codes[name] = len(self.mode_names)
+            self.mode_names.append(name)
+        return code
+
+    # simulation ---------------------------------------------------------------
+    def step(self, now_ms: int) -> List:
+        """
+        מקדם את כל הכלים שבתנועה ל-now_ms במכה אחת ומחזיר את ה-Physics שהגיעו
+        ליעד. ההגעה עצמה (עדכון cell ופקודת arrived) נשארת ל-Physics.update.
+        """
+        n = self._size
+        rows = np.flatnonzero(self.moving[:n])
+        if not rows.size:
+            return []
+        t0, t1 = self.start_time[rows], self.end_time[rows]
+        done = now_ms >= t1
+        live = rows[~done]
+        if live.size:
+            progress = (now_ms - t0[~done]) / (t1[~done] - t0[~done])
+            start, target = self.start_px[live], self.target_px[live]
+            pos = (start + (target - start) * progress[:, None]).astype(np.int64)  # קיטוע כמו int()
+            changed = (pos != self.pixel_pos[live]).any(axis=1)
+            self.pixel_pos[live] = pos
+            self.dirty[live[changed]] = True
+        arrivals = (self._owners[row]() for row in rows[done])
+        return [physics for physics in arrivals if physics is not None]
+
+
+# ברירת המחדל של Physics שנבנה בלי world (בדיקות, קוד ישן). אף Game לא מקדם אותו –
+# כל משחק מקדם רק את העולם של המפעל שלו, והכלים כאן מתעדכנים דרך Physics.update
+PHYSICS_WORLD = PhysicsWorld()
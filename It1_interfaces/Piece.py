@@ -5,6 +5,8 @@ import cv2
 
 
 class Piece:
+    __slots__ = ("piece_id", "_state")
+
     def __init__(self, piece_id: str, init_state: State):
         """Initialize a piece with ID and initial state."""
         self.piece_id = piece_id
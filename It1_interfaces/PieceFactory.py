@@ -1,45 +1,106 @@
 import pathlib
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 import json
 import logging
 from Board import Board
+from AnimationClip import AnimationClip
+from AssetBundle import AssetBundle, BUNDLE_NAME
+from FrameStore import FRAME_STORE
+from Graphics import SPRITE_SIZE
 from GraphicsFactory import GraphicsFactory
 from Moves import Moves
 from PhysicsFactory import PhysicsFactory
+from PhysicsWorld import PhysicsWorld
 from Piece import Piece
 from State import State
+from StateMachine import CompiledState, StateTable
 
 # הגדרת לוגגר
 logger = logging.getLogger(__name__)
 
+# מצבים שכמעט תמיד מוצגים מיד – נטענים מראש גם במצב lazy
+WARM_STATES = ("idle", "move")
+
+# מפעל אחד לכל (לוח, תיקיית כלים) בתהליך – PieceFactory.shared
+_SHARED: Dict[Tuple[int, str], "PieceFactory"] = {}
+
 
 class PieceFactory:
-    def __init__(self, board: Board, pieces_root: pathlib.Path):
+    def __init__(self, board: Board, pieces_root: pathlib.Path,
+                 bundle_path: Optional[pathlib.Path] = None,
+                 workers: Optional[int] = None,
+                 lazy: bool = False):
         self.board = board
         self.pieces_root = pieces_root
         self.physics_factory = PhysicsFactory(board)
+        # (rows, cols) ל-Moves – קרניים פתוחות מגיעות עד קצה הלוח
+        self.dims = (getattr(board, "H_cells", 8), getattr(board, "W_cells", 8))
         self.graphics_factory = GraphicsFactory()
         self.templates: Dict[str, State] = {}
+        # גרף ה-states של כל סוג כלי מקומפל לטבלה אחת, משותפת לכל הכלים מהסוג
+        self.tables: Dict[str, StateTable] = {}
+        # חבילת נכסים מקומפלת (AssetBundle.py) – אם קיימת נטען ממנה במקום מהתיקיות
+        self.bundle_path = bundle_path or pathlib.Path(pieces_root) / BUNDLE_NAME
+        # threads לפענוח ספרייטים כשאין חבילה (None = כל הליבות, 1 = סדרתי)
+        self.workers = workers
+        # lazy: רק WARM_STATES נטענים מראש, שאר המצבים בשימוש הראשון
+        # הספרייטים עצמם ב-FRAME_STORE של התהליך; תקציב הזיכרון שלו נקבע פעם אחת
+        # בהפעלה (FRAME_STORE.set_budget), לא לכל מפעל
+        self.lazy = lazy
         
         # טען את כל התבניות מראש
         self.generate_library()
 
+    @property
+    def world(self) -> PhysicsWorld:
+        """ה-PhysicsWorld של הכלים מהמפעל – משחק שמקבל את המפעל מקדם רק אותו."""
+        return self.physics_factory.world
+
+    @classmethod
+    def shared(cls, board: Board, pieces_root: pathlib.Path, **kwargs) -> "PieceFactory":
+        """המפעל של התהליך ללוח ולתיקייה – נבנה (וסורק את התיקיות) רק בקריאה הראשונה."""
+        key = (id(board), str(pathlib.Path(pieces_root).resolve()))
+        factory = _SHARED.get(key)
+        if factory is None or factory.board is not board:
+            factory = _SHARED[key] = cls(board, pieces_root, **kwargs)
+        return factory
+
     # Scan folders once, cache ready-made state machines -----------
     def generate_library(self):
         """סרוק את כל התיקיות ויצור תבניות state machine לכל כלי"""
+        bundle = AssetBundle.open(self.bundle_path)
+        if bundle is not None and bundle.size == SPRITE_SIZE and bundle.matches(self.pieces_root):
+            logger.info("Loading piece templates from asset bundle %s", self.bundle_path)
+            for name, entry in bundle.pieces.items():
+                self.templates[name] = self._build_from_bundle(bundle, name, entry)
+            return
+
         for sub in self.pieces_root.iterdir():
             if sub.is_dir():
                 # "…/PW" etc.
                 logger.info("Creating template for piece type: %s", sub.name)
                 self.templates[sub.name] = self._build_state_machine(sub)
 
-    def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
-        """בנה state machine לכלי ספציפי מהקונפיגורציה"""
-        board_size = (self.board.W_cells, self.board.H_cells)
-        cell_px = (self.board.cell_W_pix, self.board.cell_H_pix)
+        # בניית התבניות לא מפענחת תמונות; הפענוח כאן, במקביל
+        self.warm_up(WARM_STATES if self.lazy else None)
 
-        states: Dict[str, State] = {}
+    def warm_up(self, states: Optional[Iterable[str]] = WARM_STATES,
+                piece_types: Optional[Iterable[str]] = None):
+        """
+        Decode ahead of first use the sprites of `states` (None = every state)
+        for `piece_types` (None = every piece type), on `workers` threads.
+        """
+        states = None if states is None else set(states)
+        piece_types = None if piece_types is None else set(piece_types)
+        folders = [clip.sprites_folder
+                   for p_type, template in self.templates.items()
+                   if piece_types is None or p_type in piece_types
+                   for name, clip in template.graphics.clips.items()
+                   if clip is not None and (states is None or name in states)]
+        FRAME_STORE.preload(folders, SPRITE_SIZE, self.workers)
 
+    def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
+        """בנה state machine לכלי ספציפי מהקונפיגורציה"""
         # ── scan every sub-folder inside "states" ────────────────────────────
         states_dir = piece_dir / "states"
         if not states_dir.exists():
@@ -47,6 +108,8 @@ class PieceFactory:
             # יצור state בסיסי אם אין תיקיית states
             return self._create_default_state(piece_dir)
 
+        piece_moves = None
+        specs = []
         for state_dir in states_dir.iterdir():
             if not state_dir.is_dir():  # skip stray files
                 continue
@@ -54,7 +117,7 @@ class PieceFactory:
             name = state_dir.name  # idle / move / jump / …
             logger.debug("Processing state: %s", name)
 
-            # 1. config --------------------------------------------------------
+            # 1. config – נקרא פעם אחת, גם עבור חיבור ה-transitions -------------
             cfg_path = state_dir / "config.json"
             cfg = {}
             if cfg_path.exists():
@@ -68,25 +131,58 @@ class PieceFactory:
 
             # 2. moves ---------------------------------------------------------
             moves_path = state_dir / "moves.txt"
-            if not moves_path.exists():
-                # נסה את moves.txt מהתיקייה הראשית של הכלי
-                moves_path = piece_dir / "moves.txt"
-            
             if moves_path.exists():
-                moves = Moves.from_file(moves_path)
+                moves = Moves.from_file(moves_path, self.dims)
             else:
-                logger.warning("moves.txt not found for state: %s", name)
-                moves = Moves(valid_moves=[])  # יצור moves ריק
+                # moves.txt מהתיקייה הראשית של הכלי – משותף לכל ה-states
+                if piece_moves is None:
+                    piece_moves_path = piece_dir / "moves.txt"
+                    if piece_moves_path.exists():
+                        piece_moves = Moves.from_file(piece_moves_path, self.dims)
+                    else:
+                        logger.warning("moves.txt not found for piece: %s", piece_dir.name)
+                        piece_moves = Moves([], self.dims)  # יצור moves ריק
+                moves = piece_moves
+
+            specs.append((name, cfg, moves, state_dir / "sprites"))
+
+        if not specs:
+            logger.warning("No states found for piece type: %s", piece_dir.name)
+            return self._create_default_state(piece_dir)
+        return self._assemble(piece_dir.name, specs)
 
+    def _build_from_bundle(self, bundle: AssetBundle, piece_name: str, entry: dict) -> State:
+        """אותו state machine כמו _build_state_machine, מהאינדקס של החבילה – בלי I/O"""
+        piece_dir = pathlib.Path(self.pieces_root) / piece_name
+        piece_moves = Moves.from_lines((entry.get("moves") or "").splitlines(), self.dims)
+        specs = []
+        for st in entry["states"]:
+            moves = Moves.from_lines(st["moves"].splitlines(), self.dims) if st.get("moves") is not None else piece_moves
+            sprites_dir = piece_dir / "states" / st["name"] / "sprites"
+            # הפריימים הם views לתוך הקובץ הממופה; FRAME_STORE מחזיר אותם לכל Graphics
+            FRAME_STORE.put(sprites_dir, SPRITE_SIZE, bundle.frames(st))
+            specs.append((st["name"], st["config"], moves, sprites_dir))
+        if not specs:
+            return self._create_default_state(piece_dir)
+        return self._assemble(piece_name, specs)
+
+    def _assemble(self, p_type: str, specs) -> State:
+        """specs: (name, config, moves, sprites_dir) לכל state. מחבר states, clips ו-transitions."""
+        self.tables[p_type] = StateTable.compile(specs)
+        states: Dict[str, State] = {}
+        clips: Dict[str, AnimationClip] = {}  # האנימציות של הכלי, משותפות לכל ה-states והעותקים
+
+        for name, cfg, moves, sprites_dir in specs:
             # 3. graphics & physics -------------------------------------------
-            sprites_dir = state_dir / "sprites"
             graphics_cfg = cfg.get("graphics", {})
             physics_cfg = cfg.get("physics", {})
 
+            clips[name] = self.graphics_factory.compile_clip(name, sprites_dir, graphics_cfg)
             graphics = self.graphics_factory.load(
                 sprites_dir=sprites_dir,
                 cfg=graphics_cfg,
-                board=self.board
+                board=self.board,
+                clips=clips
             )
             
             physics = self.physics_factory.create(
@@ -99,28 +195,13 @@ class PieceFactory:
             state.name = name
             states[name] = state
 
-        if not states:
-            logger.warning("No states found for piece type: %s", piece_dir.name)
-            return self._create_default_state(piece_dir)
-
         # ── wire transitions מקונפיגורציה ───────────────────────────────────
-        for name, st in states.items():
-            # Read per-state config again
-            cfg_path = piece_dir / "states" / name / "config.json"
-            if cfg_path.exists():
-                try:
-                    cfg_content = cfg_path.read_text(encoding='utf-8-sig').strip()
-                    cfg = json.loads(cfg_content)
-                    physics_cfg = cfg.get("physics", {})
-                    
-                    # קרא את המצב הבא מהקונפיגורציה
-                    next_state_name = physics_cfg.get("next_state_when_finished")
-                    if next_state_name and next_state_name in states:
-                        st.set_transition("arrived", states[next_state_name])
-                        logger.debug("State transition: %s --arrived--> %s", name, next_state_name)
-                        
-                except (json.JSONDecodeError, Exception) as e:
-                    logger.warning("Failed to parse config for state %s: %s", name, e)
+        for name, cfg, _moves, _sprites_dir in specs:
+            # קרא את המצב הבא מהקונפיגורציה
+            next_state_name = cfg.get("physics", {}).get("next_state_when_finished")
+            if next_state_name and next_state_name in states:
+                states[name].set_transition("arrived", states[next_state_name])
+                logger.debug("State transition: %s --arrived--> %s", name, next_state_name)
 
         # ── default external transitions -------------------------------------
         for st in states.values():
@@ -136,9 +217,9 @@ class PieceFactory:
         """יצור state בסיסי אם אין קונפיגורציה"""
         moves_path = piece_dir / "moves.txt"
         if moves_path.exists():
-            moves = Moves.from_file(moves_path)
+            moves = Moves.from_file(moves_path, self.dims)
         else:
-            moves = Moves(valid_moves=[])
+            moves = Moves([], self.dims)
 
         # graphics ו-physics בסיסיים
         graphics = self.graphics_factory.load(
@@ -155,10 +236,12 @@ class PieceFactory:
 
         state = State(moves, graphics, physics)
         state.name = "idle"
+        self.tables[piece_dir.name] = StateTable.compile([("idle", {}, moves)])
         return state
 
-    def create_piece(self, p_type: str, cell: Tuple[int, int], game_queue=None) -> Piece:
-        """יצור כלי חדש מהתבנית"""
+    def create_piece(self, p_type: str, cell: Tuple[int, int], game_queue=None,
+                     world: Optional[PhysicsWorld] = None) -> Piece:
+        """יצור כלי חדש מהתבנית (world=None – ה-PhysicsWorld של המפעל)"""
         if p_type not in self.templates:
             logger.warning("Template not found for piece type: %s", p_type)
             # נסה ליצור תבנית חדשה
@@ -171,34 +254,10 @@ class PieceFactory:
         template_idle = self.templates[p_type]
 
         # יצור physics object במיקום האמיתי
-        shared_phys = self.physics_factory.create(cell, {}, piece_id=p_type)
-
-        # שכפל את כל ה-states עם physics משותף
-        clone_map: Dict[State, State] = {}
-        stack = [template_idle]
-        
-        while stack:
-            orig = stack.pop()
-            if orig in clone_map:
-                continue
-
-            # יצור עותק של הstate
-            clone_map[orig] = State(
-                moves=orig.moves,  # safe to share
-                graphics=orig.graphics.copy() if hasattr(orig.graphics, 'copy') else orig.graphics,
-                physics=shared_phys,  # ← SAME physics for all states
-                game_queue=game_queue  # הוסף את game_queue
-            )
-            clone_map[orig].name = orig.name
-            
-            # הוסף למחסנית את כל המצבים המחוברים
-            stack.extend(orig.transitions.values())
+        shared_phys = self.physics_factory.create(cell, {}, piece_id=p_type, world=world)
 
-        # חבר מחדש את הtransitions
-        for orig, clone in clone_map.items():
-            for event, target in orig.transitions.items():
-                if target in clone_map:
-                    clone.set_transition(event, clone_map[target])
+        # כלי = רשומת state על הטבלה המשותפת + Graphics אחד שמחליף clips בין ה-states
+        state = CompiledState(self.tables[p_type], template_idle.graphics.copy(), shared_phys, game_queue)
 
         piece_id = f"{p_type}_{cell[0]}_{cell[1]}"
-        return Piece(piece_id=piece_id, init_state=clone_map[template_idle])
+        return Piece(piece_id=piece_id, init_state=state)
@@ -0,0 +1,56 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Piece import Piece
+from PieceFactory import PieceFactory
+from PhysicsWorld import PhysicsWorld
+
+logger = logging.getLogger(__name__)
+
+# סוגי הכלים שחייל יכול להפוך אליהם (Game._check_pawn_promotion)
+PROMOTION_TYPES = ("QW", "QB")
+
+
+class PiecePool:
+    """
+    Pieces built ahead of time for types that appear mid-game (promotions).
+    take() places a ready piece on the board instead of calling the factory
+    in the frame that needs it; refill() tops the pool back up and is meant
+    to run later (Game schedules it on its timers). The sprites of the pooled
+    types are decoded when the pool is created.
+    """
+
+    def __init__(self, factory: PieceFactory, types: Iterable[str] = PROMOTION_TYPES, size: int = 2,
+                 world: Optional[PhysicsWorld] = None):
+        self.factory = factory
+        self.world = world  # ה-PhysicsWorld של המשחק (None – של המפעל)
+        self.types = tuple(t for t in types if t in factory.templates)
+        self.size = size
+        self._ready: Dict[str, List[Piece]] = {p_type: [] for p_type in self.types}
+        if not factory.lazy:  # מפעל lazy (שרת) לא מצייר – הספרייטים נשארים לפי הצורך
+            factory.warm_up(None, self.types)
+        self.refill()
+
+    def refill(self, now_ms: int = None) -> int:
+        """משלים כל סוג ל-size כלים מוכנים; מחזיר כמה נבנו."""
+        built = 0
+        for p_type, ready in self._ready.items():
+            while len(ready) < self.size:
+                ready.append(self.factory.create_piece(p_type, (0, 0), world=self.world))
+                built += 1
+        return built
+
+    def take(self, p_type: str, cell: Tuple[int, int], game_queue=None) -> Piece:
+        """כלי מסוג p_type במשבצת cell – מהמאגר אם יש, אחרת מהמפעל."""
+        ready = self._ready.get(p_type)
+        if not ready:
+            logger.debug("Piece pool has no ready %s – building one", p_type)
+            return self.factory.create_piece(p_type, cell, game_queue, world=self.world)
+        piece = ready.pop()
+        piece.piece_id = f"{p_type}_{cell[0]}_{cell[1]}"
+        piece._state._game_queue = game_queue
+        piece._state.physics.place(cell)
+        return piece
+
+    def available(self, p_type: str) -> int:
+        return len(self._ready.get(p_type, ()))
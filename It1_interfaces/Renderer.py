@@ -0,0 +1,419 @@
+import dataclasses
+import logging
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+from Board import Board
+from img import Img, background_layout, gradient_background, fit_window
+
+logger = logging.getLogger(__name__)
+
+# עובי הסמן הכי עבה (8px) חורג עד 4px מחוץ ללוח – משחזרים גם את השוליים
+CURSOR_MARGIN = 8
+
+
+Rect = Tuple[int, int, int, int]  # x0, y0, x1, y1 (exclusive)
+
+
+def _piece_parts(piece):
+    """graphics/physics של כלי – אותה תמיכה בשני הסוגים כמו Piece.draw_on_board."""
+    state = getattr(piece, "_state", None)
+    graphics = getattr(state, "graphics", None) or getattr(state, "_graphics", None)
+    physics = getattr(state, "physics", None) or getattr(state, "_physics", None)
+    return graphics, physics
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class _DrawnSprite:
+    __slots__ = ("piece", "index", "rect", "img", "seen")
+
+    def __init__(self, piece, index, rect, img, seen):
+        self.piece, self.index, self.rect, self.img, self.seen = piece, index, rect, img, seen
+
+
+class DirtyRectTracker:
+    """
+    זוכר היכן צויר כל כלי והופך את דגלי השינוי של Physics ו-Graphics
+    לרשימת המלבנים בסצנה שצריך לצבוע מחדש.
+
+    A piece is dirty when `physics.dirty` (pixel_pos moved) or
+    `graphics.dirty` (animation frame / state changed) is set, or when the
+    sprite it shows is not the one we drew last time. Sprites are bucketed by
+    board cell, so finding the idle neighbours a dirty rectangle erased costs
+    O(active pieces), not O(all pieces).
+    """
+
+    def __init__(self, bucket_w: float, bucket_h: float):
+        self.bucket_w = max(1, int(bucket_w))
+        self.bucket_h = max(1, int(bucket_h))
+        self._drawn: Dict[int, _DrawnSprite] = {}
+        self._buckets: Dict[Tuple[int, int], Set[int]] = {}
+        self._frame_no = 0
+
+    def clear(self):
+        self._drawn.clear()
+        self._buckets.clear()
+
+    def _cells(self, rect: Rect):
+        x0, y0, x1, y1 = rect
+        for by in range(y0 // self.bucket_h, (y1 - 1) // self.bucket_h + 1):
+            for bx in range(x0 // self.bucket_w, (x1 - 1) // self.bucket_w + 1):
+                yield bx, by
+
+    def _forget(self, key: int):
+        drawn = self._drawn.pop(key)
+        for cell in self._cells(drawn.rect):
+            bucket = self._buckets.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+
+    def record(self, piece, index: int, rect: Rect, img):
+        """Remember that `piece` was just drawn at `rect` showing `img`."""
+        key = id(piece)
+        if key in self._drawn:
+            self._forget(key)
+        self._drawn[key] = _DrawnSprite(piece, index, rect, img, self._frame_no)
+        for cell in self._cells(rect):
+            self._buckets.setdefault(cell, set()).add(key)
+
+    def overlapping(self, rect: Rect):
+        keys = set()
+        for cell in self._cells(rect):
+            bucket = self._buckets.get(cell)
+            if bucket:
+                keys.update(k for k in bucket if _intersects(self._drawn[k].rect, rect))
+        return keys
+
+    def collect(self, pieces: Iterable):
+        """
+        Returns (rects_to_restore, pieces_to_redraw) for this frame, or None
+        when some piece cannot be tracked and the whole scene must be redrawn.
+        pieces_to_redraw is a list of (index, piece, rect, img) in draw order.
+        """
+        self._frame_no += 1
+        frame_no = self._frame_no
+        dirty: List[Rect] = []
+        redraw: Dict[int, tuple] = {}
+
+        for index, piece in enumerate(pieces):
+            graphics, physics = _piece_parts(piece)
+            if graphics is None or physics is None:
+                return None
+            img = graphics.get_img()
+            key = id(piece)
+            drawn = self._drawn.get(key)
+            if drawn is not None and drawn.img is img and not graphics.dirty and not physics.dirty:
+                drawn.index, drawn.seen = index, frame_no
+                continue
+
+            graphics.dirty = physics.dirty = False
+            rect = None
+            if img.img is not None and physics.pixel_pos is not None:
+                x, y = physics.pixel_pos
+                h, w = img.img.shape[:2]
+                rect = (x, y, x + w, y + h)
+            if drawn is not None:
+                dirty.append(drawn.rect)
+                self._forget(key)
+            if rect is not None:
+                dirty.append(rect)
+                redraw[key] = (index, piece, rect, img)
+
+        # כלים שנעלמו (נתפסו/הוחלפו) – מחק את המקום שבו צוירו
+        for key in [k for k, d in self._drawn.items() if d.seen != frame_no]:
+            dirty.append(self._drawn[key].rect)
+            self._forget(key)
+
+        # כל כלי שנוגע במלבן משוחזר נמחק חלקית – משחזרים גם את המלבן שלו ומציירים אותו מחדש
+        restore: List[Rect] = []
+        while dirty:
+            rect = dirty.pop()
+            restore.append(rect)
+            for key in self.overlapping(rect):
+                if key not in redraw:
+                    drawn = self._drawn[key]
+                    redraw[key] = (drawn.index, drawn.piece, drawn.rect, drawn.img)
+                    dirty.append(drawn.rect)
+
+        return restore, sorted(redraw.values(), key=lambda item: item[0])
+
+
+class LayeredRenderer:
+    """
+    מרנדר את חלון המשחק משכבות שמורות במקום לבנות הכל מחדש בכל פריים.
+
+    Layers:
+      1. static board  – board.img, never modified.
+      2. background    – the gradient, rebuilt only when the window size changes.
+      3. HUD           – score, player names and move tables on top of the
+                         background; rebuilt only when their content changes.
+      4. dynamic       – pieces (and the winner overlay) on a board-sized scene
+                         buffer, cursors on the final frame.
+
+    All buffers are allocated once and reused. Pieces go through a
+    DirtyRectTracker: each frame only the rectangles under sprites that
+    moved or changed animation frame are restored from the static board,
+    re-blended, rescaled and copied to the output, so frame cost follows the
+    number of active pieces.
+    """
+
+    def __init__(self, board: Board, window_name: str = "Chess Game",
+                 background_scale: float = 1.3, max_window_size=None,
+                 gradient_colors=None):
+        if board.img is None or board.img.img is None:
+            raise ValueError("Board image not loaded.")
+        self.board = board
+        self.window_name = window_name
+        self.gradient_colors = gradient_colors
+
+        # 1. static board
+        self.static = board.img.img
+        self._static_opaque = self.static.shape[2] != 4 or int(self.static[..., 3].min()) == 255
+
+        # geometry of the frame (same as Img.display_with_background)
+        self.layout = background_layout(self.static.shape, background_scale, max_window_size)
+        bg_width, bg_height, img_width, img_height, center_x, center_y = self.layout
+        self.frame_size = (bg_width, bg_height)
+        self.board_rect = (center_x, center_y, img_width, img_height)
+
+        # 4. dynamic – scene buffer at board resolution, drawn on by Piece.draw_on_board
+        scene_img = Img()
+        scene_img.img = self.static.copy()
+        self.scene = dataclasses.replace(board, img=scene_img)
+        self._scaled = None
+        if (img_height, img_width) != self.static.shape[:2]:
+            self._scaled = np.empty((img_height, img_width, self.static.shape[2]), dtype=np.uint8)
+        self._scaled_bgr = np.empty((img_height, img_width, 3), dtype=np.uint8)
+        self._fx = self.static.shape[1] / img_width
+        self._fy = self.static.shape[0] / img_height
+
+        self.tracker = DirtyRectTracker(board.cell_W_pix, board.cell_H_pix)
+        self._scene_full = True  # הסצנה צריכה ציור מלא (פריים ראשון / overlay / invalidate)
+        self._scene_rects: Optional[List[Rect]] = None  # None → הכל מלוכלך
+        self._cursor_rects: List[Rect] = []
+
+        # 2+3. background with the HUD drawn on it, and the output frame
+        self._base = np.empty((bg_height, bg_width, 3), dtype=np.uint8)
+        self._frame = np.empty_like(self._base)
+        self._hud_key = None
+        self._hud_args = (None, None, None, None)  # הארגומנטים האחרונים של set_hud – לציור מחדש של הבסיס
+        self._base_dirty = True
+
+        # the board region is overwritten every frame; around it, restore only
+        # the thin strips the cursors may have painted on
+        x0, y0 = max(0, center_x - CURSOR_MARGIN), max(0, center_y - CURSOR_MARGIN)
+        x1 = min(bg_width, center_x + img_width + CURSOR_MARGIN)
+        y1 = min(bg_height, center_y + img_height + CURSOR_MARGIN)
+        bx1, by1 = center_x + img_width, center_y + img_height
+        self._margins = [
+            (slice(y0, center_y), slice(x0, x1)), (slice(by1, y1), slice(x0, x1)),
+            (slice(center_y, by1), slice(x0, center_x)), (slice(center_y, by1), slice(bx1, x1)),
+        ]
+
+    # layers ----------------------------------------------------------------
+    def set_hud(self, score_info=None, moves_info=None, player_names=None, version=None):
+        """
+        Redraw the HUD layer if score, moves or names changed since last time.
+        `version` (e.g. the ScoreTracker/MoveLogger change counters) replaces
+        inspecting score_info/moves_info when the caller has one.
+        """
+        if version is not None:
+            key = ("version", version, tuple(sorted(player_names.items())) if player_names else None)
+        else:
+            key = _hud_key(score_info, moves_info, player_names)
+        self._hud_args = (score_info, moves_info, player_names, version)
+        if key == self._hud_key and not self._base_dirty:
+            return
+        self._hud_key = key
+
+        bg_width, bg_height, img_width = self.layout[0], self.layout[1], self.layout[2]
+        np.copyto(self._base, gradient_background(bg_height, bg_width, self.gradient_colors))
+        hud = self.board.img
+        if score_info:
+            hud._draw_score_on_background(self._base, score_info, bg_width, bg_height, player_names)
+        if moves_info:
+            hud._draw_moves_history(self._base, moves_info, bg_width, bg_height, img_width)
+        np.copyto(self._frame, self._base)
+        self._base_dirty = False
+        self._scene_rects = None  # ה-frame הועתק מחדש – צריך את כל הלוח
+
+    def invalidate(self):
+        """Force a full redraw of the scene on the next frame."""
+        self._scene_full = True
+
+    def draw_scene(self, pieces: Iterable, now_ms: int,
+                   overlay: Optional[Callable[[Board], None]] = None) -> Board:
+        """Repaint the scene buffer: only the dirty rectangles, or everything."""
+        pieces = list(pieces)
+        scene = self.scene.img.img
+        collected = None
+        if overlay is None and not self._scene_full:
+            collected = self.tracker.collect(pieces)
+
+        if collected is None:
+            np.copyto(scene, self.static)
+            self.tracker.clear()
+            for index, p in enumerate(pieces):
+                p.draw_on_board(self.scene, now_ms)
+                self._record(p, index)
+            if overlay is not None:
+                overlay(self.scene)
+            # ה-overlay צויר מעל הכל – גם הפריים הבא יהיה מלא
+            self._scene_full = overlay is not None
+            self._scene_rects = None
+            return self.scene
+
+        restore, redraw = collected
+        height, width = scene.shape[:2]
+        rects = []
+        for x0, y0, x1, y1 in restore:
+            x0, y0, x1, y1 = max(0, x0), max(0, y0), min(width, x1), min(height, y1)
+            if x0 < x1 and y0 < y1:
+                scene[y0:y1, x0:x1] = self.static[y0:y1, x0:x1]
+                rects.append((x0, y0, x1, y1))
+        for index, p, rect, img in redraw:
+            p.draw_on_board(self.scene, now_ms)
+            self.tracker.record(p, index, rect, img)
+
+        if self._scene_rects is not None:
+            self._scene_rects.extend(rects)
+        return self.scene
+
+    def _record(self, piece, index):
+        graphics, physics = _piece_parts(piece)
+        if graphics is None or physics is None or physics.pixel_pos is None:
+            return
+        img = graphics.get_img()
+        graphics.dirty = physics.dirty = False
+        if img.img is not None:
+            x, y = physics.pixel_pos
+            h, w = img.img.shape[:2]
+            self.tracker.record(piece, index, (x, y, x + w, y + h), img)
+
+    def _to_display(self, rect: Rect) -> Rect:
+        """מלבן בסצנה → מלבן (מורחב בפיקסל) בלוח המוקטן שבחלון."""
+        _, _, img_width, img_height = self.board_rect
+        x0, y0, x1, y1 = rect
+        return (max(0, int(x0 / self._fx) - 1), max(0, int(y0 / self._fy) - 1),
+                min(img_width, int(math.ceil(x1 / self._fx)) + 1),
+                min(img_height, int(math.ceil(y1 / self._fy)) + 1))
+
+    def _rescale(self, rect: Rect):
+        """
+        Update one display-space rectangle of the scaled scene with the same
+        bilinear mapping cv2.resize uses for the whole image (±1 level).
+        """
+        dx0, dy0, dx1, dy1 = rect
+        scene = self.scene.img.img
+        height, width = scene.shape[:2]
+        fx, fy = self._fx, self._fy
+        cx0 = max(0, int(math.floor((dx0 + 0.5) * fx - 0.5)) - 1)
+        cy0 = max(0, int(math.floor((dy0 + 0.5) * fy - 0.5)) - 1)
+        cx1 = min(width, int(math.ceil((dx1 - 0.5) * fx - 0.5)) + 2)
+        cy1 = min(height, int(math.ceil((dy1 - 0.5) * fy - 0.5)) + 2)
+        matrix = np.array([[fx, 0, (dx0 + 0.5) * fx - 0.5 - cx0],
+                           [0, fy, (dy0 + 0.5) * fy - 0.5 - cy0]])
+        self._scaled[dy0:dy1, dx0:dx1] = cv2.warpAffine(
+            scene[cy0:cy1, cx0:cx1], matrix, (dx1 - dx0, dy1 - dy0),
+            flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP, borderMode=cv2.BORDER_REPLICATE)
+
+    def _paste(self, rect: Rect):
+        """Copy one display-space rectangle of the scaled scene into the frame."""
+        center_x, center_y, _, _ = self.board_rect
+        dx0, dy0, dx1, dy1 = rect
+        src = self.scene.img.img if self._scaled is None else self._scaled
+        src = src[dy0:dy1, dx0:dx1]
+        rows = slice(center_y + dy0, center_y + dy1)
+        cols = slice(center_x + dx0, center_x + dx1)
+        if src.shape[2] == 4 and not self._static_opaque:
+            a16 = src[..., 3].astype(np.uint16)[..., None]
+            self._frame[rows, cols] = (self._base[rows, cols] * (255 - a16) + src[..., :3] * a16 + 127) // 255
+        else:
+            self._frame[rows, cols] = src[..., :3]
+
+    def compose(self, cursors_info=None) -> np.ndarray:
+        """Assemble the output frame: HUD/background, scaled scene, cursors."""
+        if self._base_dirty:
+            self.set_hud(*self._hud_args)  # הבסיס נבנה מחדש עם ה-HUD האחרון, לא ריק
+
+        frame = self._frame
+        for rows, cols in self._margins:
+            frame[rows, cols] = self._base[rows, cols]
+
+        center_x, center_y, img_width, img_height = self.board_rect
+        if self._scene_rects is None:
+            scene = self.scene.img.img
+            if self._scaled is not None:
+                cv2.resize(scene, (img_width, img_height), dst=self._scaled)
+                scene = self._scaled
+            roi = frame[center_y:center_y + img_height, center_x:center_x + img_width]
+            if scene.shape[2] == 4 and not self._static_opaque:
+                np.copyto(roi, self._base[center_y:center_y + img_height, center_x:center_x + img_width])
+                a16 = scene[..., 3].astype(np.uint16)[..., None]
+                roi[...] = (roi * (255 - a16) + scene[..., :3] * a16 + 127) // 255
+            elif scene.shape[2] == 4:
+                cv2.cvtColor(scene, cv2.COLOR_BGRA2BGR, dst=self._scaled_bgr)
+                roi[...] = self._scaled_bgr
+            else:
+                roi[...] = scene
+        else:
+            scene_rects = [self._to_display(r) for r in self._scene_rects]
+            if self._scaled is not None:
+                for rect in scene_rects:
+                    self._rescale(rect)
+            # מחק את הסמנים של הפריים הקודם ואת מה שהשתנה בסצנה
+            for rect in scene_rects + self._cursor_rects:
+                self._paste(rect)
+        self._scene_rects = []
+
+        self._cursor_rects = self._cursor_rects_for(cursors_info)
+        if cursors_info:
+            self.board.img._draw_cursors_on_background(frame, cursors_info, center_x, center_y, img_width, img_height,
+                                                       (self.board.W_cells, self.board.H_cells))
+        return frame
+
+    def _cursor_rects_for(self, cursors_info) -> List[Rect]:
+        """The board-local rectangles the cursors will paint on (with line margin)."""
+        if not cursors_info:
+            return []
+        _, _, img_width, img_height = self.board_rect
+        cell_width = img_width // self.board.W_cells
+        cell_height = img_height // self.board.H_cells
+        half = CURSOR_MARGIN // 2 + 1
+        rects = []
+        for cell in cursors_info.values():
+            if not cell:
+                continue
+            x, y = cell
+            rects.append((max(0, x * cell_width - half), max(0, y * cell_height - half),
+                          min(img_width, (x + 1) * cell_width + half),
+                          min(img_height, (y + 1) * cell_height + half)))
+        return rects
+
+    def render(self, pieces: Iterable, now_ms: int, cursors_info=None, score_info=None,
+               moves_info=None, player_names=None, overlay=None, hud_version=None) -> np.ndarray:
+        """Build one frame from the cached layers and return it (not shown)."""
+        self.set_hud(score_info, moves_info, player_names, hud_version)
+        self.draw_scene(pieces, now_ms, overlay)
+        return self.compose(cursors_info)
+
+    def show(self, frame: Optional[np.ndarray] = None):
+        fit_window(self.window_name, *self.frame_size)
+        cv2.imshow(self.window_name, self._frame if frame is None else frame)
+
+
+def _hud_key(score_info, moves_info, player_names):
+    """מה שמשפיע על ה-HUD – אם לא השתנה אין צורך לצייר אותו מחדש."""
+    score = tuple(sorted(score_info.items())) if score_info else None
+    moves = None
+    if moves_info:
+        # רשימות המהלכים רק גדלות; reset מחליף אותן באובייקט חדש
+        moves = tuple((color, id(lst), len(lst)) for color, lst in sorted(moves_info.items()))
+    names = tuple(sorted(player_names.items())) if player_names else None
+    return score, moves, names
@@ -0,0 +1,72 @@
+import heapq
+import itertools
+from typing import Callable, List, Optional
+
+
+class Timer:
+    """A scheduled callback; Scheduler.cancel() drops it without searching the heap."""
+    __slots__ = ("at_ms", "seq", "callback", "args", "cancelled")
+
+    def __init__(self, at_ms: int, seq: int, callback: Callable, args: tuple):
+        self.at_ms, self.seq = at_ms, seq
+        self.callback, self.args = callback, args
+        self.cancelled = False
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.at_ms, self.seq) < (other.at_ms, other.seq)
+
+
+class Scheduler:
+    """
+    Min-heap of timers on game time. run_due(now_ms) fires every timer whose
+    deadline has passed, in deadline order (ties in scheduling order), and
+    nothing else – a tick costs O(due events · log n) no matter how many
+    pieces are sitting idle. Callbacks are called as callback(now_ms, *args).
+    """
+
+    def __init__(self):
+        self._heap: List[Timer] = []
+        self._seq = itertools.count()
+        self._cancelled = 0
+
+    def schedule(self, at_ms: int, callback: Callable, *args) -> Timer:
+        timer = Timer(at_ms, next(self._seq), callback, args)
+        heapq.heappush(self._heap, timer)
+        return timer
+
+    def cancel(self, timer: Timer):
+        if not timer.cancelled:
+            timer.cancelled = True
+            self._cancelled += 1
+            # טיימרים מבוטלים נשארים בערימה עד שמגיע זמנם – דוחסים כשהם רוב
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [t for t in self._heap if not t.cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def run_due(self, now_ms: int) -> int:
+        """מריץ את כל הטיימרים שזמנם הגיע; מחזיר כמה הורצו."""
+        fired = 0
+        # self._heap ולא משתנה מקומי – callback שמבטל טיימרים עלול לדחוס את הערימה
+        while self._heap and self._heap[0].at_ms <= now_ms:
+            timer = heapq.heappop(self._heap)
+            if timer.cancelled:
+                self._cancelled -= 1
+                continue
+            timer.cancelled = True  # כבר רץ – cancel() מאוחר לא ייספר
+            timer.callback(now_ms, *timer.args)
+            fired += 1
+        return fired
+
+    def next_deadline(self) -> Optional[int]:
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+        return self._heap[0].at_ms if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def clear(self):
+        self._heap.clear()
+        self._cancelled = 0
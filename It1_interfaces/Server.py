@@ -5,21 +5,22 @@ import logging
 from typing import Dict, List, Optional
 import pathlib
 import queue
-import time
 
 from img import Img
 from Board import Board
 from Game import Game
 from Command import Command
 from PieceFactory import PieceFactory
+from Layout import create_pieces, standard_layout
 
 logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class ChessServer:
-    def __init__(self, host='localhost', port=8888):
+    def __init__(self, host='localhost', port=8888, clock=None):
         self.host = host
         self.port = port
+        self.clock = clock  # None – שעון קיר; ScaledClock/FixedStepClock לסימולציות
         self.socket = None
         self.clients = {}
         self.game = None
@@ -40,39 +41,13 @@ class ChessServer:
         )
         
         pieces_root = pathlib.Path(__file__).parent.parent / "pieces"
-        factory = PieceFactory(board, pieces_root)
+        factory = PieceFactory(board, pieces_root, lazy=True)  # השרת לא מצייר – ספרייטים רק לפי הצורך
         
-        start_positions = [
-            ("RB", (0, 0)), ("NB", (1, 0)), ("BB", (2, 0)), ("QB", (3, 0)), 
-            ("KB", (4, 0)), ("BB", (5, 0)), ("NB", (6, 0)), ("RB", (7, 0)),
-            ("PB", (0, 1)), ("PB", (1, 1)), ("PB", (2, 1)), ("PB", (3, 1)), 
-            ("PB", (4, 1)), ("PB", (5, 1)), ("PB", (6, 1)), ("PB", (7, 1)),
-            ("PW", (0, 6)), ("PW", (1, 6)), ("PW", (2, 6)), ("PW", (3, 6)), 
-            ("PW", (4, 6)), ("PW", (5, 6)), ("PW", (6, 6)), ("PW", (7, 6)),
-            ("RW", (0, 7)), ("NW", (1, 7)), ("BW", (2, 7)), ("QW", (3, 7)), 
-            ("KW", (4, 7)), ("BW", (5, 7)), ("NW", (6, 7)), ("RW", (7, 7)),
-        ]
+        start_positions = standard_layout(board.W_cells, board.H_cells)
         
-        pieces = []
-        piece_counters = {}
+        pieces = create_pieces(factory, start_positions, queue.Queue())
         
-        for p_type, cell in start_positions:
-            if p_type not in piece_counters:
-                piece_counters[p_type] = 0
-            unique_id = f"{p_type}{piece_counters[p_type]}"
-            piece_counters[p_type] += 1
-            
-            piece = factory.create_piece(p_type, cell, queue.Queue())
-            piece.piece_id = unique_id
-            
-            if hasattr(piece._state, 'physics'):
-                piece._state.physics.piece_id = unique_id
-            elif hasattr(piece._state, '_physics'):
-                piece._state._physics.piece_id = unique_id
-                
-            pieces.append(piece)
-        
-        self.game = Game(pieces, board)
+        self.game = Game(pieces, board, piece_factory=factory, clock=self.clock, sound=False)  # אין רמקול בשרת
         
         # ודא שהכלים מחוברים לתור הנכון
         for piece in self.game.pieces:
@@ -172,30 +147,17 @@ class ChessServer:
     def _game_loop(self):
         """לולאת המשחק - רק לוגיקה"""
         logger.info("לולאת המשחק התחילה")
-        start_ms = self.game.game_time_ms()
-        
-        for p in self.game.pieces:
-            p.reset(start_ms)
+        self.game.start()
         
         while not self.game.game_over:
-            now = self.game.game_time_ms()
-            for p in self.game.pieces:
-                p.update(now)
-
-            while not self.game.user_input_queue.empty():
-                cmd = self.game.user_input_queue.get()
-                self.game._process_input(cmd)
-                if self.game.game_over:
-                    break
-
-            self.game._resolve_collisions()
+            self.game.step(self.game.game_time_ms())
             
             if self.game._is_win() and not self.game.winner_announced:
                 self.game._announce_win()
                 self.game.winner_announced = True
             
             self._broadcast_game_state()
-            time.sleep(1/60.0)
+            self.game.clock.tick()
     
     def _broadcast_game_state(self):
         """שלח מצב המשחק לכל הלקוחות"""
@@ -251,11 +213,17 @@ class ChessServer:
                 'white': self.game.score_tracker.get_score("white"),
                 'black': self.game.score_tracker.get_score("black")
             },
+            'material': {
+                'white': self.game.score_tracker.get_material("white"),
+                'black': self.game.score_tracker.get_material("black"),
+                'balance': self.game.score_tracker.material_balance()
+            },
             'moves': {
                 'white': self.game.move_logger.get_moves("white"),
                 'black': self.game.move_logger.get_moves("black")
             },
             'game_over': self.game.game_over,
+            'hash': self.game.state_hash(),  # Zobrist – הלקוח מדלג על סנכרון כשהוא לא השתנה
             'winner': self.game.winner_tracker.get_winner_text() if self.game.winner_announced else None,
             'player_names': self.game.player_names,
             'timestamp': self.game.game_time_ms()
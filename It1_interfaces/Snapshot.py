@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from BoardIndex import physics_of
+from PhysicsWorld import PhysicsWorld
+
+# עמודות של PhysicsWorld שנכנסות ל-snapshot (כל המצב הלוגי של Physics)
+WORLD_COLUMNS = PhysicsWorld.PAIRS + ("start_time", "end_time", "moving", "mode")
+
+
+class GameSnapshot:
+    """
+    Logic-only state of a Game at one moment: which pieces are in play, each
+    piece's physics row (cells, pixels, start/end times, mode), wait timers,
+    state id and cooldown, plus selections, cursors, jumping pieces, scores,
+    the winner banner and the length of the move log.
+
+    Pieces are kept by reference, not copied – Graphics and sprites are never
+    touched. Physics rows are taken with one fancy-index copy per column and
+    the move log only by length (it is append-only), so capturing costs a few
+    array copies regardless of sprite sizes.
+    """
+    __slots__ = ("pieces", "worlds", "scalars", "states", "selected", "cursors",
+                 "jumping", "score", "move_counts", "game_over", "winner_announced", "end_game_ms",
+                 "winner")
+
+    def __init__(self, game):
+        self.pieces = tuple(game.pieces)
+        # world → (physics, rows, {column: values})
+        self.worlds: Dict[PhysicsWorld, Tuple[List, np.ndarray, Dict[str, np.ndarray]]] = {}
+        grouped: Dict[PhysicsWorld, List] = {}
+        for piece in self.pieces:
+            physics = physics_of(piece)
+            if getattr(physics, "world", None) is not None:
+                grouped.setdefault(physics.world, []).append(physics)
+        for world, physics in grouped.items():
+            rows = np.fromiter((p._row for p in physics), dtype=np.intp, count=len(physics))
+            self.worlds[world] = (physics, rows, {name: getattr(world, name)[rows] for name in WORLD_COLUMNS})
+        self.scalars = [(p, p.wait_only, p.start_ms, p.duration_ms)
+                        for physics, _rows, _cols in self.worlds.values() for p in physics]
+
+        self.states = []
+        for piece in self.pieces:
+            state = piece._state
+            record = getattr(state, "record", None)  # CompiledState – רק מספר ה-state
+            self.states.append((piece, state, record.state_id if record is not None else None,
+                                getattr(state, "cooldown_end_ms", 0)))
+
+        self.selected = (game.selected_piece_player1, game.selected_piece_player2)
+        self.cursors = (list(game.cursor_pos_player1), list(game.cursor_pos_player2))
+        self.jumping = frozenset(game.jumping_pieces)
+        self.score = dict(game.score_tracker.score)
+        self.move_counts = {color: len(moves) for color, moves in game.move_logger.moves.items()}
+        self.game_over, self.winner_announced = game.game_over, game.winner_announced
+        tracker = game.winner_tracker
+        self.winner = (tracker.game_over, tracker.winner, tracker.winner_text)
+        timer = game._end_game_timer
+        self.end_game_ms: Optional[int] = None if timer is None or timer.cancelled else timer.at_ms
+
+    def restore(self, game):
+        """מחזיר את game למצב ה-snapshot. פקודות שממתינות בתור שייכות לציר הזמן שנזנח ונמחקות."""
+        for world, (_physics, rows, columns) in self.worlds.items():
+            for name, values in columns.items():
+                getattr(world, name)[rows] = values
+            world.dirty[rows] = True
+        for physics, wait_only, start_ms, duration_ms in self.scalars:
+            physics.wait_only, physics.start_ms, physics.duration_ms = wait_only, start_ms, duration_ms
+
+        for piece, state, state_id, cooldown_end_ms in self.states:
+            changed = piece._state is not state
+            piece._state = state
+            if state_id is not None:
+                changed = changed or state.record.state_id != state_id
+                state.record.state_id = state_id
+            if hasattr(state, "cooldown_end_ms"):
+                state.cooldown_end_ms = cooldown_end_ms
+            graphics = getattr(state, "graphics", None)
+            if changed and hasattr(graphics, "switch_to_state"):
+                graphics.switch_to_state(state.name)
+
+        # ה-BoardIndex והחומר מתעדכנים רק בהפרש; כל כלי מתעדכן ב-tick הבא ומתזמן את עצמו מחדש
+        game.pieces.replace(self.pieces)
+        for piece in self.pieces:
+            game.board_index.refresh(piece)  # הסטטוס (תנועה/מנוחה) ב-Zobrist hash
+            game._arm_piece(piece, 0)
+
+        game.selected_piece_player1, game.selected_piece_player2 = self.selected
+        game.cursor_pos_player1, game.cursor_pos_player2 = (list(c) for c in self.cursors)
+        game.jumping_pieces = set(self.jumping)
+        game.score_tracker.score = dict(self.score)
+        game.score_tracker.version += 1
+        for color, count in self.move_counts.items():
+            del game.move_logger.moves[color][count:]
+        game.move_logger.version += 1
+        game.game_over, game.winner_announced = self.game_over, self.winner_announced
+        tracker = game.winner_tracker
+        tracker.game_over, tracker.winner, tracker.winner_text = self.winner  # הבאנר של Game._draw
+        if game._end_game_timer is not None:
+            game.timers.cancel(game._end_game_timer)
+            game._end_game_timer = None
+        if self.end_game_ms is not None:
+            game._end_game_timer = game.timers.schedule(self.end_game_ms, game._end_game)
+        with game.user_input_queue.mutex:
+            game.user_input_queue.queue.clear()
@@ -5,8 +5,14 @@ from Physics import Physics
 from typing import Dict, Optional
 import time
 
+# מנוחה (ms) אחרי כל פעולה – גם ה-cooldown של הפקודה וגם ה-rest שאחרי ההגעה
+REST_MS = {"move": 5000, "jump": 2000}
+
 
 class State:
+    __slots__ = ("moves", "graphics", "physics", "_game_queue", "transitions",
+                 "cooldown_end_ms", "name", "_last_cmd")
+
     def __init__(self, moves: Moves, graphics: Graphics, physics: Physics, game_queue=None):
         self.moves, self.graphics, self.physics = moves, graphics, physics
         self._game_queue = game_queue  # תור פקודות של המשחק
@@ -34,10 +40,8 @@ class State:
         self._last_cmd = cmd
         
         # הגדר cooldown לפי סוג הפקודה
-        if cmd.type == "move":
-            self.cooldown_end_ms = getattr(cmd, 'timestamp', 0) + 5000  # 5 שניות
-        elif cmd.type == "jump":
-            self.cooldown_end_ms = getattr(cmd, 'timestamp', 0) + 2000  # 2 שניות
+        if cmd.type in REST_MS:
+            self.cooldown_end_ms = getattr(cmd, 'timestamp', 0) + REST_MS[cmd.type]
 
     def can_transition(self, now_ms: int) -> bool:           # customise per state
         return now_ms >= self.cooldown_end_ms
@@ -49,12 +53,8 @@ class State:
         if cmd.type == "arrived" and nxt:
 
             # 1️⃣ choose rest length according to the *previous* action
-            if self.name == "move":
-                rest_ms = 5000  # long rest after Move
-            elif self.name == "jump":
-                rest_ms = 2000  # short rest after Jump
-            else:  # long_rest → idle, idle → idle, …
-                rest_ms = 0
+            # long rest after Move, short after Jump, none for long_rest → idle, idle → idle, …
+            rest_ms = REST_MS.get(self.name, 0)
 
             # 2️⃣ restart graphics of the next state
             if hasattr(nxt.graphics, 'switch_to_state') and nxt.name:
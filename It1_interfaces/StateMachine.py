@@ -0,0 +1,175 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Command import Command
+from State import REST_MS
+
+# אירועים שמזיזים את ה-state machine: פקודות חיצוניות + ההגעה מ-Physics
+COMMANDS = ("move", "jump")
+EVENTS = COMMANDS + ("arrived",)
+ARRIVED = EVENTS.index("arrived")
+NO_STATE = -1
+
+
+class StateTable:
+    """
+    Compiled state graph of one piece type, shared by every piece of that type.
+
+    States get integer ids; next_state[state, event] is the id reached on an
+    event (NO_STATE = stay put) and rest_ms[state] the rest of a state: a
+    command into it blocks further commands for that long, and arriving out
+    of it arms a wait of that length before the next state settles.
+    """
+
+    def __init__(self, names: Sequence[str], moves: Sequence, next_state: np.ndarray,
+                 rest_ms: np.ndarray, initial: int = 0):
+        self.names: Tuple[str, ...] = tuple(names)
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.moves = tuple(moves)  # Moves של כל state לפי id
+        self.next_state = next_state
+        self.rest_ms = rest_ms
+        self.initial = initial
+        self.event_ids: Dict[str, int] = {event: i for i, event in enumerate(EVENTS)}
+
+    @classmethod
+    def compile(cls, specs) -> "StateTable":
+        """
+        specs: (name, config, moves, …) לכל state, כמו ב-PieceFactory._assemble.
+        "physics.next_state_when_finished" נותן את מעבר ה-arrived ו-"physics.rest_ms"
+        (אופציונלי) את המנוחה; בלעדיו – REST_MS לפי שם ה-state.
+        """
+        names = [spec[0] for spec in specs]
+        ids = {name: i for i, name in enumerate(names)}
+        next_state = np.full((len(names), len(EVENTS)), NO_STATE, dtype=np.int16)
+        rest_ms = np.zeros(len(names), dtype=np.int32)
+
+        for i, (name, cfg, *_rest) in enumerate(specs):
+            physics_cfg = (cfg or {}).get("physics", {})
+            rest_ms[i] = physics_cfg.get("rest_ms", REST_MS.get(name, 0))
+            finished = physics_cfg.get("next_state_when_finished")
+            if finished in ids:
+                next_state[i, ARRIVED] = ids[finished]
+            # פקודות חיצוניות זמינות מכל state שיש לו state בשם הפקודה
+            for event, command in enumerate(COMMANDS):
+                if command in ids:
+                    next_state[i, event] = ids[command]
+
+        initial = ids.get("idle", 0)
+        return cls(names, [spec[2] for spec in specs], next_state, rest_ms, initial)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def transition(self, state_id: int, event: str) -> int:
+        """ה-state אחרי event (NO_STATE אם אין מעבר)."""
+        event_id = self.event_ids.get(event)
+        if event_id is None:
+            return NO_STATE
+        return self.next_state.item(state_id, event_id)
+
+
+class StateRecord:
+    """מה שכל כלי מחזיק בפועל: ה-state הנוכחי וסוף ה-cooldown."""
+    __slots__ = ("state_id", "cooldown_end_ms")
+
+    def __init__(self, state_id: int, cooldown_end_ms: int = 0):
+        self.state_id = state_id
+        self.cooldown_end_ms = cooldown_end_ms
+
+
+class CompiledState:
+    """
+    Runtime of a piece over a shared StateTable, with the same interface as
+    State (moves, graphics, physics, name, can_transition, update, …) so Piece
+    and Game use it unchanged. Transitions only update the StateRecord and
+    switch the piece's single Graphics to the clip of the new state – no
+    State objects or graphics copies per state.
+    """
+    __slots__ = ("table", "graphics", "physics", "_game_queue", "record", "_last_cmd")
+
+    def __init__(self, table: StateTable, graphics, physics, game_queue=None,
+                 state_id: Optional[int] = None):
+        self.table = table
+        self.graphics, self.physics = graphics, physics
+        self._game_queue = game_queue  # תור פקודות של המשחק
+        self.record = StateRecord(table.initial if state_id is None else state_id)
+        self._last_cmd: Optional[Command] = None
+
+    def __repr__(self):
+        return f"CompiledState({self.name})"
+
+    @property
+    def name(self) -> str:
+        return self.table.names[self.record.state_id]
+
+    @property
+    def state(self) -> str:
+        return self.name
+
+    @property
+    def moves(self):
+        return self.table.moves[self.record.state_id]
+
+    @property
+    def cooldown_end_ms(self) -> int:
+        return self.record.cooldown_end_ms
+
+    @cooldown_end_ms.setter
+    def cooldown_end_ms(self, value: int):
+        self.record.cooldown_end_ms = value
+
+    # runtime -------------------
+    def reset(self, cmd: Command):
+        self.graphics.switch_to_state(self.name)
+        self.physics.reset(cmd)
+        self._last_cmd = cmd
+        if cmd.type in COMMANDS:
+            self.record.cooldown_end_ms = getattr(cmd, 'timestamp', 0) + self.table.rest_ms.item(self.record.state_id)
+
+    def can_transition(self, now_ms: int) -> bool:
+        return now_ms >= self.record.cooldown_end_ms
+
+    def get_state_after_command(self, cmd: Command, now_ms: int) -> "CompiledState":
+        table, record = self.table, self.record
+        event = table.event_ids.get(cmd.type)
+        if event is None:
+            return self
+        nxt = table.next_state.item(record.state_id, event)
+        if nxt == NO_STATE:
+            return self
+
+        if event == ARRIVED:
+            # המנוחה נקבעת לפי ה-state שממנו יוצאים (move → מנוחה ארוכה, jump → קצרה)
+            rest_ms = table.rest_ms.item(record.state_id)
+            record.state_id = nxt
+            self.graphics.switch_to_state(table.names[nxt])
+            if rest_ms:
+                physics = self.physics
+                physics.start_ms, physics.duration_ms, physics.wait_only = now_ms, rest_ms, True
+                record.cooldown_end_ms = now_ms + rest_ms
+            else:
+                record.cooldown_end_ms = 0
+            self.graphics.running = True
+            return self
+
+        if not self.can_transition(now_ms):
+            return self  # לא מעבירים פקודה במהלך cooldown
+        record.state_id = nxt
+        self.reset(cmd)  # מתחיל את התנועה
+        return self
+
+    def update(self, now_ms: int) -> "CompiledState":
+        internal = self.physics.update(now_ms)
+        if internal:
+            if internal.type == "arrived" and self._game_queue is not None:
+                self._game_queue.put(internal)
+            return self.get_state_after_command(internal, now_ms)
+        self.graphics.update(now_ms)
+        return self
+
+    def get_command(self) -> Optional[Command]:
+        return self._last_cmd
+
+    def process_command(self, cmd: Command) -> "CompiledState":
+        return self.get_state_after_command(cmd, getattr(cmd, 'timestamp', 0))
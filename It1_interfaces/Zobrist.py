@@ -0,0 +1,77 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from Bitboards import color_of
+
+# seed קבוע – אותו מפתח לאותו מצב בכל תהליך (שרת, לקוח, קבצי replay)
+SEED = 0x5EED_C7D2_5
+KINDS = "PNBRQK"
+READY, FLIGHT, REST = range(3)  # סטטוס כלי: עומד, בתנועה/קפיצה, במנוחה (cooldown)
+
+
+def status_of(physics) -> int:
+    if physics is None:
+        return READY
+    if getattr(physics, "moving", False) or getattr(physics, "mode", None) == "jump":
+        return FLIGHT
+    if getattr(physics, "wait_only", False):
+        return REST
+    return READY
+
+
+class ZobristHash:
+    """
+    64-bit Zobrist hash of the board: one random key per (kind, color,
+    status, square), XOR-ed over the pieces in play. BoardIndex updates it on
+    every add, discard and cell change, and Game re-keys a piece whenever a
+    command or update may have changed its status, so `value` is always the
+    hash of the current position in O(1) per event. side() adds what belongs
+    to a player rather than a piece (cursor and selection).
+    """
+
+    def __init__(self, width: int, height: int, seed: int = SEED):
+        self.width, self.height = width, height
+        squares = width * height + 1  # המשבצת האחרונה – מחוץ ללוח
+        rng = np.random.default_rng(seed)
+
+        def keys(*shape):
+            return rng.integers(0, 2 ** 64, size=shape, dtype=np.uint64).tolist()
+
+        self._pieces = keys(len(KINDS) + 1, 2, 3, squares)  # סוג לא מוכר – השורה האחרונה
+        self._cursors = keys(2, squares)
+        self._selected = keys(2, squares)
+        self.winner_key, self.game_over_key = keys(2)
+        self._keys: Dict[int, int] = {}  # id(piece) → המפתח שנכנס ל-value
+        self.value = 0
+
+    def square(self, cell) -> int:
+        if cell is None:
+            return self.width * self.height
+        x, y = int(cell[0]), int(cell[1])
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return self.width * self.height
+
+    def key(self, piece, cell, status: int) -> int:
+        piece_id = piece.piece_id
+        kind = KINDS.find(piece_id[:1]) if piece_id else -1
+        return self._pieces[kind][color_of(piece_id) == 'B'][status][self.square(cell)]
+
+    def refresh(self, piece, cell, physics):
+        """מחליף את המפתח של הכלי לפי cell והסטטוס של physics (גם להוספה)."""
+        new = self.key(piece, cell, status_of(physics))
+        old = self._keys.get(id(piece), 0)
+        self._keys[id(piece)] = new
+        self.value ^= old ^ new
+
+    def discard(self, piece):
+        self.value ^= self._keys.pop(id(piece), 0)
+
+    def side(self, player: int, cursor: Optional[Tuple[int, int]], selected: Optional[Tuple[int, int]]) -> int:
+        """המפתח של מה ששייך לשחקן (0/1): מיקום הסמן והכלי הנבחר (None – אין)."""
+        selected_key = self._selected[player][self.square(selected)] if selected is not None else 0
+        return self._cursors[player][self.square(cursor)] ^ selected_key
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+מיקרו-בנצ'מרק: זמן tick וזיכרון כפונקציה של גודל הלוח ומספר הכלים – מ-8x8
+עם 32 כלים ועד 64x64 עם אלפי כלים. כל לוח מקבל את הפתיחה של Layout עם
+שורות חיילים נוספות, ובכל tick אחוז מהכלים מקבל מהלך חוקי (MoveGenerator).
+
+tick = הגעות ועדכונים (_update_pieces) + עיבוד הפקודות + תפיסות באמצע הדרך,
+בלי ציור. הבחירה של המהלכים (legal_moves) נמדדת בנפרד.
+
+הרצה:
+    python benchmarks/bench_board_size.py                      # 8, 16, 32, 64
+    python benchmarks/bench_board_size.py --stress 64x64 --pawn-rows 23 --ticks 600
+"""
+
+import argparse
+import gc
+import logging
+import os
+import pathlib
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Board import Board
+from Command import Command
+from Game import Game
+from Layout import create_pieces, standard_layout
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parents[2] / "pieces"
+FRAME_MS = 16
+
+
+def build(width, height, pawn_rows):
+    """משחק בלי תמונה (כמו בשרת) על לוח width x height."""
+    board = Board(103.5, 102.75, 1, 1, width, height, None)
+    factory = PieceFactory(board, PIECES_ROOT, lazy=True)
+    game = Game([], board, piece_factory=factory)
+    game.pieces = create_pieces(factory, standard_layout(width, height, pawn_rows), game.user_input_queue)
+    clock = {"now": 0}
+    game.game_time_ms = lambda: clock["now"]
+    for piece in game.pieces:
+        piece.reset(0)
+    game.move_generator.legal_moves(now_ms=0)  # מקמפל את ה-MoveTable של כל סוג כלי לגודל הלוח
+    return game, clock
+
+
+def run(width, height, pawn_rows, ticks, move_share, seed=0):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    game, clock = build(width, height, pawn_rows)
+    build_s = time.perf_counter() - start
+    memory, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    pieces = len(game.pieces)
+
+    rng = np.random.default_rng(seed)
+    index = game.board_index
+    tick_ms, select_ms = [], []
+    for _ in range(ticks):
+        clock["now"] += FRAME_MS
+        now = clock["now"]
+
+        start = time.perf_counter()
+        moves = game.move_generator.legal_moves(now_ms=now)
+        select_ms.append((time.perf_counter() - start) * 1e3)
+        if len(moves):
+            count = min(len(moves), max(1, int(len(game.pieces) * move_share)))
+            for fx, fy, tx, ty in moves[rng.choice(len(moves), count, replace=False)].tolist():
+                piece = index.piece_at(fx, fy)
+                if piece is not None:
+                    game.user_input_queue.put(Command(timestamp=now, piece_id=piece.piece_id,
+                                                      type="move", target=(tx, ty)))
+
+        start = time.perf_counter()
+        game._update_pieces(now)
+        while not game.user_input_queue.empty():
+            game._process_input(game.user_input_queue.get())
+        game._resolve_collisions(now)
+        tick_ms.append((time.perf_counter() - start) * 1e3)
+    return {
+        "pieces": pieces, "build_s": build_s, "memory": memory,
+        "tick": statistics.median(tick_ms), "tick_p99": sorted(tick_ms)[int(len(tick_ms) * 0.99)],
+        "select": statistics.median(select_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stress", metavar="WxH", help="לוח יחיד (למשל 64x64) במקום הסדרה 8..64")
+    parser.add_argument("--pawn-rows", type=int, help="שורות חיילים לכל צד (ברירת מחדל: רבע מהגובה פחות אחת)")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--move-share", type=float, default=0.01, help="חלק הכלים שמקבלים מהלך בכל tick")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    build(8, 8, 1)  # טעינת קונפיגורציות ומטמונים משותפים – לא נספרים בזיכרון של הלוח הראשון
+
+    sizes = [tuple(int(n) for n in args.stress.lower().split("x"))] if args.stress else [(n, n) for n in (8, 16, 32, 64)]
+    print(f"{'board':>7} {'pieces':>7} {'build s':>8} {'memory':>9} {'KB/piece':>9} "
+          f"{'tick ms':>8} {'p99 ms':>8} {'legal_moves ms':>15}")
+    for width, height in sizes:
+        pawn_rows = args.pawn_rows if args.pawn_rows is not None else max(1, height // 4 - 1)
+        r = run(width, height, pawn_rows, args.ticks, args.move_share)
+        print(f"{width:>3}x{height:<3} {r['pieces']:>7} {r['build_s']:>8.2f} {r['memory'] / 2 ** 20:>7.1f}MB "
+              f"{r['memory'] / 1024 / r['pieces']:>9.2f} {r['tick']:>8.3f} {r['tick_p99']:>8.3f} {r['select']:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
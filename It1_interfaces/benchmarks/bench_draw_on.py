@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+מיקרו-בנצ'מרק: Img.draw_on (premultiplied alpha) מול המימוש הישן (cv2.split + float).
+
+הרצה:
+    python benchmarks/bench_draw_on.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from img import Img
+
+
+def legacy_draw_on(sprite, board, x, y):
+    """העתק של draw_on הישן – לולאת float64 לכל ערוץ."""
+    h, w = sprite.img.shape[:2]
+    roi = board.img[y:y + h, x:x + w]
+    b, g, r, a = cv2.split(sprite.img)
+    mask = a / 255.0
+    for c in range(3):
+        roi[..., c] = (1 - mask) * roi[..., c] + mask * sprite.img[..., c]
+
+
+def make_sprite(opaque: bool) -> Img:
+    rng = np.random.default_rng(0)
+    arr = rng.integers(0, 256, size=(80, 80, 4), dtype=np.uint8)
+    if opaque:
+        arr[..., 3] = 255
+    sprite = Img()
+    sprite.img = arr
+    sprite._prepare_blend()
+    return sprite
+
+
+def make_board() -> Img:
+    board = Img()
+    board.img = np.full((828, 822, 4), 128, dtype=np.uint8)
+    return board
+
+
+def bench(label, fn, number=2000):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5))
+    print(f"{label:<28} {seconds / number * 1e6:8.2f} us/sprite")
+    return seconds
+
+
+def main():
+    board = make_board()
+    for opaque in (True, False):
+        sprite = make_sprite(opaque)
+        kind = "opaque" if opaque else "translucent"
+        print(f"--- 80x80 {kind} sprite ---")
+        old = bench("legacy cv2.split + float", lambda: legacy_draw_on(sprite, board, 100, 100))
+        new = bench("Img.draw_on (premultiplied)", lambda: sprite.draw_on(board, 100, 100))
+        print(f"speedup: x{old / new:.1f}  (32 pieces: {new / 2000 * 32 * 1e3:.3f} ms/frame)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+מיקרו-בנצ'מרק: משחק headless על FixedStepClock – כמה שניות משחק רצות בשנייה
+אמיתית (WallClock רץ בדיוק 1x), ובדיקה שריצה חוזרת עם אותן פקודות נותנת
+אותו state_hash בדיוק.
+
+הפקודות נבחרות מראש מ-MoveGenerator על משחק נפרד (seed קבוע) ומוזנות
+ל-run_headless לפי ה-timestamp שלהן.
+
+הרצה:
+    python benchmarks/bench_headless.py
+    python benchmarks/bench_headless.py --size 32x32 --game-seconds 120
+"""
+
+import argparse
+import logging
+import os
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Board import Board
+from Clock import FixedStepClock
+from Command import Command
+from Game import Game
+from Layout import create_pieces, standard_layout
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parents[2] / "pieces"
+
+
+def build(width, height, clock):
+    board = Board(103.5, 102.75, 1, 1, width, height, None)
+    factory = PieceFactory(board, PIECES_ROOT, lazy=True)
+    game = Game([], board, piece_factory=factory, clock=clock)
+    game.pieces = create_pieces(factory, standard_layout(width, height, max(1, height // 4 - 1)), game.user_input_queue)
+    return game
+
+
+def script(width, height, game_ms, every_ms=250, seed=0):
+    """מהלך חוקי אקראי כל every_ms, לפי מצב הפתיחה (חלק יידחו בזמן הריצה – זה בסדר)."""
+    game = build(width, height, FixedStepClock())
+    rng = np.random.default_rng(seed)
+    moves = game.move_generator.legal_moves(now_ms=0)
+    commands = []
+    for at_ms in range(every_ms, game_ms, every_ms):
+        fx, fy, tx, ty = moves[rng.integers(len(moves))].tolist()
+        piece = game.board_index.piece_at(fx, fy)
+        commands.append(Command(timestamp=at_ms, piece_id=piece.piece_id, type="move", target=(tx, ty)))
+    return commands
+
+
+def run(width, height, commands, game_ms, step_ms):
+    game = build(width, height, FixedStepClock(step_ms=step_ms))
+    start = time.perf_counter()
+    ticks = game.run_headless(commands, until_ms=game_ms)
+    return ticks, time.perf_counter() - start, game.state_hash()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default="8x8", metavar="WxH")
+    parser.add_argument("--game-seconds", type=int, default=60)
+    parser.add_argument("--step-ms", type=int, default=16)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    width, height = (int(n) for n in args.size.lower().split("x"))
+    game_ms = args.game_seconds * 1000
+    commands = script(width, height, game_ms)
+    ticks, seconds, first = run(width, height, commands, game_ms, args.step_ms)
+    _, _, second = run(width, height, commands, game_ms, args.step_ms)
+
+    print(f"{width}x{height}: {args.game_seconds} game s, {ticks} ticks of {args.step_ms} ms, "
+          f"{len(commands)} commands in {seconds:.2f} s real ({args.game_seconds / seconds:.0f}x real time)")
+    assert first == second, "replay diverged"
+    print(f"replay: identical state_hash {first:016x}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+מיקרו-בנצ'מרק: זיכרון לכלי – CompiledState (טבלה משותפת + רשומה) מול שכפול
+גרף ה-State לכל כלי כמו ב-create_piece הישן, ופקודות arrived מהבריכה מול הקצאה.
+
+הרצה:
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import os
+import pathlib
+import sys
+import timeit
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Board import Board
+from Command import Command, CommandPool
+from Piece import Piece
+from PieceFactory import PieceFactory
+from State import State
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parents[2] / "pieces"
+TYPES = ("PW", "PB", "NW", "NB", "BW", "BB", "RW", "RB", "QW", "QB", "KW", "KB")
+
+
+def legacy_create_piece(factory: PieceFactory, p_type: str, cell, game_queue=None) -> Piece:
+    """העתק של create_piece הישן – State ו-Graphics לכל state של כל כלי."""
+    template_idle = factory.templates[p_type]
+    shared_phys = factory.physics_factory.create(cell, {}, piece_id=p_type)
+    clone_map = {}
+    stack = [template_idle]
+    while stack:
+        orig = stack.pop()
+        if orig in clone_map:
+            continue
+        clone_map[orig] = State(orig.moves, orig.graphics.copy(), shared_phys, game_queue)
+        clone_map[orig].name = orig.name
+        stack.extend(orig.transitions.values())
+    for orig, clone in clone_map.items():
+        for event, target in orig.transitions.items():
+            clone.set_transition(event, clone_map[target])
+    return Piece(f"{p_type}_{cell[0]}_{cell[1]}", clone_map[template_idle])
+
+
+def measure(create, count):
+    """בתים ואובייקטים במעקב GC לכלי, אחרי שהתבניות כבר נטענו."""
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    pieces = [create(TYPES[i % len(TYPES)], (i % 8, i // 8 % 8)) for i in range(count)]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracked = len(gc.get_objects()) - objects
+    del pieces
+    gc.collect()
+    return size / count, tracked / count
+
+
+def main():
+    board = Board(80, 80, 1, 1, 8, 8, None)
+    factory = PieceFactory(board, PIECES_ROOT, lazy=True)
+    count = 2000
+
+    print(f"--- {count} pieces ---")
+    for label, create in (("cloned State graph", lambda t, c: legacy_create_piece(factory, t, c)),
+                          ("CompiledState", factory.create_piece)):
+        size, tracked = measure(create, count)
+        print(f"{label:<22} {size:8.0f} bytes/piece  {tracked:6.1f} gc objects/piece")
+
+    print("--- 'arrived' commands ---")
+    pool = CommandPool()
+
+    def pooled():
+        pool.release(pool.acquire(1000, "PW0", "arrived", target=(3, 4)))
+
+    def fresh():
+        Command(timestamp=1000, piece_id="PW0", type="arrived", target=(3, 4), params=None)
+
+    for label, fn in (("Command(...)", fresh), ("CommandPool", pooled)):
+        seconds = min(timeit.repeat(fn, number=100_000, repeat=5)) / 100_000
+        print(f"{label:<22} {seconds * 1e9:8.1f} ns/arrival")
+
+
+if __name__ == "__main__":
+    main()
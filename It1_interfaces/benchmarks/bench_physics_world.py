@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+מיקרו-בנצ'מרק: PhysicsWorld.step (אינטרפולציה וקטורית) מול Physics.update לכל כלי.
+
+הרצה:
+    python benchmarks/bench_physics_world.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from Command import Command
+from Physics import Physics
+from PhysicsWorld import PhysicsWorld
+
+
+class GridBoard:
+    def cell_to_pixel(self, cell):
+        return int(cell[0] * 80), int(cell[1] * 80)
+
+
+def make_moving(count: int, world: PhysicsWorld):
+    rng = np.random.default_rng(0)
+    board = GridBoard()
+    pieces = []
+    for i in range(count):
+        start, target = rng.integers(0, 64, size=(2, 2)).tolist()
+        physics = Physics(tuple(start), board, piece_id=f"P{i}", world=world)
+        physics.reset(Command(timestamp=0, piece_id=physics.piece_id, type="move", target=tuple(target), params=None))
+        physics.end_time = 10 ** 9  # אף אחד לא מגיע במהלך המדידה
+        pieces.append(physics)
+    return pieces
+
+
+def bench(label, fn, count, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{label:<26} {seconds * 1e3:8.3f} ms/tick  ({seconds / count * 1e6:.2f} us/piece)")
+    return seconds
+
+
+def main():
+    for count in (32, 1000, 5000):
+        world = PhysicsWorld()
+        pieces = make_moving(count, world)
+        print(f"--- {count} moving pieces ---")
+        old = bench("Physics.update per piece", lambda: [p.update(5000) for p in pieces], count, 20)
+        new = bench("PhysicsWorld.step", lambda: world.step(5000), count, 200)
+        print(f"speedup: x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
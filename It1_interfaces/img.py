@@ -2,15 +2,168 @@ from __future__ import annotations
 
 import pathlib
 import logging
+from functools import lru_cache
 
 import cv2
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# צבעי גרדיאנט ברירת מחדל (אפור כהה לאפור בהיר, BGR)
+DEFAULT_GRADIENT = {'top': (50, 50, 50), 'bottom': (120, 120, 120)}
+
+_gradient_cache: dict = {}
+_frame_buffers: dict = {}
+_window_sizes: dict = {}
+# כמה מחרוזות שונות נשמרות מרוסטרות; שורות יומן המהלכים כוללות זמן, אז בלי תקרה המטמון גדל לנצח
+TEXT_CACHE_SIZE = 512
+
+
+def _gradient_key(gradient_colors):
+    colors = gradient_colors or DEFAULT_GRADIENT
+    return tuple(int(c) for c in colors['top']), tuple(int(c) for c in colors['bottom'])
+
+
+def gradient_background(height: int, width: int, gradient_colors=None) -> np.ndarray:
+    """
+    Vertical top→bottom gradient, computed once per (size, colors) and cached.
+
+    The returned array is shared and read-only – copy it before drawing on it.
+    """
+    top, bottom = _gradient_key(gradient_colors)
+    key = (height, width, top, bottom)
+    background = _gradient_cache.get(key)
+    if background is None:
+        ratio = (np.arange(height, dtype=np.float64) / height)[:, None]
+        rows = (np.array(top, dtype=np.float64) * (1 - ratio) +
+                np.array(bottom, dtype=np.float64) * ratio).astype(np.uint8)
+        background = np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3)))
+        background.flags.writeable = False
+        _gradient_cache[key] = background
+    return background
+
+
+def background_layout(img_shape, background_scale=1.3, max_window_size=None):
+    """
+    Window geometry for display_with_background.
+
+    Returns (bg_width, bg_height, img_width, img_height, center_x, center_y):
+    the background grows by `background_scale` plus 400px for the move
+    tables, and everything shrinks to fit `max_window_size`.
+    """
+    img_height, img_width = img_shape[:2]
+
+    # חשב גודל הרקע - הרחב יותר כדי לתת מקום לטבלת המהלכים
+    bg_width = int(img_width * background_scale) + 400  # הוסף 400 פיקסלים רוחב נוסף
+    bg_height = int(img_height * background_scale)
+
+    # בדוק אם צריך להקטין בגלל גודל המסך
+    if max_window_size is None:
+        max_window_size = (1200, 900)  # גודל מקסימלי סביר
+
+    max_width, max_height = max_window_size
+    if bg_width > max_width or bg_height > max_height:
+        # חשב יחס קנה מידה כדי להתאים לחלון
+        scale = min(max_width / bg_width, max_height / bg_height)
+        bg_width = int(bg_width * scale)
+        bg_height = int(bg_height * scale)
+        img_width = int(img_width * scale)
+        img_height = int(img_height * scale)
+
+    # חישוב מיקום למרכז התמונה על הרקע
+    center_x = (bg_width - img_width) // 2
+    center_y = (bg_height - img_height) // 2
+    return bg_width, bg_height, img_width, img_height, center_x, center_y
+
+
+def _frame_buffer(shape) -> np.ndarray:
+    """Reusable output frame per shape (cv2.imshow copies what it shows)."""
+    buf = _frame_buffers.get(shape)
+    if buf is None:
+        buf = _frame_buffers[shape] = np.empty(shape, dtype=np.uint8)
+    return buf
+
+
+def fit_window(window_name, width, height):
+    """Create/resize the window only when its size actually changes."""
+    if _window_sizes.get(window_name) != (width, height):
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(window_name, width, height)
+        _window_sizes[window_name] = (width, height)
+
+class TextPatch:
+    """
+    Pre-rasterized text: an alpha (coverage) patch of the glyphs, the offset
+    of its top-left corner from the putText origin, and getTextSize metrics.
+    """
+    __slots__ = ("alpha", "dx", "dy", "size", "baseline")
+
+    def __init__(self, alpha, dx, dy, size, baseline):
+        self.alpha, self.dx, self.dy, self.size, self.baseline = alpha, dx, dy, size, baseline
+
+
+def text_patch(text: str, font=cv2.FONT_HERSHEY_SIMPLEX, font_scale: float = 1.0,
+               thickness: int = 1) -> TextPatch:
+    """
+    Rasterize `text` once per (text, font, scale, thickness) and cache it.
+    The cache is an LRU of TEXT_CACHE_SIZE entries.
+    """
+    return _rasterize(text, font, font_scale, thickness)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _rasterize(text: str, font, font_scale: float, thickness: int) -> TextPatch:
+    (w, h), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+    pad = h + thickness  # סוגריים וזנבות יוצאים מעבר ל-getTextSize
+    canvas = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+    cv2.putText(canvas, text, (pad, pad + h), font, font_scale, 255, thickness)
+    ys, xs = np.nonzero(canvas)
+    if len(ys):
+        y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+    else:
+        y0 = y1 = x0 = x1 = 0
+    alpha = canvas[y0:y1, x0:x1, None].astype(np.uint16)
+    alpha.flags.writeable = False
+    return TextPatch(alpha, int(x0) - pad, int(y0) - pad - h, (w, h), baseline)
+
+
+def draw_text(image: np.ndarray, text: str, org, font=cv2.FONT_HERSHEY_SIMPLEX,
+              font_scale: float = 1.0, color=(255, 255, 255), thickness: int = 1):
+    """
+    cv2.putText replacement for BGR images that alpha-blends the cached
+    raster of `text`. Like the putText calls it replaces it uses the default
+    lineType (LINE_8, not LINE_AA), and matches them within one level.
+    """
+    patch = text_patch(text, font, font_scale, thickness)
+    x0, y0 = org[0] + patch.dx, org[1] + patch.dy
+    ph, pw = patch.alpha.shape[:2]
+    # חיתוך לגבולות התמונה, כמו ש-putText עושה
+    cx0, cy0 = max(x0, 0), max(y0, 0)
+    cx1, cy1 = min(x0 + pw, image.shape[1]), min(y0 + ph, image.shape[0])
+    if cx0 >= cx1 or cy0 >= cy1:
+        return
+    alpha = patch.alpha[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+    roi = image[cy0:cy1, cx0:cx1]
+    color = np.array(color[:roi.shape[2]], dtype=np.uint16)
+    # roi*(255-a) + color*a, מעוגל – בלי float
+    blended = roi * (255 - alpha) + color * alpha + 127
+    roi[...] = (blended + (blended >> 8) + 1) >> 8
+
+
 class Img:
     def __init__(self):
         self.img = None
+        # מטמון מיזוג (premultiplied alpha) – מחושב פעם אחת בטעינה
+        self._blend_src = None
+        self._blend_mode = None
+        self._premul = None
+        self._inv_alpha = None
+        self._scratch = None
+        # מטמון רקע (גרדיאנט + לוח) עבור display_with_background
+        self._version = 0
+        self._composite = None
+        self._composite_src = None  # ה-self.img שממנו נבנה – השוואה ב-is, לא id() שעלול לחזור
+        self._composite_key = None
 
     def read(self, path: str | pathlib.Path,
              size: tuple[int, int] | None = None,
@@ -62,8 +215,50 @@ class Img:
         if self.img.shape[2] == 3:
             self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
 
+        self._prepare_blend()
+        self.touch()
         return self
 
+    def touch(self):
+        """Mark self.img as modified, so cached composites of it are rebuilt."""
+        self._version += 1
+
+    def _prepare_blend(self):
+        """
+        Precompute everything `draw_on` needs to composite this image.
+
+        For a translucent BGRA sprite we keep (all uint16, full 4 channels so
+        every numpy op runs on contiguous rows):
+          • `_premul`    – B,G,R,255 multiplied by alpha, +128 (rounding and the
+                           +1 the shift-division below needs)
+          • `_inv_alpha` – 255 - alpha, repeated over the 4 channels
+          • `_scratch`   – two reusable buffers, so blending allocates nothing
+        Fully opaque sprites (all our PNGs) become a plain copy and fully
+        transparent ones are skipped.
+        """
+        self._blend_src = self.img
+        self._premul = self._inv_alpha = self._scratch = None
+        img = self.img
+        if img is None or not hasattr(img, "shape") or img.ndim != 3 or img.shape[2] != 4:
+            self._blend_mode = "copy"
+            return
+
+        alpha = img[..., 3]
+        a_min, a_max = int(alpha.min()), int(alpha.max())
+        if a_min == 255:
+            self._blend_mode = "opaque"
+        elif a_max == 0:
+            self._blend_mode = "skip"
+        else:
+            self._blend_mode = "blend"
+            a16 = np.repeat(alpha.astype(np.uint16)[..., None], 4, axis=2)
+            src = img.astype(np.uint16)
+            src[..., 3] = 255
+            self._premul = src * a16 + 128
+            self._inv_alpha = 255 - a16
+            self._scratch = (np.empty(a16.shape, dtype=np.uint16),
+                             np.empty(a16.shape, dtype=np.uint16))
+
     def draw_on(self, other_img, x, y):
         if self.img is None:
             logger.warning("self.img is None")
@@ -87,15 +282,30 @@ class Img:
         if y + h > H or x + w > W:
             raise ValueError("Logo does not fit at the specified position.")
 
+        if self._blend_src is not self.img:
+            # self.img הוחלף מבחוץ (למשל clone) – חשב מחדש את המטמון
+            self._prepare_blend()
+
         roi = other_img.img[y:y + h, x:x + w]
 
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
-        else:
+        mode = self._blend_mode
+        if mode == "blend":
+            # out = (dst * (255 - a) + src * a + 127) // 255, בשלמים בלבד.
+            # with x = that numerator + 1 (<= 65153): x // 255 == (x + (x >> 8)) >> 8
+            acc, tmp = self._scratch
+            np.multiply(roi, self._inv_alpha, out=acc)
+            acc += self._premul
+            np.right_shift(acc, 8, out=tmp)
+            acc += tmp
+            acc >>= 8
+            np.copyto(roi, acc, casting="unsafe")
+        elif mode == "opaque":
+            roi[...] = self.img
+        elif mode == "copy":
             other_img.img[y:y + h, x:x + w] = self.img
+        else:
+            return
+        other_img.touch()
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None:
@@ -103,6 +313,7 @@ class Img:
         cv2.putText(self.img, txt, (x, y),
                     cv2.FONT_HERSHEY_SIMPLEX, font_size,
                     color, thickness, cv2.LINE_AA)
+        self.touch()
 
     def show(self):
         if self.img is None:
@@ -117,85 +328,26 @@ class Img:
             raise ValueError("Image not loaded.")
         cv2.imshow(window_name, self.img)
 
-    def display_with_background(self, window_name="Game Window", background_scale=1.3, gradient_colors=None, auto_resize_window=True, max_window_size=None, cursors_info=None, score_info=None, moves_info=None, player_names=None):
-        """Display the image with a background gradient."""
+    def display_with_background(self, window_name="Game Window", background_scale=1.3, gradient_colors=None, auto_resize_window=True, max_window_size=None, cursors_info=None, score_info=None, moves_info=None, player_names=None, *, board_cells):
+        """Display the image with a background gradient. board_cells = (W_cells, H_cells) of the board in self.img."""
         if self.img is None:
             raise ValueError("Image not loaded.")
-        
-        # קבל גודל התמונה הנוכחית
-        img_height, img_width = self.img.shape[:2]
-        
-        # חשב גודל הרקע - הרחב יותר כדי לתת מקום לטבלת המהלכים
-        bg_width = int(img_width * background_scale) + 400  # הוסף 400 פיקסלים רוחב נוסף
-        bg_height = int(img_height * background_scale)
-        
-        # בדוק אם צריך להקטין בגלל גודל המסך
-        if max_window_size is None:
-            max_window_size = (1200, 900)  # גודל מקסימלי סביר
-        
-        max_width, max_height = max_window_size
-        if bg_width > max_width or bg_height > max_height:
-            # חשב יחס קנה מידה כדי להתאים לחלון
-            scale_w = max_width / bg_width
-            scale_h = max_height / bg_height
-            scale = min(scale_w, scale_h)
-            
-            bg_width = int(bg_width * scale)
-            bg_height = int(bg_height * scale)
-            img_width = int(img_width * scale)
-            img_height = int(img_height * scale)
-            
-            # שנה גודל התמונה המקורית
-            resized_img = cv2.resize(self.img, (img_width, img_height))
-        else:
-            resized_img = self.img
-        
-        # צבעי גרדיאנט ברירת מחדל (אפור כהה לאפור בהיר)
-        if gradient_colors is None:
-            gradient_colors = {
-                'top': [50, 50, 50],      # אפור כהה למעלה (BGR)
-                'bottom': [120, 120, 120] # אפור בהיר למטה (BGR)
-            }
-        
-        # יצירת רקע עם גרדיאנט
-        background = np.zeros((bg_height, bg_width, 3), dtype=np.uint8)
-        
-        for y in range(bg_height):
-            # חישוב אינטנסיביות לפי מיקום Y
-            ratio = y / bg_height
-            
-            # מיזוג צבעים
-            color = [
-                int(gradient_colors['top'][i] * (1 - ratio) + gradient_colors['bottom'][i] * ratio)
-                for i in range(3)
-            ]
-            
-            background[y, :] = color
-        
-        # חישוב מיקום למרכז התמונה על הרקע
-        center_x = (bg_width - img_width) // 2
-        center_y = (bg_height - img_height) // 2
-        
-        # הצבת התמונה על הרקע
-        if resized_img.shape[2] == 4:  # תמונה עם שקיפות
-            # טיפול בשקיפות
-            alpha = resized_img[:, :, 3] / 255.0
-            for c in range(3):
-                background[center_y:center_y + img_height, center_x:center_x + img_width, c] = \
-                    (1 - alpha) * background[center_y:center_y + img_height, center_x:center_x + img_width, c] + \
-                    alpha * resized_img[:, :, c]
-        else:
-            # ללא שקיפות - פשוט העתק
-            background[center_y:center_y + img_height, center_x:center_x + img_width] = resized_img
-        
+
+        layout = background_layout(self.img.shape[:2], background_scale, max_window_size)
+        bg_width, bg_height, img_width, img_height, center_x, center_y = layout
+
+        # הרקע + הלוח מחושבים מחדש רק כשהתמונה או גודל החלון משתנים
+        composite = self._background_composite(layout, gradient_colors)
+        background = _frame_buffer(composite.shape)
+        np.copyto(background, composite)
+
         # התאם את גודל החלון לתמונה
         if auto_resize_window:
-            cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-            cv2.resizeWindow(window_name, bg_width, bg_height)
+            fit_window(window_name, bg_width, bg_height)
         
         # ציור הסמנים על הרקע הסופי
         if cursors_info:
-            self._draw_cursors_on_background(background, cursors_info, center_x, center_y, img_width, img_height)
+            self._draw_cursors_on_background(background, cursors_info, center_x, center_y, img_width, img_height, board_cells)
         
         # ציור הניקוד על הרקע
         if score_info:
@@ -208,11 +360,48 @@ class Img:
         # הצגת הרקע עם התמונה
         cv2.imshow(window_name, background)
 
-    def _draw_cursors_on_background(self, background, cursors_info, board_x, board_y, board_width, board_height):
-        """Draw cursors on the final background image."""
+    def _background_composite(self, layout, gradient_colors=None) -> np.ndarray:
+        """
+        The board centred on the gradient, cached until self.img or the layout changes.
+
+        Opaque boards are copied as is. Translucent pixels are blended in
+        integers and rounded to nearest, while the old float loop truncated,
+        so they may differ from it by one level per channel.
+        """
+        key = (self._version, layout, _gradient_key(gradient_colors))
+        if self._composite_src is self.img and self._composite_key == key:
+            return self._composite
+
+        bg_width, bg_height, img_width, img_height, center_x, center_y = layout
+        if (img_height, img_width) != self.img.shape[:2]:
+            resized_img = cv2.resize(self.img, (img_width, img_height))
+        else:
+            resized_img = self.img
+
+        background = gradient_background(bg_height, bg_width, gradient_colors).copy()
+        roi = background[center_y:center_y + img_height, center_x:center_x + img_width]
+        if resized_img.shape[2] == 4:
+            alpha = resized_img[..., 3]
+            if alpha.min() == 255:
+                roi[...] = resized_img[..., :3]
+            else:
+                # מיזוג בשלמים עם עיגול – (bg * (255 - a) + src * a + 127) // 255
+                a16 = alpha.astype(np.uint16)[..., None]
+                mixed = roi * (255 - a16) + resized_img[..., :3] * a16 + 127
+                roi[...] = mixed // 255
+        else:
+            roi[...] = resized_img
+
+        self._composite = background
+        self._composite_src = self.img
+        self._composite_key = key
+        return background
+
+    def _draw_cursors_on_background(self, background, cursors_info, board_x, board_y, board_width, board_height, board_cells):
+        """Draw cursors on the final background image. board_cells = (W_cells, H_cells)."""
         # חישוב גודל משבצת
-        cell_width = board_width // 8
-        cell_height = board_height // 8
+        cell_width = board_width // board_cells[0]
+        cell_height = board_height // board_cells[1]
         
         # ציור סמן שחקן 1 (אדום זוהר) - מקשי מספרים
         if cursors_info.get('player1_cursor'):
@@ -262,17 +451,17 @@ class Img:
         
         # ניקוד שחקן 1 (לבן) - למטה
         white_text = f"{player1_name} (WHITE): {white_score}"
-        text_size = cv2.getTextSize(white_text, font, font_scale, thickness)[0]
+        text_size = text_patch(white_text, font, font_scale, thickness).size
         white_x = (bg_width - text_size[0]) // 2
         white_y = bg_height - 20
-        cv2.putText(background, white_text, (white_x, white_y), font, font_scale, (255, 255, 255), thickness)
+        draw_text(background, white_text, (white_x, white_y), font, font_scale, (255, 255, 255), thickness)
         
         # ניקוד שחקן 2 (שחור) - למעלה  
         black_text = f"{player2_name} (BLACK): {black_score}"
-        text_size = cv2.getTextSize(black_text, font, font_scale, thickness)[0]
+        text_size = text_patch(black_text, font, font_scale, thickness).size
         black_x = (bg_width - text_size[0]) // 2
         black_y = 30
-        cv2.putText(background, black_text, (black_x, black_y), font, font_scale, (255, 255, 255), thickness)
+        draw_text(background, black_text, (black_x, black_y), font, font_scale, (255, 255, 255), thickness)
 
     def _draw_moves_history(self, background, moves_info, bg_width, bg_height, img_width):
         """Draw moves history on the background."""
@@ -299,27 +488,27 @@ class Img:
         start_y_white = 120
         
         white_title = "WHITE MOVES:"
-        cv2.putText(background, white_title, (start_x_white, start_y_white), 
-                   font, font_scale, (255, 255, 255), thickness)
+        draw_text(background, white_title, (start_x_white, start_y_white), 
+               font, font_scale, (255, 255, 255), thickness)
         
         recent_white = white_moves[-max_moves_to_show:] if len(white_moves) > max_moves_to_show else white_moves
         for i, move in enumerate(recent_white):
             move_text = f"{len(white_moves) - len(recent_white) + i + 1}. {move['move']} ({move['time']})"
             y_pos = start_y_white + (i + 1) * line_height
-            cv2.putText(background, move_text, (start_x_white, y_pos), 
-                       font, font_scale, (200, 200, 200), thickness)
+            draw_text(background, move_text, (start_x_white, y_pos), 
+                   font, font_scale, (200, 200, 200), thickness)
         
         # תצוגת מהלכים של שחקן שחור (קרוב יותר ללוח)
         start_x_black = bg_width - 250  # קרוב עוד יותר ללוח
         start_y_black = 120
         
         black_title = "BLACK MOVES:"
-        cv2.putText(background, black_title, (start_x_black, start_y_black), 
-                   font, font_scale, (255, 255, 255), thickness)
+        draw_text(background, black_title, (start_x_black, start_y_black), 
+               font, font_scale, (255, 255, 255), thickness)
         
         recent_black = black_moves[-max_moves_to_show:] if len(black_moves) > max_moves_to_show else black_moves
         for i, move in enumerate(recent_black):
             move_text = f"{len(black_moves) - len(recent_black) + i + 1}. {move['move']} ({move['time']})"
             y_pos = start_y_black + (i + 1) * line_height
-            cv2.putText(background, move_text, (start_x_black, y_pos), 
-                       font, font_scale, (200, 200, 200), thickness)
+            draw_text(background, move_text, (start_x_black, y_pos), 
+                   font, font_scale, (200, 200, 200), thickness)
@@ -0,0 +1,61 @@
+"""
+בדיקות ל-AnimationClip – switch_to_state מחליף clip מוכן בלי לגשת לדיסק
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import builtins
+import cv2
+import numpy as np
+import pytest
+
+from Board import Board
+from Graphics import Graphics
+from PieceFactory import PieceFactory
+
+
+def _piece(tmp_path):
+    states = {"idle": (6, True, 2), "move": (12, True, 3), "jump": (8, False, 4)}
+    for name, (fps, loop, count) in states.items():
+        folder = tmp_path / "PX" / "states" / name / "sprites"
+        folder.mkdir(parents=True)
+        for i in range(count):
+            cv2.imwrite(str(folder / f"{i}.png"), np.full((8, 8, 4), 50 + i, dtype=np.uint8))
+        cfg = {"graphics": {"frames_per_sec": fps, "is_loop": loop},
+               "physics": {"next_state_when_finished": "idle"}}
+        (folder.parent / "config.json").write_text(json.dumps(cfg))
+    (tmp_path / "PX" / "moves.txt").write_text("1,0\n")
+    return tmp_path
+
+
+def test_switch_to_state_uses_precompiled_clips(tmp_path, monkeypatch):
+    factory = PieceFactory(Board(80, 80, 1, 1, 8, 8, None), _piece(tmp_path))
+    graphics = factory.create_piece("PX", (0, 0))._state.graphics
+
+    def no_io(*args, **kwargs):
+        raise AssertionError("disk access on the hot path")
+    monkeypatch.setattr(builtins, "open", no_io)
+    monkeypatch.setattr(cv2, "imread", no_io)
+
+    graphics.switch_to_state("move")
+    assert (len(graphics.frames), graphics.fps, graphics.loop) == (3, 12, True)
+    graphics.switch_to_state("jump")
+    assert (len(graphics.frames), graphics.fps, graphics.loop) == (4, 8, False)
+    assert graphics.frames is graphics.clips["jump"].frames
+    graphics.switch_to_state("unknown")  # מצב לא מוכר → idle
+    assert graphics.frames is graphics.clips["idle"].frames
+
+
+def test_standalone_graphics_compiles_clip_once(tmp_path, monkeypatch):
+    root = _piece(tmp_path)
+    graphics = Graphics(root / "PX" / "states" / "idle" / "sprites", board=None)
+    graphics.switch_to_state("move")
+    assert graphics.fps == 12
+
+    monkeypatch.setattr(builtins, "open", lambda *a, **kw: pytest.fail("config re-read"))
+    graphics.copy().switch_to_state("move")
+    graphics.switch_to_state("move")
+    assert len(graphics.frames) == 3
@@ -0,0 +1,77 @@
+"""
+בדיקות ל-AssetBundle – קומפילציה, טעינה ממופה ונפילה חזרה לתיקיות
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from AssetBundle import AssetBundle, compile_bundle
+from Board import Board
+from FrameStore import FRAME_STORE
+from PieceFactory import PieceFactory
+
+
+def _pieces(tmp_path):
+    root = tmp_path / "pieces"
+    for name, (fps, loop, count, nxt) in {"idle": (6, True, 2, "idle"), "move": (12, True, 3, "idle")}.items():
+        folder = root / "PX" / "states" / name / "sprites"
+        folder.mkdir(parents=True)
+        for i in range(count):
+            cv2.imwrite(str(folder / f"{i}.png"), np.full((8, 8, 4), 40 * i + 30, dtype=np.uint8))
+        cfg = {"graphics": {"frames_per_sec": fps, "is_loop": loop},
+               "physics": {"speed_m_per_sec": 1.5, "next_state_when_finished": nxt}}
+        (folder.parent / "config.json").write_text(json.dumps(cfg))
+    (root / "PX" / "moves.txt").write_text("-1,0:non_capture\n-1,1:capture\n")
+    return root
+
+
+def _describe(template):
+    move = template.transitions["move"]
+    return (template.moves.moves, move.graphics.fps, move.transitions["arrived"].name,
+            [frame.img.tolist() for frame in move.graphics.frames])
+
+
+def test_bundle_matches_folders_without_decoding(tmp_path, monkeypatch):
+    root = _pieces(tmp_path)
+    board = Board(80, 80, 1, 1, 8, 8, None)
+    from_folders = _describe(PieceFactory(board, root).templates["PX"])
+
+    path = compile_bundle(root)
+    bundle = AssetBundle(path)
+    assert bundle.size == (80, 80) and list(bundle.pieces) == ["PX"]
+
+    FRAME_STORE.clear()
+    monkeypatch.setattr(cv2, "imread", lambda *a: (_ for _ in ()).throw(AssertionError("decoded a PNG")))
+    factory = PieceFactory(board, root)
+    assert _describe(factory.templates["PX"]) == from_folders
+    frame = factory.templates["PX"].graphics.frames[0].img
+    assert not frame.flags.writeable and not frame.flags.owndata  # view לתוך הקובץ
+
+
+def test_invalid_bundle_falls_back_to_folders(tmp_path):
+    root = _pieces(tmp_path)
+    (root / "pieces.bundle").write_bytes(b"not a bundle")
+    assert AssetBundle.open(root / "pieces.bundle") is None
+    factory = PieceFactory(Board(80, 80, 1, 1, 8, 8, None), root)
+    assert len(factory.templates["PX"].transitions["move"].graphics.frames) == 3
+
+
+def test_stale_bundle_warns_and_loads_folders(tmp_path, caplog):
+    root = _pieces(tmp_path)
+    bundle_path = compile_bundle(root)
+    assert AssetBundle(bundle_path).matches(root)
+
+    cfg_path = root / "PX" / "states" / "move" / "config.json"
+    cfg = json.loads(cfg_path.read_text())
+    cfg["graphics"]["frames_per_sec"] = 24
+    cfg_path.write_text(json.dumps(cfg))
+    os.utime(cfg_path, ns=(1, 1))  # גם אם הגודל לא היה משתנה
+
+    factory = PieceFactory(Board(80, 80, 1, 1, 8, 8, None), root)
+    assert factory.templates["PX"].transitions["move"].graphics.fps == 24
+    assert "stale" in caplog.text and "PX/states/move/config.json" in caplog.text
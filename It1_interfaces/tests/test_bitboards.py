@@ -0,0 +1,71 @@
+"""
+בדיקות לשכבת ה-bitboards – מסכות תפוסה וטבלאות התקפה
+"""
+
+import sys
+import os
+import pathlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bitboards import AttackTables, Bitboards
+from BoardIndex import BoardIndex, PieceList
+from Moves import Moves
+from Physics import Physics
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+class DummyState:
+    def __init__(self, physics):
+        self.physics = physics
+
+
+class DummyPiece:
+    def __init__(self, piece_id, cell):
+        self.piece_id = piece_id
+        self._state = DummyState(Physics(cell, DummyBoard(), piece_id=piece_id))
+
+
+def cells(bitboards, mask):
+    return {bitboards.cell(sq) for sq in range(bitboards.width * bitboards.height) if mask >> sq & 1}
+
+
+def test_masks_follow_board_index():
+    index = BoardIndex(8, 8)
+    knight, pawn = DummyPiece("NW0", (1, 7)), DummyPiece("PB0", (2, 5))
+    PieceList([knight, pawn], index)
+    bb = index.bitboards
+
+    assert cells(bb, bb.occupied) == {(1, 7), (2, 5)}
+    assert cells(bb, bb.pieces_mask('W', 'N')) == {(1, 7)}
+
+    knight._state.physics.cell = (2, 5)  # הגעה למשבצת של החיל
+    assert cells(bb, bb.colors['W']) == {(2, 5)}
+    assert cells(bb, bb.colors['B']) == {(2, 5)}
+    assert bb.occupied == bb.bit(2, 5)
+
+
+def test_tables_compiled_from_moves_files():
+    tables = AttackTables(8, 8)
+    bb = Bitboards(8, 8)
+    knight = tables.move_table(Moves.from_file(PIECES_ROOT / "NW" / "moves.txt"))
+    rook = tables.move_table(Moves.from_file(PIECES_ROOT / "RW" / "moves.txt"))
+    pawn = tables.move_table(Moves.from_file(PIECES_ROOT / "PW" / "moves.txt"))
+
+    assert knight.leaper and not rook.leaper
+    assert cells(bb, knight.all[bb.square(0, 0)]) == {(1, 2), (2, 1)}
+    assert pawn.move_type(bb.square(4, 6), bb.square(4, 4)) == "1st"
+    assert pawn.move_type(bb.square(4, 6), bb.square(5, 5)) == "capture"
+    assert pawn.move_type(bb.square(4, 6), bb.square(4, 7)) is None
+
+    occupied = bb.bit(0, 3) | bb.bit(5, 0)
+    assert tables.first_blocker((0, 0), (0, 7), occupied) == (0, 3)
+    assert tables.first_blocker((0, 7), (0, 0), occupied) == (0, 3)
+    assert tables.first_blocker((0, 0), (4, 0), occupied) is None
+    attacked = cells(bb, tables.attacks(rook, bb.square(0, 0), occupied))
+    assert attacked == {(0, 1), (0, 2), (0, 3)} | {(x, 0) for x in range(1, 6)}
@@ -0,0 +1,63 @@
+"""
+בדיקות ל-BoardIndex – רשת תפוסה ו-piece_id → כלי שמסונכרנים עם Physics.cell
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BoardIndex import BoardIndex, PieceList
+from Command import Command
+from Physics import Physics
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+class DummyState:
+    def __init__(self, physics):
+        self.physics = physics
+
+
+class DummyPiece:
+    def __init__(self, piece_id, cell):
+        self.piece_id = piece_id
+        self._state = DummyState(Physics(cell, DummyBoard(), piece_id=piece_id))
+
+
+def test_grid_follows_physics_cell():
+    index = BoardIndex(8, 8)
+    rook, pawn = DummyPiece("RW0", (0, 7)), DummyPiece("PB0", (0, 1))
+    pieces = PieceList([rook, pawn], index)
+
+    assert index.piece_at(0, 7) is rook
+    assert index.get("PB0") is pawn
+
+    physics = rook._state.physics
+    physics.reset(Command(timestamp=0, piece_id="RW0", type="move", target=(0, 1), params=None))
+    assert index.piece_at(0, 7) is rook  # עדיין בדרך
+    physics.update(10_000)
+    assert index.piece_at(0, 7) is None
+    assert index.pieces_at(0, 1) == (pawn, rook)  # התוקף והקורבן חולקים משבצת עד התפיסה
+
+    pieces.remove(pawn)
+    assert index.piece_at(0, 1) is rook
+    assert index.get("PB0") is None
+    assert pawn._state.physics.on_cell_change is None
+
+
+def test_reassign_and_external_append_keep_index():
+    index = BoardIndex(8, 8)
+    pieces = PieceList([DummyPiece("KW0", (4, 7))], index)
+    queen = DummyPiece("QW0", (3, 3))
+    pieces.append(queen)
+    assert index.piece_at(3, 3) is queen
+
+    pieces = PieceList([queen], index)  # כמו game.pieces = [...]
+    assert index.piece_at(4, 7) is None
+    assert len(index) == 1
+    queen._state.physics.cell = (9, 9)  # מחוץ ללוח – לא בשום משבצת
+    assert index.piece_at(3, 3) is None
+    assert index.get("QW0") is queen
@@ -0,0 +1,63 @@
+"""
+בדיקות ללוח שאינו 8x8 – כל המידות של Game נלקחות מ-Board.W_cells/H_cells
+"""
+
+import sys
+import os
+import pathlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Board import Board, square_name
+from Game import Game
+from Layout import create_pieces, standard_layout
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def _game(width, height):
+    board = Board(80, 80, 1, 1, width, height, None)
+    factory = PieceFactory(board, PIECES_ROOT, lazy=True)
+    game = Game([], board, piece_factory=factory)
+    game.pieces = create_pieces(factory, standard_layout(width, height), game.user_input_queue)
+    game.game_time_ms = lambda: 0
+    return game
+
+
+def test_layout_fills_the_board_width():
+    layout = standard_layout(10, 12, pawn_rows=2)
+    assert len(layout) == 10 * 6
+    assert layout[:10] == [(f"{k}B", (x, 0)) for x, k in enumerate("RNBQKBNRRN")]
+    assert {cell[1] for p_type, cell in layout if p_type == "PW"} == {9, 10}
+    assert standard_layout() == standard_layout(8, 8, 1) and len(standard_layout()) == 32
+
+
+def test_cursor_notation_and_pawn_rows_follow_board_size():
+    game = _game(10, 12)
+    assert game.cursor_pos_player1 == [0, 11]
+    for _ in range(20):
+        game._move_cursor_player1(1, 1)
+        game._move_cursor_player2(-1, 1)
+    assert game.cursor_pos_player1 == [9, 11] and game.cursor_pos_player2 == [0, 11]
+
+    assert game._notation((0, 11)) == "a1" and game._notation((9, 0)) == "j12"
+    assert square_name((26, 0), 64) == "aa64" and game.board.square_name((4, 6)) == "e6"
+
+    pawn = game.board_index.piece_at(3, 10)
+    assert pawn.piece_id.startswith("PW")
+    assert game._is_valid_move(pawn, 3, 8, 1)  # צעד כפול מהשורה H-2
+    assert {tuple(cell) for cell in game.move_generator.targets(pawn).tolist()} == {(3, 9), (3, 8)}
+
+
+def test_black_promotes_on_the_last_row():
+    game = _game(10, 12)
+    pawn = game.board_index.piece_at(5, 1)
+    game.pieces.remove(game.board_index.piece_at(5, 11))
+    pawn._state.physics.place((5, 7))
+    game._check_pawn_promotion(pawn, (5, 7))  # 7 היא לא השורה האחרונה בלוח בגובה 12
+    assert pawn in game.board_index
+
+    pawn._state.physics.place((5, 11))
+    game._check_pawn_promotion(pawn, (5, 11))
+    assert pawn not in game.board_index
+    assert game.board_index.piece_at(5, 11).piece_id.startswith("QB")
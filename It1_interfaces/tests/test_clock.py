@@ -0,0 +1,114 @@
+"""
+בדיקות לשעונים של המשחק ולריצה headless – סימולציה דטרמיניסטית ומהירה
+"""
+
+import sys
+import os
+import pathlib
+import types
+
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Clock
+from Board import Board
+from Clock import FixedStepClock, ScaledClock, WallClock
+from Command import Command
+from Game import Game
+from Layout import create_pieces, standard_layout
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def test_fixed_step_clock_never_sleeps(monkeypatch):
+    monkeypatch.setattr(Clock.time, "sleep", lambda s: (_ for _ in ()).throw(AssertionError("slept")))
+    clock = FixedStepClock(step_ms=10, start_ms=5)
+    for _ in range(3):
+        clock.tick()
+    clock.advance(100)
+    assert clock.now_ms() == 135 and clock.ticks == 3
+
+
+def test_scaled_and_wall_clocks(monkeypatch):
+    now, slept = [50.0], []
+    monkeypatch.setattr(Clock.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(Clock.time, "sleep", slept.append)
+    clock = ScaledClock(10, frame_ms=20, start_ms=0)
+    now[0] += 1.5
+    assert clock.now_ms() == 15_000  # 1.5 שניות אמיתיות = 15 שניות משחק
+    clock.tick()
+    assert slept == [0.002]
+    assert WallClock().now_ms() == 51_500
+
+
+def _game(clock):
+    board = Board(80, 80, 1, 1, 8, 8, None)
+    factory = PieceFactory(board, PIECES_ROOT, lazy=True)
+    game = Game([], board, piece_factory=factory, clock=clock)
+    game.pieces = create_pieces(factory, standard_layout(), game.user_input_queue)
+    return game
+
+
+def _commands():
+    return [
+        Command(timestamp=100, piece_id="PW3", type="move", target=(3, 4)),
+        Command(timestamp=250, piece_id="PB4", type="move", target=(4, 3)),
+        Command(timestamp=400, piece_id="NW1", type="jump", target=(1, 7)),
+        Command(timestamp=7000, piece_id="PW3", type="move", target=(4, 3)),  # תפיסה אחרי המנוחה
+        Command(timestamp=7100, piece_id="QB0", type="move", target=(3, 4)),
+    ]
+
+
+def _state(game):
+    return game.state_hash(), sorted((p.piece_id, p._state.physics.cell, p._state.physics.pixel_pos, p._state.name)
+                                     for p in game.pieces)
+
+
+def _run():
+    game = _game(FixedStepClock(step_ms=16))
+    ticks = game.run_headless(_commands(), until_ms=20_000)
+    return (ticks, *_state(game), dict(game.score_tracker.score), game.clock.now_ms())
+
+
+def test_headless_run_replays_bit_identically():
+    first, second = _run(), _run()
+    assert first == second
+    ticks, _hash, pieces, score, now = first
+    assert ticks == 1250 and now == 20_000
+    assert "PB4" not in {piece_id for piece_id, *_ in pieces}  # נתפס
+    assert score["white"] == 1
+
+
+def test_headless_run_in_chunks_matches_one_run():
+    whole = _game(FixedStepClock(step_ms=16))
+    whole.run_headless(_commands(), until_ms=20_000)
+
+    chunked = _game(FixedStepClock(step_ms=16))
+    split_ms = 7_300  # PW3 באמצע התפיסה שהתחילה ב-7000
+    chunked.run_headless([c for c in _commands() if c.timestamp < split_ms], until_ms=split_ms)
+    assert chunked.board_index.get("PW3")._state.physics.moving
+    chunked.run_headless([c for c in _commands() if c.timestamp >= split_ms], until_ms=20_000)
+    assert _state(chunked) == _state(whole)
+
+
+def test_headless_run_never_touches_the_mixer(monkeypatch):
+    used = []
+    pygame = types.ModuleType("pygame")
+    pygame.__getattr__ = lambda name: used.append(name) or (_ for _ in ()).throw(AttributeError(name))
+    monkeypatch.setitem(sys.modules, "pygame", pygame)
+
+    game = _game(FixedStepClock(step_ms=16))
+    game.run_headless(_commands(), until_ms=20_000)  # מהלכים, מהלך נכשל ותפיסה
+    assert used == [] and game.sound
+    game.play_sound("move")
+    assert used == ["mixer"]
+
+    game = Game([], Board(80, 80, 1, 1, 8, 8, None), clock=FixedStepClock(), sound=False)
+    game.play_sound("win")
+    assert used == ["mixer"]
+
+
+def test_clock_is_abstract():
+    with pytest.raises(TypeError):
+        Clock.Clock()
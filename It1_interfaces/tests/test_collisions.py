@@ -0,0 +1,93 @@
+"""
+בדיקות ל-CollisionEngine – תפיסות באמצע תנועה
+"""
+
+import sys
+import os
+import pathlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Board import Board
+from Clock import FixedStepClock
+from Collisions import CollisionEngine
+from Command import Command
+from Game import Game
+from Layout import create_pieces
+from Physics import Physics
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+class DummyState:
+    def __init__(self, physics):
+        self.physics = physics
+
+
+class DummyPiece:
+    def __init__(self, piece_id, cell):
+        self.piece_id = piece_id
+        self._state = DummyState(Physics(cell, DummyBoard(), piece_id=piece_id))
+
+    def move(self, target, at_ms):
+        self._state.physics.reset(Command(timestamp=at_ms, piece_id=self.piece_id, type="move", target=target, params=None))
+
+
+def run(engine, pieces, until_ms, step_ms=16):
+    """כמו Game._resolve_collisions: כלי שנתפס יוצא מהמשחק."""
+    pieces, hits = list(pieces), []
+    for now in range(0, until_ms, step_ms):
+        for hit in engine.step(pieces, now):
+            pieces.remove(hit.loser)
+            hits.append(hit)
+    return hits
+
+
+def test_head_on_collision_goes_to_earlier_move():
+    white, black = DummyPiece("RW0", (2, 6)), DummyPiece("RB0", (2, 1))
+    white.move((2, 2), 0)
+    black.move((2, 5), 200)
+
+    hits = run(CollisionEngine(), [white, black], 3000)
+    assert len(hits) == 1
+    assert hits[0].winner is white and hits[0].loser is black
+    assert 1200 <= hits[0].time_ms <= 1250  # 5.4 - 0.004t = 0.5
+
+
+def test_crossing_paths_only_between_opponents():
+    white, black, friend = DummyPiece("RW0", (0, 4)), DummyPiece("RB0", (3, 1)), DummyPiece("RW1", (6, 1))
+    white.move((6, 4), 0)
+    black.move((3, 7), 0)
+    friend.move((6, 7), 0)  # נעה במקביל – לא נפגשת עם אף אחד
+
+    hits = run(CollisionEngine(), [white, black, friend], 3000, step_ms=50)
+    assert [(h.winner.piece_id, h.loser.piece_id) for h in hits] == [("RB0", "RW0")]  # תיקו – לפי piece_id
+
+    # חלון אחד גדול נותן אותה תוצאה כמו הרבה צעדים קטנים
+    (once,) = CollisionEngine().detect([white, black, friend], 0, 3000)
+    assert (once.winner, once.loser) == (hits[0].winner, hits[0].loser)
+    assert abs(once.time_ms - hits[0].time_ms) < 1e-6
+
+
+def test_game_checks_only_pieces_in_flight():
+    board = Board(80, 80, 1, 1, 8, 8, None)
+    factory = PieceFactory(board, PIECES_ROOT, lazy=True)
+    game = Game([], board, piece_factory=factory, clock=FixedStepClock(step_ms=16))
+    layout = [("RB", (0, 0)), ("KB", (4, 0)), ("KW", (4, 7)), ("RW", (0, 7))] + [("PB", (x, 1)) for x in range(5, 8)]
+    game.pieces = create_pieces(factory, layout, game.user_input_queue)
+    rook_b = game.board_index.get("RB0")
+
+    checked = []
+    detect = game.collisions.detect
+    game.collisions.detect = lambda pieces, a, b: checked.append(len(pieces)) or detect(pieces, a, b)
+    game.run_headless([Command(timestamp=0, piece_id="RW0", type="move", target=(0, 1)),
+                       Command(timestamp=200, piece_id="RB0", type="move", target=(0, 6))], until_ms=5000)
+
+    assert rook_b not in game.board_index  # נתפס באוויר – הצריח הלבן התחיל לנוע קודם
+    assert game.board_index.get("RW0")._state.physics.cell == (0, 1)
+    assert max(checked) == 2 and checked[-1] == 0 and not game._in_flight
@@ -0,0 +1,43 @@
+"""
+בדיקות ל-CommandPool ולרשומות הקומפקטיות (__slots__)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Command import ARRIVALS, Command, CommandPool
+from Physics import Physics
+from Piece import Piece
+from State import State
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+def test_pool_reuses_released_commands():
+    pool = CommandPool(limit=1)
+    first = pool.acquire(100, "PW0", "arrived", target=(1, 2))
+    assert (first.timestamp, first.piece_id, first.type, first.target, first.params) == (100, "PW0", "arrived", (1, 2), None)
+    pool.release(first)
+    pool.release(Command(0, "x", "arrived"))  # מעבר ל-limit – לא נשמר
+    assert len(pool) == 1
+
+    again = pool.acquire(250, "NB1", "arrived", target=(5, 5))
+    assert again is first and (again.timestamp, again.piece_id, again.target) == (250, "NB1", (5, 5))
+    assert pool.acquire(300, "NB1", "arrived") is not first  # ריקה – פקודה חדשה
+
+
+def test_arrival_comes_from_pool_and_records_have_no_dict():
+    physics = Physics((0, 0), DummyBoard(), piece_id="PW0")
+    physics.reset(Command(timestamp=0, piece_id="PW0", type="move", target=(0, 1)))
+    ARRIVALS.release(Command(0, None, "arrived"))
+    pooled = ARRIVALS._free[-1]
+    arrived = physics.update(10_000)
+    assert arrived is pooled and arrived.type == "arrived" and arrived.target == (0, 1)
+
+    state = State(None, None, physics)
+    for record in (arrived, physics, state, Piece("PW0", state)):
+        assert not hasattr(record, "__dict__")
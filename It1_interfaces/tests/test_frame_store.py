@@ -0,0 +1,121 @@
+"""
+בדיקות ל-FrameStore – פריימים משותפים בין עותקי Graphics
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+import pytest
+
+from FrameStore import FRAME_STORE, FrameStore
+from Graphics import Graphics
+from img import Img
+
+
+def _sprites(tmp_path, count=3):
+    folder = tmp_path / "idle" / "sprites"
+    folder.mkdir(parents=True)
+    for i in range(count):
+        cv2.imwrite(str(folder / f"{i}.png"), np.full((40, 40, 4), 20 * i + 10, dtype=np.uint8))
+    return folder
+
+
+def test_frames_loaded_once_per_folder(tmp_path, monkeypatch):
+    folder = _sprites(tmp_path)
+    store = FrameStore()
+    reads = []
+    original = cv2.imread
+    monkeypatch.setattr(cv2, "imread", lambda *a: reads.append(a) or original(*a))
+
+    frames = store.get(folder)
+    assert store.get(folder) is frames
+    assert store.get(folder / ".." / "sprites") is frames
+    assert len(frames) == 3 and len(reads) == 3
+    assert frames[1].img.shape == (80, 80, 4)
+    assert not frames[0].img.flags.writeable
+    assert store.nbytes() == 3 * 80 * 80 * 4
+
+
+def test_graphics_copies_share_frames_but_not_playback(tmp_path):
+    folder = _sprites(tmp_path)
+    gfx = Graphics(folder, board=None, loop=True, fps=2.0)
+    other = Graphics(folder, board=None, loop=True, fps=2.0)
+    clone = gfx.copy()
+    assert gfx.frames is other.frames is clone.frames is FRAME_STORE.get(folder)
+
+    clone.update(1)
+    clone.update(501)
+    assert clone.current_frame == 1
+    assert gfx.current_frame == 0
+    with pytest.raises(ValueError):
+        gfx.get_img().img[0, 0] = 0
+
+
+def test_parallel_preload_matches_serial_loading(tmp_path):
+    folders = []
+    for name in ("idle", "move", "jump"):
+        folder = tmp_path / name / "sprites"
+        folder.mkdir(parents=True)
+        for i in range(4):
+            cv2.imwrite(str(folder / f"{i}.png"), np.full((30, 20, 4), hash((name, i)) % 256, dtype=np.uint8))
+        folders.append(folder)
+
+    serial, parallel = FrameStore(), FrameStore()
+    serial.preload(folders, workers=1)
+    parallel.preload(folders + folders[:1], workers=4)
+    assert len(parallel) == 3
+    for folder in folders:
+        expected = [img.img for img in serial.get(folder)]
+        actual = [img.img for img in parallel.get(folder)]
+        assert len(actual) == 4
+        assert all(np.array_equal(a, e) for a, e in zip(actual, expected))
+        assert not actual[0].flags.writeable
+
+
+def test_lru_budget_evicts_least_recently_used(tmp_path):
+    folders = {}
+    for name in ("idle", "move", "jump"):
+        folder = folders[name] = tmp_path / name / "sprites"
+        folder.mkdir(parents=True)
+        cv2.imwrite(str(folder / "0.png"), np.zeros((10, 10, 4), dtype=np.uint8))
+    one_clip = 80 * 80 * 4
+
+    store = FrameStore(budget_bytes=2 * one_clip)
+    pinned = Img()
+    pinned.img = np.zeros((80, 80, 4), dtype=np.uint8)
+    store.put(tmp_path / "bundle", (80, 80), (pinned,))
+
+    idle = store.get(folders["idle"])
+    store.get(folders["move"])
+    assert store.get(folders["idle"]) is idle        # idle עכשיו הכי חדש
+    store.get(folders["jump"])                       # move נזרק
+    assert store.key(folders["move"], (80, 80)) not in store
+    assert store.get(folders["idle"]) is idle
+    assert store.get(tmp_path / "bundle")[0] is pinned
+    assert store.nbytes() == 2 * one_clip and store.evictions == 1
+
+    store.set_budget(one_clip)
+    assert len(store) == 2                           # הכי חדש + המוצמד
+    assert store.get(folders["move"])[0].img.shape == (80, 80, 4)   # נטען מחדש
+
+
+def test_lazy_factory_decodes_only_warm_states(tmp_path):
+    from Board import Board
+    from PieceFactory import PieceFactory
+    for name in ("idle", "move", "long_rest"):
+        folder = tmp_path / "PX" / "states" / name / "sprites"
+        folder.mkdir(parents=True)
+        cv2.imwrite(str(folder / "0.png"), np.zeros((10, 10, 4), dtype=np.uint8))
+    (tmp_path / "PX" / "moves.txt").write_text("1,0\n")
+
+    FRAME_STORE.clear()
+    factory = PieceFactory(Board(80, 80, 1, 1, 8, 8, None), tmp_path, lazy=True)
+    clips = factory.templates["PX"].graphics.clips
+    assert clips["idle"].frame_key in FRAME_STORE and clips["move"].frame_key in FRAME_STORE
+    assert clips["long_rest"].frame_key not in FRAME_STORE
+
+    factory.warm_up(["long_rest"])
+    assert clips["long_rest"].frame_key in FRAME_STORE
@@ -0,0 +1,144 @@
+"""
+בדיקות למיזוג הספרייטים ב-Img.draw_on
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+import img
+from img import Img, draw_text, gradient_background, text_patch
+
+
+def _make(arr):
+    img = Img()
+    img.img = arr
+    return img
+
+
+def test_draw_on_matches_float_blend():
+    rng = np.random.default_rng(1)
+    sprite_arr = rng.integers(0, 256, size=(8, 8, 4), dtype=np.uint8)
+    board_arr = rng.integers(0, 256, size=(20, 20, 4), dtype=np.uint8)
+
+    # חישוב ייחוס ב-float, כמו המימוש הישן
+    roi = board_arr[5:13, 3:11].astype(np.float64)
+    a = sprite_arr[..., 3:4] / 255.0
+    expected = roi[..., :3] * (1 - a) + sprite_arr[..., :3] * a
+
+    board = _make(board_arr.copy())
+    _make(sprite_arr).draw_on(board, 3, 5)
+
+    got = board.img[5:13, 3:11, :3].astype(np.float64)
+    assert np.abs(got - expected).max() <= 1.0
+    # מחוץ לאזור הספרייט שום דבר לא השתנה
+    assert np.array_equal(board.img[:5], board_arr[:5])
+
+
+def test_draw_on_opaque_and_transparent():
+    board = _make(np.zeros((10, 10, 4), dtype=np.uint8))
+
+    opaque = np.full((4, 4, 4), 200, dtype=np.uint8)
+    opaque[..., 3] = 255
+    _make(opaque).draw_on(board, 0, 0)
+    assert (board.img[:4, :4, :3] == 200).all()
+
+    clear = np.full((4, 4, 4), 90, dtype=np.uint8)
+    clear[..., 3] = 0
+    _make(clear).draw_on(board, 0, 0)
+    assert (board.img[:4, :4, :3] == 200).all()
+
+
+def test_draw_on_picks_up_replaced_image():
+    board = _make(np.zeros((6, 6, 4), dtype=np.uint8))
+    sprite = _make(np.full((2, 2, 4), 255, dtype=np.uint8))
+    sprite.draw_on(board, 0, 0)
+
+    sprite.img = np.full((2, 2, 4), 10, dtype=np.uint8)
+    sprite.img[..., 3] = 255
+    sprite.draw_on(board, 0, 0)
+    assert (board.img[:2, :2, :3] == 10).all()
+
+
+def test_gradient_background_is_cached_and_matches_loop():
+    colors = {'top': [50, 50, 50], 'bottom': [120, 120, 120]}
+    bg = gradient_background(30, 7, colors)
+    assert gradient_background(30, 7, colors) is bg
+    assert not bg.flags.writeable
+
+    for y in range(30):
+        ratio = y / 30
+        row = [int(colors['top'][i] * (1 - ratio) + colors['bottom'][i] * ratio) for i in range(3)]
+        assert (bg[y] == row).all()
+
+
+def test_background_composite_rebuilt_only_on_change():
+    board = _make(np.full((20, 20, 4), 255, dtype=np.uint8))
+    layout = (60, 40, 20, 20, 20, 10)
+    first = board._background_composite(layout)
+    assert board._background_composite(layout) is first
+
+    _make(np.zeros((2, 2, 4), dtype=np.uint8)).draw_on(board, 0, 0)  # שקוף לגמרי – לא נוגע
+    assert board._background_composite(layout) is first
+
+    opaque = np.zeros((2, 2, 4), dtype=np.uint8)
+    opaque[..., 3] = 255
+    _make(opaque).draw_on(board, 0, 0)
+    second = board._background_composite(layout)
+    assert second is not first
+    assert (second[10:12, 20:22] == 0).all()
+
+    # self.img הוחלף מבחוץ (כמו Board.clone) – בלי touch, ולרוב באותו id של המערך שנאסף
+    board.img = None
+    board.img = np.zeros((20, 20, 4), dtype=np.uint8)
+    board.img[..., 3] = 255
+    third = board._background_composite(layout)
+    assert third is not second and (third[10:30, 20:40] == 0).all()
+
+
+def test_background_composite_within_one_level_of_float_loop():
+    rng = np.random.default_rng(2)
+    board_arr = rng.integers(0, 256, size=(20, 20, 4), dtype=np.uint8)
+    board_arr[:5, :, 3] = 255
+    layout = (60, 40, 20, 20, 20, 10)
+    got = _make(board_arr)._background_composite(layout)
+
+    # הלולאה הישנה: מיזוג ב-float והשמה ל-uint8 (קיטוע)
+    expected = gradient_background(40, 60).copy()
+    roi = expected[10:30, 20:40]
+    a = board_arr[..., 3:4] / 255.0
+    roi[...] = (1 - a) * roi + a * board_arr[..., :3]
+
+    diff = np.abs(got.astype(np.int16) - expected)
+    assert diff.max() <= 1
+    assert not diff[10:15, 20:40].any()  # אטום – זהה בדיוק
+    assert np.array_equal(got[:10], expected[:10])
+
+
+def test_draw_text_matches_put_text_and_is_cached():
+    rng = np.random.default_rng(1)
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    for text, scale, thickness, org in [("PLAYER 1 (WHITE): 3", 0.8, 2, (40, 90)),
+                                        ("1. P (6, 0) -> (4, 0) (12:00:01)", 0.4, 1, (20, 30)),
+                                        ("clipped", 1.0, 1, (150, 8))]:
+        expected = rng.integers(0, 255, (100, 200, 3), dtype=np.uint8)
+        actual = expected.copy()
+        cv2.putText(expected, text, org, font, scale, (200, 180, 255), thickness)
+        draw_text(actual, text, org, font, scale, (200, 180, 255), thickness)
+        assert np.abs(actual.astype(int) - expected).max() <= 1
+        assert text_patch(text, font, scale, thickness) is text_patch(text, font, scale, thickness)
+        assert text_patch(text, font, scale, thickness).size == cv2.getTextSize(text, font, scale, thickness)[0]
+
+
+def test_text_cache_is_bounded():
+    # שורת יומן חדשה לכל מהלך (עם זמן) – המטמון נשאר בגודל קבוע, והאחרונות בו
+    for i in range(img.TEXT_CACHE_SIZE + 300):
+        text_patch(f"{i}. P (6, 0) -> (4, 0) (12:{i // 60:02}:{i % 60:02})", cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)
+    assert img._rasterize.cache_info().currsize == img.TEXT_CACHE_SIZE
+    latest = f"{i}. P (6, 0) -> (4, 0) (12:{i // 60:02}:{i % 60:02})"
+    hits = img._rasterize.cache_info().hits
+    text_patch(latest, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)
+    assert img._rasterize.cache_info().hits == hits + 1
@@ -0,0 +1,43 @@
+"""
+בדיקות ל-MaterialTracker – חומר ומלכים שמתעדכנים עם כל הוספה/הסרה של כלי
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BoardIndex import BoardIndex, PieceList
+from Observer.ScoreTracker import ScoreTracker
+
+
+class DummyPiece:
+    def __init__(self, piece_id, cell):
+        self.piece_id = piece_id
+        self.board_position = cell
+
+
+def test_captures_and_promotion_update_material():
+    index = BoardIndex(8, 8)
+    white_king, black_king = DummyPiece("KW_4_7", (4, 7)), DummyPiece("KB0", (4, 0))  # id לא סטנדרטי
+    pawn, rook = DummyPiece("PW3", (3, 1)), DummyPiece("RB0", (0, 0))
+    pieces = PieceList([white_king, black_king, pawn, rook], index)
+    material = index.material
+    assert material.material == {"white": 1, "black": 5} and material.balance() == -4
+    assert not material.decided and material.winner is None
+
+    pieces.remove(pawn)  # קידום: חייל יוצא, מלכה נכנסת
+    pieces.append(DummyPiece("QW0", (3, 0)))
+    pieces.remove(rook)  # תפיסה
+    assert material.material == {"white": 9, "black": 0}
+    assert ScoreTracker(material).material_balance() == 9
+
+    pieces.remove(black_king)
+    assert material.decided and material.winner == "white"
+
+
+def test_no_kings_is_decided_without_winner():
+    index = BoardIndex(8, 8)
+    pieces = PieceList([DummyPiece("PW0", (0, 6)), DummyPiece("PB0", (0, 1))], index)
+    assert index.material.decided and index.material.winner is None
+    pieces.clear()
+    assert len(index.material) == 0 and index.material.material == {"white": 0, "black": 0}
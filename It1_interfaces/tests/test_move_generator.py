@@ -0,0 +1,76 @@
+"""
+בדיקות ל-MoveGenerator – רשימת מהלכים חוקיים כמערך
+"""
+
+import sys
+import os
+import pathlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bitboards import AttackTables
+from BoardIndex import BoardIndex, PieceList
+from MoveGenerator import MoveGenerator
+from Moves import Moves
+from Physics import Physics
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+class DummyState:
+    def __init__(self, moves, physics):
+        self.moves, self.physics = moves, physics
+        self.cooldown_end_ms = 0
+
+    def can_transition(self, now_ms):
+        return now_ms >= self.cooldown_end_ms
+
+
+class DummyPiece:
+    def __init__(self, piece_id, cell):
+        self.piece_id = piece_id
+        moves = Moves.from_file(PIECES_ROOT / piece_id[:2] / "moves.txt")
+        self._state = DummyState(moves, Physics(cell, DummyBoard(), piece_id=piece_id))
+
+
+class DummyGame:
+    def __init__(self, pieces):
+        self.board_index = BoardIndex(8, 8)
+        self.attack_tables = AttackTables(8, 8)
+        self.jumping_pieces = set()
+        self.pieces = PieceList(pieces, self.board_index)
+
+    def game_time_ms(self):
+        return 0
+
+
+def targets(generator, piece):
+    return {tuple(cell) for cell in generator.targets(piece).tolist()}
+
+
+def test_targets_respect_blocking_and_pawn_rules():
+    rook, pawn, enemy = DummyPiece("RW0", (0, 7)), DummyPiece("PW0", (1, 6)), DummyPiece("PB0", (0, 4))
+    game = DummyGame([rook, pawn, enemy, DummyPiece("NB0", (2, 5))])
+    generator = MoveGenerator(game)
+
+    assert targets(generator, rook) == {(0, 6), (0, 5), (0, 4)} | {(x, 7) for x in range(1, 8)}
+    assert targets(generator, pawn) == {(1, 5), (1, 4), (2, 5)}  # צעד, צעד כפול ראשון, תפיסה בלבד
+
+    moves = generator.legal_moves(1)
+    assert moves.shape == (13, 4)
+    assert set(map(tuple, moves[:, :2].tolist())) == {(0, 7), (1, 6)}
+
+
+def test_pieces_in_flight_or_resting_have_no_moves():
+    knight, king = DummyPiece("NW0", (1, 7)), DummyPiece("KW0", (4, 7))
+    game = DummyGame([knight, king])
+    generator = MoveGenerator(game)
+
+    knight._state.physics.moving = True
+    king._state.cooldown_end_ms = 5000
+    assert generator.legal_moves(1).shape == (0, 4)
+    assert len(generator.legal_moves(1, now_ms=6000)) == 5  # המלך סיים לנוח
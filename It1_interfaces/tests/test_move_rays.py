@@ -0,0 +1,50 @@
+"""
+בדיקות לקומפילציה של moves.txt לקרניים וקפיצות
+"""
+
+import sys
+import os
+import pathlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Bitboards import AttackTables, Bitboards
+from Moves import Moves, Ray
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def test_rook_and_knight_compile():
+    rook = Moves.from_file(PIECES_ROOT / "RW" / "moves.txt")
+    knight = Moves.from_file(PIECES_ROOT / "NW" / "moves.txt")
+
+    assert not rook.leapers
+    assert set(rook.rays) == {Ray(1, 0, "normal"), Ray(-1, 0, "normal"), Ray(0, 1, "normal"), Ray(0, -1, "normal")}
+    assert knight.rays == () and len(knight.leapers) == 8
+
+    assert rook.rule(0, -5) == "normal"
+    assert rook.rule(0, -12) == "normal"  # קרן פתוחה – גם מעבר ל-7
+    assert rook.rule(1, 1) is None
+    assert knight.rule(2, 1) == "normal" and knight.rule(3, 0) is None
+
+
+def test_pawn_keeps_qualifiers_and_short_rays():
+    pawn = Moves.from_file(PIECES_ROOT / "PW" / "moves.txt")
+    assert pawn.rays == ()
+    assert pawn.rule(0, -1) == "non_capture"
+    assert pawn.rule(0, -2) == "1st"
+    assert pawn.rule(1, -1) == "capture"
+
+    short = Moves([(0, 1, "normal"), (0, 2, "normal"), (0, 3, "normal"), (0, 5, "normal")])
+    assert short.rays == (Ray(0, 1, "normal", 3),)
+    assert short.leapers == ((0, 5, "normal"),)
+    assert short.rule(0, 4) is None
+
+
+def test_open_rays_scale_with_board():
+    rook = Moves.from_file(PIECES_ROOT / "RW" / "moves.txt", dims=(12, 12))
+    assert (0, -11, "normal") in rook.valid_moves
+
+    bb = Bitboards(12, 12)
+    table = AttackTables(12, 12).move_table(rook)
+    assert table.move_type(bb.square(0, 11), bb.square(0, 0)) == "normal"
+    assert table.move_type(bb.square(0, 11), bb.square(11, 11)) == "normal"
@@ -0,0 +1,85 @@
+"""
+בדיקות ל-PhysicsWorld – Physics כ-view על שורה במערכים
+"""
+
+import sys
+import os
+import gc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Command import Command
+from Physics import Physics
+from PhysicsWorld import PhysicsWorld
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (int(cell[0] * 102.75), int(cell[1] * 103.5))
+
+
+def move(physics, target, at_ms=0):
+    physics.reset(Command(timestamp=at_ms, piece_id=physics.piece_id, type="move", target=target, params=None))
+
+
+def test_step_matches_scalar_update():
+    world, reference = PhysicsWorld(capacity=2), PhysicsWorld()
+    board = DummyBoard()
+    targets = [((0, 0), (7, 7)), ((3, 6), (3, 1)), ((5, 2), (1, 2)), ((6, 6), (4, 4))]
+    stepped = [Physics(a, board, world=world) for a, _ in targets]  # גדל מעבר לקיבולת ההתחלתית
+    scalar = [Physics(a, board, world=reference) for a, _ in targets]
+    for (_, target), p, q in zip(targets, stepped, scalar):
+        move(p, target)
+        move(q, target)
+
+    for now in range(0, 12000, 37):
+        arrived = world.step(now)
+        for p, q in zip(stepped, scalar):
+            q.update(now)
+            if p.moving and p not in arrived:
+                assert p.pixel_pos == q.pixel_pos
+        for p in arrived:
+            assert now >= p.end_time
+            p.update(now)  # ההגעה עצמה – כמו ב-Game
+    assert [p.cell for p in stepped] == [t for _, t in targets]
+
+
+def test_rows_are_reused_after_release():
+    world = PhysicsWorld(capacity=1)
+    physics = Physics((1, 2), DummyBoard(), world=world)
+    assert physics.cell == (1, 2) and physics.mode == "idle" and len(world) == 1
+    del physics
+    gc.collect()
+    assert len(world) == 0
+    again = Physics((4, 4), DummyBoard(), world=world)
+    assert world._size == 1 and again.cell == (4, 4)
+
+
+def test_concurrent_games_step_only_their_own_pieces():
+    import pathlib
+    from Board import Board
+    from Clock import FixedStepClock
+    from Game import Game
+    from Layout import create_pieces, standard_layout
+    from PieceFactory import PieceFactory
+
+    root = pathlib.Path(__file__).parent.parent.parent / "pieces"
+    games = []
+    for start_ms in (0, 1_000_000):  # שני משחקים באותו תהליך, כל אחד על השעון שלו
+        board = Board(80, 80, 1, 1, 8, 8, None)
+        factory = PieceFactory(board, root, lazy=True)
+        game = Game([], board, piece_factory=factory, clock=FixedStepClock(start_ms=start_ms))
+        game.pieces = create_pieces(factory, standard_layout(), game.user_input_queue)
+        games.append(game)
+    first, second = games
+    assert first.physics_world is not second.physics_world
+
+    pawn = second.board_index.get("PW3")
+    pawn.on_command(Command(timestamp=1_000_000, piece_id="PW3", type="move", target=(3, 4)), 1_000_000)
+    second.step(1_000_500)
+    midway = pawn._state.physics.pixel_pos
+    assert midway != (240, 480) and pawn._state.physics.moving
+
+    first.step(16)  # משחק אחר בזמן אחר – לא נוגע בכלי של second
+    assert pawn._state.physics.pixel_pos == midway
+    second.step(1_000_000 + 10_000)
+    assert pawn._state.physics.cell == (3, 4)
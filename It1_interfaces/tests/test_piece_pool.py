@@ -0,0 +1,55 @@
+"""
+בדיקות ל-PiecePool – כלים מוכנים מראש לקידום, בלי מפעל חדש באמצע המשחק
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from Board import Board
+from Game import Game
+from PieceFactory import PieceFactory
+from PiecePool import PiecePool
+
+
+def _pieces(tmp_path):
+    root = tmp_path / "pieces"
+    for p_type in ("PW", "QW"):
+        folder = root / p_type / "states" / "idle" / "sprites"
+        folder.mkdir(parents=True)
+        cv2.imwrite(str(folder / "0.png"), np.full((8, 8, 4), 90, dtype=np.uint8))
+        (folder.parent / "config.json").write_text(json.dumps({"physics": {"next_state_when_finished": "idle"}}))
+        (root / p_type / "moves.txt").write_text("-1,0:non_capture\n")
+    return root
+
+
+def test_take_places_a_ready_piece(tmp_path):
+    factory = PieceFactory(Board(80, 80, 1, 1, 8, 8, None), _pieces(tmp_path))
+    pool = PiecePool(factory, types=("QW", "QX"), size=2)  # QX לא קיים – מדולג
+    assert pool.types == ("QW",) and pool.available("QW") == 2
+
+    queen = pool.take("QW", (3, 0), game_queue="queue")
+    physics = queen._state.physics
+    assert queen.piece_id == "QW_3_0" and queen._state._game_queue == "queue"
+    assert physics.cell == (3, 0) and physics.pixel_pos == (240, 0) and not physics.moving
+    assert pool.available("QW") == 1 and pool.refill() == 1
+    assert pool.take("PW", (1, 1)).piece_id == "PW_1_1"  # סוג שלא במאגר – מהמפעל
+
+
+def test_promotion_uses_the_games_pool(tmp_path, monkeypatch):
+    factory = PieceFactory(Board(80, 80, 1, 1, 8, 8, None), _pieces(tmp_path))
+    pawn = factory.create_piece("PW", (3, 1))
+    pawn.piece_id = "PW0"
+    game = Game([pawn], factory.board, piece_factory=factory)
+    game.game_time_ms = lambda: 1000
+    monkeypatch.setattr(PieceFactory, "__init__", lambda *a, **k: (_ for _ in ()).throw(AssertionError("new factory")))
+
+    game._promote_pawn_to_queen(pawn, "QW", (3, 0))
+    assert [p.piece_id for p in game.pieces] == ["QW0"]
+    assert game.board_index.piece_at(3, 0).piece_id == "QW0" and game.piece_pool.available("QW") == 1
+    game.timers.run_due(1001)  # המאגר מתמלא ב-tick הבא
+    assert game.piece_pool.available("QW") == 2
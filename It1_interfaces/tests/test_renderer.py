@@ -0,0 +1,130 @@
+"""
+בדיקות ל-LayeredRenderer – שכבות שמורות והרכבת פריים
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from Board import Board
+from img import Img
+from Renderer import LayeredRenderer
+
+
+class DummyPiece:
+    def __init__(self, x, y, value):
+        self.x, self.y = x, y
+        sprite = np.full((10, 10, 4), value, dtype=np.uint8)
+        sprite[..., 3] = 255
+        self.sprite = Img()
+        self.sprite.img = sprite
+
+    def draw_on_board(self, board, now_ms):
+        self.sprite.draw_on(board.img, self.x, self.y)
+
+
+def make_board():
+    img = Img()
+    img.img = np.full((400, 400, 4), 255, dtype=np.uint8)
+    return Board(50, 50, 1, 1, 8, 8, img)
+
+
+def test_render_matches_display_with_background(monkeypatch):
+    board = make_board()
+    pieces = [DummyPiece(0, 0, 30), DummyPiece(140, 220, 90)]
+    info = dict(
+        cursors_info={'player1_cursor': [1, 7], 'player2_cursor': [2, 0]},
+        score_info={'white_score': 3, 'black_score': 1},
+        moves_info={'white_moves': [{'move': 'P e2 -> e4', 'time': '10:00:00'}], 'black_moves': []},
+        player_names={'player1': 'A', 'player2': 'B'},
+    )
+
+    frame = LayeredRenderer(board).render(pieces, 0, **info).copy()
+
+    shown = {}
+    monkeypatch.setattr("cv2.imshow", lambda name, img: shown.setdefault("img", img.copy()))
+    reference = board.clone()
+    for p in pieces:
+        p.draw_on_board(reference, 0)
+    reference.img.display_with_background("Chess Game", auto_resize_window=False,
+                                          board_cells=(board.W_cells, board.H_cells), **info)
+
+    assert np.array_equal(frame, shown["img"])
+    # הלוח הסטטי עצמו לא השתנה
+    assert (board.img.img == 255).all()
+
+
+def test_hud_redrawn_only_when_content_changes():
+    renderer = LayeredRenderer(make_board())
+    calls = []
+    original = Img._draw_score_on_background
+    renderer.board.img._draw_score_on_background = lambda *a, **kw: calls.append(a) or original(renderer.board.img, *a, **kw)
+
+    score = {'white_score': 0, 'black_score': 0}
+    for _ in range(3):
+        renderer.render([], 0, score_info=dict(score))
+    assert len(calls) == 1
+
+    renderer.render([], 0, score_info={'white_score': 1, 'black_score': 0})
+    assert len(calls) == 2
+
+    # עם מונה גרסה (ScoreTracker/MoveLogger) לא בודקים את התוכן בכלל
+    for _ in range(3):
+        renderer.render([], 0, score_info={'white_score': 1, 'black_score': 0}, hud_version=(1, 0))
+    assert len(calls) == 3
+    renderer.render([], 0, score_info={'white_score': 2, 'black_score': 0}, hud_version=(2, 0))
+    assert len(calls) == 4
+
+
+def test_rebuilt_base_keeps_last_hud():
+    renderer = LayeredRenderer(make_board())
+    info = dict(score_info={'white_score': 2, 'black_score': 5},
+                moves_info={'white_moves': [{'move': 'P e2 -> e4', 'time': '10:00:00'}], 'black_moves': []},
+                player_names={'player1': 'A', 'player2': 'B'})
+    expected = renderer.render([], 0, **info).copy()
+
+    renderer._base_dirty = True  # הבסיס נבנה מחדש בלי שהקורא שולח שוב את ה-HUD
+    assert np.array_equal(renderer.compose(), expected)
+
+
+class TrackedPiece:
+    """כלי עם graphics/physics ודגלי dirty – כמו Piece אמיתי"""
+
+    class _Parts:
+        pass
+
+    def __init__(self, x, y, value):
+        sprite = Img()
+        sprite.img = np.full((10, 10, 4), value, dtype=np.uint8)
+        sprite.img[..., 3] = 255
+        self._state = self._Parts()
+        self._state.graphics = self._Parts()
+        self._state.graphics.get_img = lambda: sprite
+        self._state.graphics.dirty = True
+        self._state.physics = self._Parts()
+        self._state.physics.pixel_pos = (x, y)
+        self._state.physics.dirty = True
+        self.sprite = sprite
+
+    def move_to(self, x, y):
+        self._state.physics.pixel_pos = (x, y)
+        self._state.physics.dirty = True
+
+    def draw_on_board(self, board, now_ms):
+        self.sprite.draw_on(board.img, *self._state.physics.pixel_pos)
+
+
+def test_dirty_rect_frames_match_full_redraw():
+    board = make_board()
+    a, b, c = TrackedPiece(0, 0, 30), TrackedPiece(5, 5, 90), TrackedPiece(300, 300, 150)
+    renderer = LayeredRenderer(board)
+    renderer.render([a, b, c], 0)
+
+    a.move_to(120, 60)                      # a זז ומשאיר את b חשוף חלקית
+    frame = renderer.render([a, b], 16).copy()   # c נתפס
+    assert renderer.tracker.collect([a, b]) == ([], [])   # שום דבר לא השתנה מאז
+
+    reference = LayeredRenderer(board).render([TrackedPiece(120, 60, 30), TrackedPiece(5, 5, 90)], 16)
+    assert np.abs(frame.astype(int) - reference).max() <= 1
@@ -0,0 +1,43 @@
+"""
+בדיקות ל-Scheduler – ערימת טיימרים על זמן המשחק
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Command import Command
+from Physics import Physics
+from Scheduler import Scheduler
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+def test_runs_only_due_timers_in_order():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.schedule(300, lambda now, name: fired.append((now, name)), "c")
+    scheduler.schedule(100, lambda now, name: fired.append((now, name)), "a")
+    late = scheduler.schedule(200, lambda now, name: fired.append((now, name)), "b")
+    scheduler.schedule(100, lambda now, name: fired.append((now, name)), "a2")
+
+    assert scheduler.run_due(50) == 0
+    scheduler.cancel(late)
+    assert scheduler.run_due(250) == 2
+    assert fired == [(250, "a"), (250, "a2")]
+    assert scheduler.next_deadline() == 300 and len(scheduler) == 1
+
+
+def test_physics_deadlines():
+    physics = Physics((0, 0), DummyBoard())
+    assert physics.next_event_ms(0) is None  # עומד – אין מה לעדכן
+
+    physics.reset(Command(timestamp=1000, piece_id="RW0", type="move", target=(0, 2), params=None))
+    assert physics.next_event_ms(1500) == 1501  # אינטרפולציה בכל tick
+
+    physics.update(physics.end_time)
+    physics.wait_only, physics.start_ms, physics.duration_ms = True, 2000, 5000
+    assert physics.next_event_ms(2100) == 7000
@@ -0,0 +1,103 @@
+"""
+בדיקות ל-GameSnapshot – צילום לוגי של המשחק ושחזור
+"""
+
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from Board import Board
+from Command import Command
+from Game import Game
+from PieceFactory import PieceFactory
+
+
+def _pieces(tmp_path):
+    root = tmp_path / "pieces"
+    for p_type in ("PW", "KW", "KB"):
+        for state, nxt in (("idle", "idle"), ("move", "idle")):
+            folder = root / p_type / "states" / state / "sprites"
+            folder.mkdir(parents=True)
+            cv2.imwrite(str(folder / "0.png"), np.full((8, 8, 4), 90, dtype=np.uint8))
+            (folder.parent / "config.json").write_text(json.dumps({"physics": {"next_state_when_finished": nxt}}))
+        (root / p_type / "moves.txt").write_text("0,-1:non_capture\n")
+    return root
+
+
+def _game(tmp_path):
+    factory = PieceFactory(Board(80, 80, 1, 1, 8, 8, None), _pieces(tmp_path))
+    pieces = []
+    for piece_id, cell in (("PW0", (3, 6)), ("KW0", (4, 7)), ("KB0", (4, 0))):
+        piece = factory.create_piece(piece_id[:2], cell)
+        piece.piece_id = piece._state.physics.piece_id = piece_id
+        pieces.append(piece)
+    game = Game(pieces, factory.board, piece_factory=factory)
+    for piece in pieces:
+        piece._state._game_queue = game.user_input_queue
+    return game, pieces
+
+
+def test_restore_undoes_moves_captures_and_scores(tmp_path):
+    game, (pawn, white_king, black_king) = _game(tmp_path)
+    game.selected_piece_player1 = pawn
+    snapshot = game.snapshot()
+
+    pawn.on_command(Command(timestamp=0, piece_id="PW0", type="move", target=(3, 5)), 0)
+    game._update_pieces(10_000)
+    while not game.user_input_queue.empty():
+        game._process_input(game.user_input_queue.get())
+    game._capture(black_king, pawn)
+    game.selected_piece_player1 = None
+    assert pawn._state.physics.cell == (3, 5) and pawn._state.cooldown_end_ms > 0
+    assert game._is_win() and game.score_tracker.get_score("white") == 0  # ערך מלך 0
+    game.user_input_queue.put(Command(timestamp=1, piece_id="KW0", type="move", target=(4, 6)))
+
+    game.restore(snapshot)
+    physics = pawn._state.physics
+    assert list(game.pieces) == [pawn, white_king, black_king]
+    assert physics.cell == (3, 6) and physics.pixel_pos == (240, 480) and not physics.moving
+    assert pawn._state.name == "idle" and pawn._state.cooldown_end_ms == 0
+    assert game.board_index.piece_at(4, 0) is black_king and game.board_index.piece_at(3, 5) is None
+    assert not game._is_win() and game.selected_piece_player1 is pawn
+    assert game.user_input_queue.empty()
+
+
+def test_restore_before_a_win_clears_the_banner(tmp_path):
+    game, (pawn, _white_king, black_king) = _game(tmp_path)
+    snapshot = game.snapshot()
+
+    game._capture(black_king, pawn)
+    game._announce_win()
+    game.winner_announced = True
+    assert game.winner_tracker.get_winner_text() and game.winner_tracker.is_game_over()
+
+    game.restore(snapshot)
+    assert not game.winner_announced and not game._is_win()
+    assert game.winner_tracker.get_winner_text() is None
+    assert game.winner_tracker.get_winner() is None and not game.winner_tracker.is_game_over()
+
+    game._capture(black_king, pawn)
+    game._announce_win()
+    after_win = game.snapshot()
+    game.restore(snapshot)
+    game.restore(after_win)
+    assert game.winner_tracker.get_winner_text() == after_win.winner[2]
+
+
+def test_snapshot_is_independent_of_later_changes(tmp_path):
+    game, (pawn, _white_king, _black_king) = _game(tmp_path)
+    pawn.on_command(Command(timestamp=0, piece_id="PW0", type="move", target=(3, 4)), 0)
+    game._update_pieces(500)
+    snapshot = game.snapshot()
+    midway = pawn._state.physics.pixel_pos
+
+    game._update_pieces(700)
+    assert pawn._state.physics.pixel_pos != midway
+    game.restore(snapshot)
+    assert pawn._state.physics.pixel_pos == midway and pawn._state.physics.moving
+    game._update_pieces(10_000)  # התנועה ממשיכה מהנקודה המשוחזרת
+    assert pawn._state.physics.cell == (3, 4)
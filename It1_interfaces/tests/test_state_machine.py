@@ -0,0 +1,69 @@
+"""
+בדיקות ל-StateTable / CompiledState – state machine מקומפל לטבלת מעברים
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Command import Command
+from Physics import Physics
+from StateMachine import ARRIVED, NO_STATE, CompiledState, StateTable
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+class DummyGraphics:
+    def __init__(self):
+        self.played = []
+        self.running = True
+
+    def switch_to_state(self, name):
+        self.played.append(name)
+
+    def update(self, now_ms):
+        pass
+
+
+def _specs():
+    def cfg(nxt, **physics):
+        return {"physics": dict(next_state_when_finished=nxt, **physics)}
+    return [("move", cfg("long_rest"), "M"), ("idle", cfg("idle"), "I"),
+            ("jump", cfg("short_rest", rest_ms=700), "J"),
+            ("long_rest", cfg("idle"), "L"), ("short_rest", cfg("idle"), "S")]
+
+
+def test_compile_table():
+    table = StateTable.compile(_specs())
+    ids = table.ids
+    assert table.initial == ids["idle"] and table.moves[ids["jump"]] == "J"
+    assert table.transition(ids["move"], "arrived") == ids["long_rest"]
+    assert table.transition(ids["long_rest"], "jump") == ids["jump"]
+    assert table.transition(ids["idle"], "select") == NO_STATE
+    assert table.next_state[:, ARRIVED].tolist() == [ids[n] for n in ("long_rest", "idle", "short_rest", "idle", "idle")]
+    assert table.rest_ms.tolist() == [5000, 0, 700, 0, 0]  # ברירת מחדל ל-move, rest_ms מה-config ל-jump
+
+
+def test_piece_runs_move_rest_idle():
+    table = StateTable.compile(_specs())
+    graphics, physics = DummyGraphics(), Physics((0, 0), DummyBoard(), piece_id="PW0")
+    state = CompiledState(table, graphics, physics)
+    assert state.name == "idle" and state.can_transition(0)
+
+    state.process_command(Command(timestamp=100, piece_id="PW0", type="move", target=(0, 2), params=None))
+    assert state.name == "move" and state.moves == "M" and not state.can_transition(5099)
+    # פקודה במהלך ה-cooldown לא משנה כלום
+    state.process_command(Command(timestamp=200, piece_id="PW0", type="jump", target=(0, 0), params=None))
+    assert state.name == "move"
+
+    now = 100
+    while state.name == "move":
+        now += 50
+        state.update(now)
+    assert state.name == "long_rest" and physics.wait_only and state.cooldown_end_ms == now + 5000
+    state.update(now + 5000)
+    assert state.name == "idle" and state.can_transition(now + 5000)
+    assert graphics.played == ["move", "long_rest", "idle"]
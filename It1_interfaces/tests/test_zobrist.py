@@ -0,0 +1,63 @@
+"""
+בדיקות ל-ZobristHash – hash מצטבר של הלוח שמתעדכן מאירועי BoardIndex
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from BoardIndex import BoardIndex, PieceList
+from Command import Command
+from Physics import Physics
+from Zobrist import ZobristHash
+
+
+class DummyBoard:
+    def cell_to_pixel(self, cell):
+        return (cell[0] * 100, cell[1] * 100)
+
+
+class DummyState:
+    def __init__(self, physics):
+        self.physics = physics
+
+
+class DummyPiece:
+    def __init__(self, piece_id, cell):
+        self.piece_id = piece_id
+        self._state = DummyState(Physics(cell, DummyBoard(), piece_id=piece_id))
+
+
+def test_hash_depends_only_on_position_and_status():
+    index = BoardIndex(8, 8)
+    rook, pawn = DummyPiece("RW0", (0, 7)), DummyPiece("PB0", (5, 1))
+    pieces = PieceList([rook, pawn], index)
+    start = index.zobrist.value
+    assert start == ZobristHash(8, 8).key(rook, (0, 7), 0) ^ ZobristHash(8, 8).key(pawn, (5, 1), 0)  # seed קבוע
+
+    physics = rook._state.physics
+    physics.reset(Command(timestamp=0, piece_id="RW0", type="move", target=(0, 3), params=None))
+    index.refresh(rook)
+    in_flight = index.zobrist.value
+    assert in_flight != start
+    physics.update(10_000)  # הגעה – cell משתנה דרך on_cell_change
+    index.refresh(rook)
+    arrived = index.zobrist.value
+    assert arrived not in (start, in_flight)
+
+    physics.cell = (0, 7)  # חזרה למשבצת ההתחלה – אותו hash כמו בהתחלה
+    assert index.zobrist.value == start
+
+    pieces.remove(pawn)
+    assert index.zobrist.value == ZobristHash(8, 8).key(rook, (0, 7), 0)
+    pieces.append(pawn)
+    assert index.zobrist.value == start
+
+
+def test_same_position_same_hash_in_another_index():
+    pieces = [("KW0", (4, 7)), ("KB0", (4, 0)), ("QW0", (3, 3))]
+    first, second = BoardIndex(8, 8), BoardIndex(8, 8)
+    PieceList([DummyPiece(*spec) for spec in pieces], first)
+    PieceList([DummyPiece(*spec) for spec in reversed(pieces)], second)
+    assert first.zobrist.value == second.zobrist.value != 0
+    assert first.zobrist.side(0, (0, 7), None) != first.zobrist.side(1, (0, 7), None)